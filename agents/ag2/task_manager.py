@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 
@@ -94,7 +93,9 @@ class AgentTaskManager(InMemoryTaskManager):
                 task_send_params.id, False
             )
 
-            asyncio.create_task(self._handle_send_task_streaming(request))
+            self.start_agent_run(
+                request.params, self._handle_send_task_streaming(request)
+            )
 
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
@@ -142,7 +143,9 @@ class AgentTaskManager(InMemoryTaskManager):
             task_id, task_status, None if artifact is None else [artifact]
         )
         # Use the updated task to create a response with correct history
-        task_result = self.append_task_history(updated_task, history_length)
+        task_result = await self.append_task_history(
+            updated_task, history_length
+        )
         return SendTaskResponse(id=request.id, result=task_result)
 
     async def _handle_send_task_streaming(
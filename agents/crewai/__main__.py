@@ -10,7 +10,7 @@ import os
 import click
 
 from agent import ImageGenerationAgent
-from common.server import A2AServer
+from common.server import A2AServer, BlobStore
 from common.types import (
     AgentCapabilities,
     AgentCard,
@@ -30,7 +30,8 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10001)
-def main(host, port):
+@click.option('--blob-dir', 'blob_dir', default=None)
+def main(host, port, blob_dir):
     """Entry point for the A2A + CrewAI Image generation sample."""
     try:
         if not os.getenv('GOOGLE_API_KEY') and not os.getenv(
@@ -68,11 +69,19 @@ def main(host, port):
             skills=[skill],
         )
 
+        blob_store = None
+        if blob_dir:
+            blob_store = BlobStore(
+                blob_dir, base_url=f'http://{host}:{port}/blobs/'
+            )
         server = A2AServer(
             agent_card=agent_card,
-            task_manager=AgentTaskManager(agent=ImageGenerationAgent()),
+            task_manager=AgentTaskManager(
+                agent=ImageGenerationAgent(), blob_store=blob_store
+            ),
             host=host,
             port=port,
+            blob_store=blob_store,
         )
         logger.info(f'Starting server on {host}:{port}')
         server.start()
@@ -1,11 +1,12 @@
 """Agent Task Manager."""
 
+import asyncio
 import logging
 
 from collections.abc import AsyncIterable
 
 from agent import ImageGenerationAgent
-from common.server import utils
+from common.server import BlobStore, utils
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
     Artifact,
@@ -16,7 +17,6 @@ from common.types import (
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    Task,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -30,9 +30,13 @@ logger = logging.getLogger(__name__)
 class AgentTaskManager(InMemoryTaskManager):
     """Agent Task Manager, handles task routing and response packing."""
 
-    def __init__(self, agent: ImageGenerationAgent):
+    def __init__(
+        self, agent: ImageGenerationAgent, blob_store: BlobStore | None = None
+    ):
         super().__init__()
         self.agent = agent
+        # With a blob store, images are sent by uri instead of inline base64.
+        self.blob_store = blob_store
 
     async def _stream_generator(
         self, request: SendTaskRequest
@@ -68,28 +72,6 @@ class AgentTaskManager(InMemoryTaskManager):
 
         await self.upsert_task(request.params)
 
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError as exc:
-                logger.error('Task %s not found for updating the task', task_id)
-                raise ValueError(f'Task {task_id} not found') from exc
-
-            task.status = status
-
-            if status.message is not None:
-                self.task_messages[task_id].append(status.message)
-
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-
-            return task
-
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
@@ -110,11 +92,17 @@ class AgentTaskManager(InMemoryTaskManager):
                     )
                 )
             ]
+            if self.blob_store is not None:
+                # Writing the blob is disk I/O; keep it off the event loop.
+                parts = [
+                    await asyncio.to_thread(self.blob_store.to_uri_part, part)
+                    for part in parts
+                ]
         else:
             parts = [{'type': 'text', 'text': data.error}]
 
         print(f'Final Result ===> {result}')
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(state=TaskState.COMPLETED),
             [Artifact(parts=parts)],
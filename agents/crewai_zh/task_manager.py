@@ -16,7 +16,6 @@ from common.types import (
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    Task,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -68,28 +67,6 @@ class AgentTaskManager(InMemoryTaskManager):
 
         await self.upsert_task(request.params)
 
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError as exc:
-                logger.error('更新任务时未找到任务 %s', task_id)
-                raise ValueError(f'未找到任务 {task_id}') from exc
-
-            task.status = status
-
-            if status.message is not None:
-                self.task_messages[task_id].append(status.message)
-
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-
-            return task
-
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
@@ -114,7 +91,7 @@ class AgentTaskManager(InMemoryTaskManager):
             parts = [{'type': 'text', 'text': data.error}]
 
         print(f'最终结果 ===> {result}')
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(state=TaskState.COMPLETED),
             [Artifact(parts=parts)],
@@ -16,7 +16,6 @@ from common.types import (
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    Task,
     TaskArtifactUpdateEvent,
     TaskSendParams,
     TaskState,
@@ -157,7 +156,7 @@ class AgentTaskManager(InMemoryTaskManager):
                     artifacts = [Artifact(parts=parts, index=0, append=False)]
             message = Message(role='agent', parts=parts)
             task_status = TaskStatus(state=task_state, message=message)
-            await self._update_store(
+            await self.update_store(
                 task_send_params.id, task_status, artifacts
             )
             task_update_event = TaskStatusUpdateEvent(
@@ -229,24 +228,6 @@ class AgentTaskManager(InMemoryTaskManager):
         await self.upsert_task(request.params)
         return self._stream_generator(request)
 
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f'Task {task_id} not found for updating the task')
-                raise ValueError(f'Task {task_id} not found')
-            task.status = status
-            # if status.message is not None:
-            #    self.task_messages[task_id].append(status.message)
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
-
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
@@ -261,7 +242,7 @@ class AgentTaskManager(InMemoryTaskManager):
             if 'MISSING_INFO:' in result
             else TaskState.COMPLETED
         )
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(
                 state=task_state, message=Message(role='agent', parts=parts)
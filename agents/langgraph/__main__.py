@@ -4,6 +4,7 @@ import os
 import click
 
 from agents.langgraph.agent import CurrencyAgent
+from agents.langgraph.checkpointer import BoundedCheckpointSaver
 from agents.langgraph.task_manager import AgentTaskManager
 from common.server import A2AServer
 from common.types import (
@@ -25,7 +26,11 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10000)
-def main(host, port):
+@click.option('--max-sessions', 'max_sessions', default=10000)
+@click.option('--session-ttl', 'session_ttl', default=3600.0)
+@click.option('--max-messages', 'max_messages', default=40)
+@click.option('--session-db', 'session_db', default=None)
+def main(host, port, max_sessions, session_ttl, max_messages, session_db):
     """Starts the Currency Agent server."""
     try:
         if not os.getenv('GOOGLE_API_KEY'):
@@ -52,12 +57,19 @@ def main(host, port):
             skills=[skill],
         )
 
+        checkpointer = BoundedCheckpointSaver(
+            max_threads=max_sessions,
+            ttl=session_ttl,
+            max_messages=max_messages,
+            spill_path=session_db,
+        )
+
         notification_sender_auth = PushNotificationSenderAuth()
         notification_sender_auth.generate_jwk()
         server = A2AServer(
             agent_card=agent_card,
             task_manager=AgentTaskManager(
-                agent=CurrencyAgent(),
+                agent=CurrencyAgent(checkpointer=checkpointer),
                 notification_sender_auth=notification_sender_auth,
             ),
             host=host,
@@ -69,9 +81,11 @@ def main(host, port):
             notification_sender_auth.handle_jwks_endpoint,
             methods=['GET'],
         )
+        server.add_shutdown_handler(notification_sender_auth.aclose)
 
         logger.info(f'Starting server on {host}:{port}')
         server.start()
+        checkpointer.close()
     except MissingAPIKeyError as e:
         logger.error(f'Error: {e}')
         exit(1)
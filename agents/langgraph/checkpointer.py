@@ -0,0 +1,560 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """The latest checkpoint of one (thread, namespace), serialized."""
+
+    checkpoint_id: str
+    checkpoint: tuple[str, bytes]
+    metadata: tuple[str, bytes]
+    parent_id: str | None
+    # (task id, write index) -> (task id, channel, value, task path)
+    writes: dict[tuple[str, int], tuple[str, str, tuple[str, bytes], str]] = (
+        field(default_factory=dict)
+    )
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.checkpoint[1])
+            + len(self.metadata[1])
+            + sum(len(w[2][1]) for w in self.writes.values())
+        )
+
+
+def trim_message_window(
+    messages: Sequence[BaseMessage], max_messages: int
+) -> Sequence[BaseMessage]:
+    """Keeps at most the last ``max_messages`` messages.
+
+    The window starts at a human message, so a tool call is never separated
+    from the message that requested it. When no human message falls inside
+    the window the messages are kept as they are.
+    """
+    if len(messages) <= max_messages:
+        return messages
+    for start in range(len(messages) - max_messages, len(messages)):
+        if isinstance(messages[start], HumanMessage):
+            return messages[start:]
+    return messages
+
+
+class BoundedCheckpointSaver(BaseCheckpointSaver):
+    """Keeps the latest checkpoint of each thread with bounded memory.
+
+    Unlike MemorySaver, which keeps every checkpoint of every thread for
+    the life of the process, only the latest checkpoint of a thread is
+    kept, so a conversation can be continued but not replayed from an
+    earlier step. Threads are evicted least recently used first once more
+    than ``max_threads`` are in memory, and dropped altogether after
+    ``ttl`` seconds without use. Before a checkpoint is stored its
+    ``messages`` channel is cut down to the last ``max_messages``
+    messages, which bounds both the state and the prompt of the next turn.
+
+    With ``spill_path`` set, evicted threads are written to that SQLite
+    database instead of being dropped and are loaded back when used again.
+    ``flush`` and ``close`` write out the threads still in memory, so
+    conversations survive a restart. The async methods then run in a worker
+    thread, keeping SQLite and the lock off the event loop.
+
+    Args:
+        max_threads: Number of threads kept in memory.
+        ttl: Seconds a thread may stay unused, or None to keep threads
+            until evicted.
+        max_messages: Size of the message window, or None for no limit.
+        spill_path: SQLite database evicted threads are written to.
+        serde: Serializer for checkpoints and writes.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 10000,
+        ttl: float | None = 3600.0,
+        max_messages: int | None = 40,
+        spill_path: str | None = None,
+        *,
+        serde: SerializerProtocol | None = None,
+    ):
+        super().__init__(serde=serde)
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self.spill_path = spill_path
+        # thread id -> checkpoint namespace -> entry, least recent first
+        self._threads: OrderedDict[str, dict[str, _Entry]] = OrderedDict()
+        self._last_used: dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._last_sweep = time.monotonic()
+        self.evicted = 0
+        self.expired = 0
+        self.trimmed = 0
+
+        self._conn = None
+        if spill_path:
+            self._conn = sqlite3.connect(spill_path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS checkpoints ('
+                'thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, '
+                'checkpoint_id TEXT NOT NULL, '
+                'checkpoint_type TEXT NOT NULL, checkpoint BLOB NOT NULL, '
+                'metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, '
+                'parent_id TEXT, writes_type TEXT NOT NULL, '
+                'writes BLOB NOT NULL, updated_at REAL NOT NULL, '
+                'PRIMARY KEY (thread_id, checkpoint_ns))'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS checkpoints_updated_at '
+                'ON checkpoints (updated_at)'
+            )
+            self._conn.commit()
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            namespaces = self._use(thread_id)
+            entry = namespaces.get(checkpoint_ns) if namespaces else None
+            if entry is None or (
+                checkpoint_id and entry.checkpoint_id != checkpoint_id
+            ):
+                return None
+            return self._tuple(thread_id, checkpoint_ns, entry)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config is not None:
+                thread_ids = [config['configurable']['thread_id']]
+            else:
+                thread_ids = list(self._threads)
+                if self._conn is not None:
+                    rows = self._conn.execute(
+                        'SELECT DISTINCT thread_id FROM checkpoints'
+                    ).fetchall()
+                    thread_ids.extend(
+                        row[0] for row in rows if row[0] not in self._threads
+                    )
+            checkpoint_ns = (
+                config['configurable'].get('checkpoint_ns')
+                if config is not None
+                else None
+            )
+            checkpoint_id = get_checkpoint_id(config) if config else None
+            before_id = get_checkpoint_id(before) if before else None
+
+            tuples = []
+            for thread_id in thread_ids:
+                # Listing reads spilled threads without loading them back.
+                namespaces = self._threads.get(thread_id) or self._load(
+                    thread_id
+                )
+                for ns, entry in (namespaces or {}).items():
+                    if checkpoint_ns is not None and ns != checkpoint_ns:
+                        continue
+                    if checkpoint_id and entry.checkpoint_id != checkpoint_id:
+                        continue
+                    if before_id and entry.checkpoint_id >= before_id:
+                        continue
+                    checkpoint_tuple = self._tuple(thread_id, ns, entry)
+                    if filter and any(
+                        checkpoint_tuple.metadata.get(key) != value
+                        for key, value in filter.items()
+                    ):
+                        continue
+                    tuples.append(checkpoint_tuple)
+        yield from tuples[:limit]
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint = self._trim(checkpoint)
+        entry = _Entry(
+            checkpoint_id=checkpoint['id'],
+            checkpoint=self.serde.dumps_typed(checkpoint),
+            metadata=self.serde.dumps_typed(metadata),
+            parent_id=config['configurable'].get('checkpoint_id'),
+        )
+        with self._lock:
+            namespaces = self._use(thread_id)
+            if namespaces is None:
+                namespaces = self._threads[thread_id] = {}
+                self._last_used[thread_id] = time.time()
+            namespaces[checkpoint_ns] = entry
+            self._evict()
+        return {
+            'configurable': {
+                'thread_id': thread_id,
+                'checkpoint_ns': checkpoint_ns,
+                'checkpoint_id': checkpoint['id'],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = config['configurable']['checkpoint_id']
+        with self._lock:
+            namespaces = self._use(thread_id)
+            entry = namespaces.get(checkpoint_ns) if namespaces else None
+            # Writes only matter for the latest checkpoint, the one a run
+            # would resume from.
+            if entry is None or entry.checkpoint_id != checkpoint_id:
+                return
+            for idx, (channel, value) in enumerate(writes):
+                key = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if key[1] >= 0 and key in entry.writes:
+                    continue
+                entry.writes[key] = (
+                    task_id,
+                    channel,
+                    self.serde.dumps_typed(value),
+                    task_path,
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._threads.pop(thread_id, None)
+            self._last_used.pop(thread_id, None)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        'DELETE FROM checkpoints WHERE thread_id = ?',
+                        (thread_id,),
+                    )
+
+    async def aget_tuple(
+        self, config: RunnableConfig
+    ) -> CheckpointTuple | None:
+        return await self._run(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await self._run(
+            lambda: list(
+                self.list(config, filter=filter, before=before, limit=limit)
+            )
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await self._run(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        await self._run(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._run(self.delete_thread, thread_id)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        # Without a spill database every call is a quick in-memory update.
+        if self._conn is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def stats(self) -> dict[str, int]:
+        """Returns thread counts and the bytes held in memory."""
+        with self._lock:
+            stats = {
+                'threads': len(self._threads),
+                'bytes': sum(
+                    entry.size
+                    for namespaces in self._threads.values()
+                    for entry in namespaces.values()
+                ),
+                'evicted': self.evicted,
+                'expired': self.expired,
+                'trimmed': self.trimmed,
+            }
+            if self._conn is not None:
+                stats['spilled'] = self._conn.execute(
+                    'SELECT COUNT(DISTINCT thread_id) FROM checkpoints'
+                ).fetchone()[0]
+        return stats
+
+    def flush(self) -> None:
+        """Writes every thread in memory to the spill database."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._spill(
+                [
+                    (thread_id, namespaces, self._last_used[thread_id])
+                    for thread_id, namespaces in self._threads.items()
+                ]
+            )
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def _use(self, thread_id: str) -> dict[str, _Entry] | None:
+        """Returns a thread's entries, marking it as the most recently used.
+
+        A thread that is not in memory is loaded from the spill database,
+        evicting others to stay within max_threads; one that expired is
+        forgotten. Must be called with the lock held.
+        """
+        now = time.time()
+        namespaces = self._threads.get(thread_id)
+        if namespaces is not None and self._is_expired(
+            self._last_used[thread_id], now
+        ):
+            self._forget([thread_id])
+            return None
+        loaded = namespaces is None
+        if loaded:
+            namespaces = self._load(thread_id)
+            if namespaces is None:
+                return None
+            self._threads[thread_id] = namespaces
+        self._threads.move_to_end(thread_id)
+        self._last_used[thread_id] = now
+        if loaded:
+            self._evict()
+        return namespaces
+
+    def _tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        entry: _Entry,
+    ) -> CheckpointTuple:
+        return CheckpointTuple(
+            config={
+                'configurable': {
+                    'thread_id': thread_id,
+                    'checkpoint_ns': checkpoint_ns,
+                    'checkpoint_id': entry.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed(entry.checkpoint),
+            metadata=self.serde.loads_typed(entry.metadata),
+            parent_config={
+                'configurable': {
+                    'thread_id': thread_id,
+                    'checkpoint_ns': checkpoint_ns,
+                    'checkpoint_id': entry.parent_id,
+                }
+            }
+            if entry.parent_id
+            else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed(value))
+                for task_id, channel, value, _ in entry.writes.values()
+            ],
+        )
+
+    def _trim(self, checkpoint: Checkpoint) -> Checkpoint:
+        messages = checkpoint['channel_values'].get('messages')
+        if self.max_messages is None or not isinstance(messages, list):
+            return checkpoint
+        trimmed = trim_message_window(messages, self.max_messages)
+        if len(trimmed) == len(messages):
+            return checkpoint
+        self.trimmed += 1
+        return {
+            **checkpoint,
+            'channel_values': {
+                **checkpoint['channel_values'],
+                'messages': list(trimmed),
+            },
+        }
+
+    def _is_expired(self, last_used: float, now: float) -> bool:
+        return self.ttl is not None and now - last_used > self.ttl
+
+    def _evict(self) -> None:
+        """Expires idle threads and evicts the least recently used ones.
+
+        Must be called with the lock held.
+        """
+        now = time.time()
+        expired = []
+        for thread_id in self._threads:
+            if not self._is_expired(self._last_used[thread_id], now):
+                break
+            expired.append(thread_id)
+        if expired:
+            self._forget(expired)
+
+        evicted = []
+        while len(self._threads) > self.max_threads:
+            thread_id, namespaces = self._threads.popitem(last=False)
+            evicted.append(
+                (thread_id, namespaces, self._last_used.pop(thread_id))
+            )
+        if evicted:
+            self.evicted += len(evicted)
+            self._spill(evicted)
+
+        if (
+            self._conn is not None
+            and self.ttl is not None
+            and time.monotonic() - self._last_sweep > min(self.ttl, 60.0)
+        ):
+            self._last_sweep = time.monotonic()
+            with self._conn:
+                self._conn.execute(
+                    'DELETE FROM checkpoints WHERE updated_at < ?',
+                    (now - self.ttl,),
+                )
+
+    def _forget(self, thread_ids: Sequence[str]) -> None:
+        """Drops expired threads from memory and the spill database."""
+        for thread_id in thread_ids:
+            self._threads.pop(thread_id, None)
+            self._last_used.pop(thread_id, None)
+        self.expired += len(thread_ids)
+        if self._conn is not None:
+            with self._conn:
+                self._conn.executemany(
+                    'DELETE FROM checkpoints WHERE thread_id = ?',
+                    [(thread_id,) for thread_id in thread_ids],
+                )
+
+    def _spill(
+        self, threads: Sequence[tuple[str, dict[str, _Entry], float]]
+    ) -> None:
+        if self._conn is None:
+            return
+        rows = []
+        for thread_id, namespaces, last_used in threads:
+            for checkpoint_ns, entry in namespaces.items():
+                writes = [
+                    [task_id, channel, *value, task_path, idx]
+                    for (_, idx), (
+                        task_id,
+                        channel,
+                        value,
+                        task_path,
+                    ) in entry.writes.items()
+                ]
+                rows.append(
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        entry.checkpoint_id,
+                        *entry.checkpoint,
+                        *entry.metadata,
+                        entry.parent_id,
+                        *self.serde.dumps_typed(writes),
+                        last_used,
+                    )
+                )
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO checkpoints (thread_id, '
+                'checkpoint_ns, checkpoint_id, checkpoint_type, checkpoint, '
+                'metadata_type, metadata, parent_id, writes_type, writes, '
+                'updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+        logger.debug(f'Spilled {len(threads)} threads to {self.spill_path}')
+
+    def _load(self, thread_id: str) -> dict[str, _Entry] | None:
+        if self._conn is None:
+            return None
+        rows = self._conn.execute(
+            'SELECT checkpoint_ns, checkpoint_id, checkpoint_type, checkpoint, '
+            'metadata_type, metadata, parent_id, writes_type, writes, '
+            'updated_at FROM checkpoints WHERE thread_id = ?',
+            (thread_id,),
+        ).fetchall()
+        if not rows:
+            return None
+        if self._is_expired(rows[0][9], time.time()):
+            self._forget([thread_id])
+            return None
+
+        namespaces = {}
+        for row in rows:
+            namespaces[row[0]] = _Entry(
+                checkpoint_id=row[1],
+                checkpoint=(row[2], row[3]),
+                metadata=(row[4], row[5]),
+                parent_id=row[6],
+                writes={
+                    (task_id, idx): (
+                        task_id,
+                        channel,
+                        (value_type, value),
+                        task_path,
+                    )
+                    for task_id, channel, value_type, value, task_path, idx in (
+                        self.serde.loads_typed((row[7], row[8]))
+                    )
+                },
+            )
+        return namespaces
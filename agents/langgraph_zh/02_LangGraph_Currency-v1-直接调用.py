@@ -3,7 +3,6 @@
 """
 
 import os
-import httpx
 from typing import TypedDict, Annotated
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, AIMessage
@@ -11,10 +10,14 @@ from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from common.utils.exchange_rates import ExchangeRateProvider
 
 # 加载环境变量
 load_dotenv()
 
+# 所有查询共享的汇率缓存
+rate_provider = ExchangeRateProvider()
+
 
 class CurrencyState(TypedDict):
     """汇率转换状态"""
@@ -34,13 +37,7 @@ def get_exchange_rate(currency_from: str = 'USD', currency_to: str = 'CNY') -> d
         包含汇率数据的字典
     """
     try:
-        response = httpx.get(
-            f'https://api.frankfurter.app/latest',
-            params={'from': currency_from, 'to': currency_to},
-            timeout=10.0
-        )
-        response.raise_for_status()
-        return response.json()
+        return rate_provider.get_rates_sync(currency_from, currency_to)
     except Exception as e:
         return {'error': f'获取汇率失败: {e}'}
 
@@ -1,22 +1,25 @@
 from collections.abc import AsyncIterable
 from typing import Any, Literal
 
-import httpx
-
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel
 
-from langgraph.checkpoint.memory import MemorySaver
+from agents.langgraph.checkpointer import BoundedCheckpointSaver
+from common.utils.exchange_rates import ExchangeRateError, ExchangeRateProvider
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 
 
-memory = MemorySaver()
+memory = BoundedCheckpointSaver()
+
+rate_provider = ExchangeRateProvider()
 
 
 @tool
-def get_exchange_rate(
+async def get_exchange_rate(
     currency_from: str = 'USD',
     currency_to: str = 'EUR',
     currency_date: str = 'latest',
@@ -32,20 +35,21 @@ def get_exchange_rate(
         包含汇率数据的字典，如果请求失败则返回错误消息。
     """
     try:
-        response = httpx.get(
-            f'https://api.frankfurter.app/{currency_date}',
-            params={'from': currency_from, 'to': currency_to},
+        return await rate_provider.get_rates(
+            currency_from, currency_to, currency_date
         )
-        response.raise_for_status()
-
-        data = response.json()
-        if 'rates' not in data:
-            return {'error': 'API响应格式无效。'}
-        return data
-    except httpx.HTTPError as e:
+    except ExchangeRateError as e:
         return {'error': f'API请求失败: {e}'}
-    except ValueError:
-        return {'error': 'API返回的JSON响应无效。'}
+
+
+def _text(content: str | list) -> str:
+    if isinstance(content, str):
+        return content
+    return ''.join(
+        block if isinstance(block, str) else block.get('text', '')
+        for block in content
+        if isinstance(block, str) or block.get('type') == 'text'
+    )
 
 
 class ResponseFormat(BaseModel):
@@ -67,28 +71,54 @@ class CurrencyAgent:
         '如果请求完成，请将响应状态设置为completed。'
     )
 
-    def __init__(self):
-        self.model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
+    def __init__(
+        self,
+        model: BaseChatModel | None = None,
+        checkpointer: BaseCheckpointSaver | None = None,
+    ):
+        self.model = model or ChatGoogleGenerativeAI(model='gemini-2.0-flash')
         self.tools = [get_exchange_rate]
 
         self.graph = create_react_agent(
             self.model,
             tools=self.tools,
-            checkpointer=memory,
+            checkpointer=checkpointer or memory,
             prompt=self.SYSTEM_INSTRUCTION,
             response_format=ResponseFormat,
         )
 
-    def invoke(self, query, sessionId) -> str:
+    async def invoke(self, query, sessionId) -> dict[str, Any]:
         config = {'configurable': {'thread_id': sessionId}}
-        self.graph.invoke({'messages': [('user', query)]}, config)
-        return self.get_agent_response(config)
+        await self.graph.ainvoke({'messages': [('user', query)]}, config)
+        return await self.get_agent_response(config)
 
     async def stream(self, query, sessionId) -> AsyncIterable[dict[str, Any]]:
         inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': sessionId}}
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
+        async for mode, item in self.graph.astream(
+            inputs, config, stream_mode=['messages', 'values']
+        ):
+            if mode == 'messages':
+                chunk, metadata = item
+                # 模型生成中的回答文本。结构化响应的 token 来自另一个节点，
+                # 不属于回答文本。
+                if (
+                    metadata.get('langgraph_node') == 'agent'
+                    and isinstance(chunk, AIMessage)
+                    and not chunk.tool_calls
+                    and not getattr(chunk, 'tool_call_chunks', None)
+                ):
+                    text = _text(chunk.content)
+                    if text:
+                        yield {
+                            'is_task_complete': False,
+                            'require_user_input': False,
+                            'is_partial': True,
+                            'content': text,
+                        }
+                continue
+
             message = item['messages'][-1]
             if (
                 isinstance(message, AIMessage)
@@ -107,10 +137,10 @@ class CurrencyAgent:
                     'content': '正在处理汇率数据...',
                 }
 
-        yield self.get_agent_response(config)
+        yield await self.get_agent_response(config)
 
-    def get_agent_response(self, config):
-        current_state = self.graph.get_state(config)
+    async def get_agent_response(self, config):
+        current_state = await self.graph.aget_state(config)
         structured_response = current_state.values.get('structured_response')
         if structured_response and isinstance(
             structured_response, ResponseFormat
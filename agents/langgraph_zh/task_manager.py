@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 
@@ -6,6 +5,7 @@ from collections.abc import AsyncIterable
 
 from agents.langgraph.agent import CurrencyAgent
 from common.server import utils
+from common.server.artifact_chunker import TextArtifactStream
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
     Artifact,
@@ -20,7 +20,6 @@ from common.types import (
     SendTaskStreamingResponse,
     Task,
     TaskArtifactUpdateEvent,
-    TaskIdParams,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -46,14 +45,28 @@ class AgentTaskManager(InMemoryTaskManager):
     async def _run_streaming_agent(self, request: SendTaskStreamingRequest):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
+        answer = TextArtifactStream()
 
         try:
             async for item in self.agent.stream(
                 query, task_send_params.sessionId
             ):
+                if item.get('is_partial'):
+                    # token 分批发送给订阅者；任务中只保存最终回答。
+                    chunk = answer.append(item['content'])
+                    if chunk:
+                        await self.enqueue_events_for_sse(
+                            task_send_params.id,
+                            TaskArtifactUpdateEvent(
+                                id=task_send_params.id, artifact=chunk
+                            ),
+                        )
+                    continue
+
                 is_task_complete = item['is_task_complete']
                 require_user_input = item['require_user_input']
                 artifact = None
+                chunk = None
                 message = None
                 parts = [{'type': 'text', 'text': item['content']}]
                 end_stream = False
@@ -65,9 +78,12 @@ class AgentTaskManager(InMemoryTaskManager):
                     task_state = TaskState.INPUT_REQUIRED
                     message = Message(role='agent', parts=parts)
                     end_stream = True
+                    # 流式输出的文本是向用户提出的问题，改由状态消息携带。
+                    chunk = answer.finish('')
                 else:
                     task_state = TaskState.COMPLETED
                     artifact = Artifact(parts=parts, index=0, append=False)
+                    chunk = answer.finish(item['content'])
                     end_stream = True
 
                 task_status = TaskStatus(state=task_state, message=message)
@@ -78,9 +94,9 @@ class AgentTaskManager(InMemoryTaskManager):
                 )
                 await self.send_task_notification(latest_task)
 
-                if artifact:
+                if chunk:
                     task_artifact_update_event = TaskArtifactUpdateEvent(
-                        id=task_send_params.id, artifact=artifact
+                        id=task_send_params.id, artifact=chunk
                     )
                     await self.enqueue_events_for_sse(
                         task_send_params.id, task_artifact_update_event
@@ -157,9 +173,10 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            agent_response = self.agent.invoke(
-                query, task_send_params.sessionId
-            )
+            async with self.agent_slot(task_send_params):
+                agent_response = await self.agent.invoke(
+                    query, task_send_params.sessionId
+                )
         except Exception as e:
             logger.error(f'调用Agent时出错: {e}')
             raise ValueError(f'调用Agent时出错: {e}')
@@ -191,7 +208,9 @@ class AgentTaskManager(InMemoryTaskManager):
                 task_send_params.id, False
             )
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_run(
+                request.params, self._run_streaming_agent(request)
+            )
 
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
@@ -228,7 +247,7 @@ class AgentTaskManager(InMemoryTaskManager):
         task = await self.update_store(
             task_id, task_status, None if artifact is None else [artifact]
         )
-        task_result = self.append_task_history(task, history_length)
+        task_result = await self.append_task_history(task, history_length)
         await self.send_task_notification(task)
         return SendTaskResponse(id=request.id, result=task_result)
 
@@ -245,30 +264,10 @@ class AgentTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f'Notifying for task {task.id} => {task.status.state}')
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_sender_auth.enqueue_push_notification(
+            push_info.url, data=task.model_dump(exclude_none=True), key=task.id
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(
-                task_id_params.id, True
-            )
-            return self.dequeue_events_for_sse(
-                request.id, task_id_params.id, sse_event_queue
-            )
-        except Exception as e:
-            logger.error(f'Error while reconnecting to SSE stream: {e}')
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f'An error occurred while reconnecting to stream: {e}'
-                ),
-            )
-
     async def set_push_notification_info(
         self, task_id: str, push_notification_config: PushNotificationConfig
     ):
@@ -75,6 +75,7 @@ def main(host, port):
             notification_sender_auth.handle_jwks_endpoint,
             methods=['GET'],
         )
+        server.add_shutdown_handler(notification_sender_auth.aclose)
 
         logger.info(f'Starting server on {host}:{port}')
         server.start()
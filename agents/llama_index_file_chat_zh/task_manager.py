@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 
@@ -27,7 +26,6 @@ from common.types import (
     SendTaskStreamingResponse,
     Task,
     TaskArtifactUpdateEvent,
-    TaskIdParams,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -274,7 +272,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
                 parts=parts, index=0, append=False, metadata=metadata
             )
             task = await self.update_store(task_id, task_status, [artifact])
-            task_result = self.append_task_history(
+            task_result = await self.append_task_history(
                 task, task_send_params.historyLength
             )
             await self.send_task_notification(task)
@@ -294,7 +292,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
                 message=Message(role='agent', parts=parts),
             )
             task = await self.update_store(task_id, task_status, None)
-            task_result = self.append_task_history(
+            task_result = await self.append_task_history(
                 task, task_send_params.historyLength
             )
             await self.send_task_notification(task)
@@ -326,7 +324,9 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
                 task_send_params.id, False
             )
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_run(
+                request.params, self._run_streaming_agent(request)
+            )
 
             return self.dequeue_events_for_sse(
                 request.id, task_send_params.id, sse_event_queue
@@ -370,30 +370,10 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f'Notifying for task {task.id} => {task.status.state}')
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_sender_auth.enqueue_push_notification(
+            push_info.url, data=task.model_dump(exclude_none=True), key=task.id
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(
-                task_id_params.id, True
-            )
-            return self.dequeue_events_for_sse(
-                request.id, task_id_params.id, sse_event_queue
-            )
-        except Exception as e:
-            logger.error(f'Error while reconnecting to SSE stream: {e}')
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f'An error occurred while reconnecting to stream: {e}'
-                ),
-            )
-
     async def set_push_notification_info(
         self, task_id: str, push_notification_config: PushNotificationConfig
     ):
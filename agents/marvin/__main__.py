@@ -87,6 +87,7 @@ def main(host, port, result_type, instructions):
             notification_sender_auth.handle_jwks_endpoint,
             methods=["GET"],
         )
+        server.add_shutdown_handler(notification_sender_auth.aclose)
 
         logger.info(f"Starting Marvin Contact Extractor server on {host}:{port}")
         server.start()
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import traceback
 from collections.abc import AsyncIterable
@@ -21,7 +20,6 @@ from common.types import (
     SendTaskStreamingResponse,
     Task,
     TaskArtifactUpdateEvent,
-    TaskIdParams,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -213,7 +211,10 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            agent_response = await self.agent.invoke(query, task_send_params.sessionId)
+            async with self.agent_slot(task_send_params):
+                agent_response = await self.agent.invoke(
+                    query, task_send_params.sessionId
+                )
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             raise ValueError(f"Error invoking agent: {e}")
@@ -243,7 +244,7 @@ class AgentTaskManager(InMemoryTaskManager):
             task_send_params: TaskSendParams = request.params
             sse_event_queue = await self.setup_sse_consumer(task_send_params.id, False)
 
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_run(request.params, self._run_streaming_agent(request))
 
             return self.dequeue_events_for_sse(  # type: ignore
                 request.id, task_send_params.id, sse_event_queue
@@ -269,7 +270,7 @@ class AgentTaskManager(InMemoryTaskManager):
         task_status, artifacts = self._parse_agent_outcome(agent_response)
 
         task = await self.update_store(task_id, task_status, artifacts)
-        task_result = self.append_task_history(task, history_length)
+        task_result = await self.append_task_history(task, history_length)
         await self.send_task_notification(task)
         return SendTaskResponse(id=request.id, result=task_result)
 
@@ -286,28 +287,10 @@ class AgentTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f"Notifying for task {task.id} => {task.status.state}")
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_sender_auth.enqueue_push_notification(
+            push_info.url, data=task.model_dump(exclude_none=True), key=task.id
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(  # type: ignore
-                request.id, task_id_params.id, sse_event_queue
-            )
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-
     async def set_push_notification_info(
         self, task_id: str, push_notification_config: PushNotificationConfig
     ):
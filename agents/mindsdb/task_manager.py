@@ -3,7 +3,7 @@ import logging
 from collections.abc import AsyncIterable
 
 from agent import MindsDBAgent
-from common.server import utils
+from common.server import CoalescingStats, EventCoalescer, utils
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
     Artifact,
@@ -14,7 +14,6 @@ from common.types import (
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    Task,
     TaskArtifactUpdateEvent,
     TaskSendParams,
     TaskState,
@@ -28,65 +27,80 @@ logger = logging.getLogger(__name__)
 
 
 class AgentTaskManager(InMemoryTaskManager):
-    def __init__(self, agent: MindsDBAgent):
+    def __init__(
+        self,
+        agent: MindsDBAgent,
+        coalesce_window: float = 0.05,
+        coalesce_max_bytes: int = 4096,
+    ):
         super().__init__()
         self.agent = agent
+        # The agent reports every token as a status update; updates are
+        # batched for up to coalesce_window seconds or coalesce_max_bytes
+        # of text before they are stored and sent.
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_bytes = coalesce_max_bytes
+
+    async def _agent_events(
+        self, task_send_params: TaskSendParams, stats: CoalescingStats
+    ) -> AsyncIterable[TaskStatusUpdateEvent | TaskArtifactUpdateEvent]:
+        """Turns the items streamed by the agent into task events."""
+        query = self._get_user_query(task_send_params)
+        async for item in self.agent.stream(query, task_send_params.sessionId):
+            parts = item['parts']
+            if item['is_task_complete']:
+                yield TaskArtifactUpdateEvent(
+                    id=task_send_params.id,
+                    artifact=Artifact(parts=parts, index=0, append=False),
+                )
+                yield TaskStatusUpdateEvent(
+                    id=task_send_params.id,
+                    status=TaskStatus(state=TaskState.COMPLETED),
+                    final=True,
+                )
+                continue
+
+            with stats.timing():
+                message = Message(
+                    role='agent', parts=parts, metadata=item['metadata']
+                )
+                event = TaskStatusUpdateEvent(
+                    id=task_send_params.id,
+                    status=TaskStatus(state=TaskState.WORKING, message=message),
+                    final=False,
+                )
+            yield event
 
     async def _stream_generator(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         task_send_params: TaskSendParams = request.params
-        query = self._get_user_query(task_send_params)
+        coalescer = EventCoalescer(
+            self.coalesce_window, self.coalesce_max_bytes
+        )
+        # The artifact is stored along with the final status.
+        artifacts = []
         try:
-            async for item in self.agent.stream(
-                query, task_send_params.sessionId
+            async for event in coalescer.coalesce(
+                self._agent_events(task_send_params, coalescer.stats)
             ):
-                is_task_complete = item['is_task_complete']
-                parts = item['parts']
-
-                if not is_task_complete:
-                    task_state = TaskState.WORKING
-                    metadata = item['metadata']
-                    message = Message(
-                        role='agent', parts=parts, metadata=metadata
-                    )
-                    task_status = TaskStatus(state=task_state, message=message)
-                    await self._update_store(
-                        task_send_params.id, task_status, []
-                    )
-                    task_update_event = TaskStatusUpdateEvent(
-                        id=task_send_params.id,
-                        status=task_status,
-                        final=False,
-                    )
-                    yield SendTaskStreamingResponse(
-                        id=request.id, result=task_update_event
-                    )
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    artifacts.append(event.artifact)
                 else:
-                    # task_state = TaskState.INPUT_REQUIRED
-                    task_state = TaskState.COMPLETED
-                    artifact = Artifact(parts=parts, index=0, append=False)
-                    task_status = TaskStatus(state=task_state)
-                    yield SendTaskStreamingResponse(
-                        id=request.id,
-                        result=TaskArtifactUpdateEvent(
-                            id=task_send_params.id,
-                            artifact=artifact,
-                        ),
-                    )
-                    await self._update_store(
-                        task_send_params.id, task_status, [artifact]
+                    # Streamed WORKING fragments stay out of history.
+                    await self.update_store(
+                        task_send_params.id,
+                        event.status,
+                        artifacts,
+                        record_history=event.status.state != TaskState.WORKING,
                     )
-                    yield SendTaskStreamingResponse(
-                        id=request.id,
-                        result=TaskStatusUpdateEvent(
-                            id=task_send_params.id,
-                            status=TaskStatus(
-                                state=task_status.state,
-                            ),
-                            final=True,
-                        ),
+                    artifacts = []
+                # The store update awaits I/O, so it is left out of timing.
+                with coalescer.stats.timing():
+                    response = SendTaskStreamingResponse(
+                        id=request.id, result=event
                     )
+                yield response
 
         except Exception as e:
             logger.error(f'An error occurred while streaming the response: {e}')
@@ -96,6 +110,8 @@ class AgentTaskManager(InMemoryTaskManager):
                     message='An error occurred while streaming the response'
                 ),
             )
+        finally:
+            self.record_stream_stats(task_send_params.id, coalescer.stats)
 
     def _validate_request(
         self, request: SendTaskRequest | SendTaskStreamingRequest
@@ -128,24 +144,6 @@ class AgentTaskManager(InMemoryTaskManager):
         await self.upsert_task(request.params)
         return self._stream_generator(request)
 
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f'Task {task_id} not found for updating the task')
-                raise ValueError(f'Task {task_id} not found')
-            task.status = status
-            # if status.message is not None:
-            #    self.task_messages[task_id].append(status.message)
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
-
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
@@ -160,7 +158,7 @@ class AgentTaskManager(InMemoryTaskManager):
             if 'MISSING_INFO:' in result
             else TaskState.COMPLETED
         )
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(
                 state=task_state, message=Message(role='agent', parts=parts)
@@ -1,11 +1,11 @@
+import json
 import logging
 import os
+import re
 
 from collections.abc import AsyncIterable
 from typing import TYPE_CHECKING, Annotated, Any, Literal
 
-import httpx
-
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from semantic_kernel.agents import ChatCompletionAgent, ChatHistoryAgentThread
@@ -22,6 +22,11 @@ from semantic_kernel.contents import (
 from semantic_kernel.functions import kernel_function
 from semantic_kernel.functions.kernel_arguments import KernelArguments
 
+from common.utils.exchange_rates import (
+    ExchangeRateProvider,
+    UnknownCurrencyError,
+)
+
 
 if TYPE_CHECKING:
     from semantic_kernel.contents import ChatMessageContent
@@ -32,6 +37,9 @@ load_dotenv()
 
 # region Plugin
 
+# Shared by every lookup so rates are cached across sessions.
+rate_provider = ExchangeRateProvider()
+
 
 class CurrencyPlugin:
     """A simple currency plugin that leverages Frankfurter for exchange rates.
@@ -42,7 +50,7 @@ class CurrencyPlugin:
     @kernel_function(
         description='Retrieves exchange rate between currency_from and currency_to using Frankfurter API'
     )
-    def get_exchange_rate(
+    async def get_exchange_rate(
         self,
         currency_from: Annotated[
             str, 'Currency code to convert from, e.g. USD'
@@ -53,19 +61,19 @@ class CurrencyPlugin:
         date: Annotated[str, "Date or 'latest'"] = 'latest',
     ) -> str:
         try:
-            response = httpx.get(
-                f'https://api.frankfurter.app/{date}',
-                params={'from': currency_from, 'to': currency_to},
-                timeout=10.0,
+            data = await rate_provider.get_rates(
+                currency_from, currency_to, date
             )
-            response.raise_for_status()
-            data = response.json()
-            if 'rates' not in data or currency_to not in data['rates']:
-                return f'Could not retrieve rate for {currency_from} to {currency_to}'
-            rate = data['rates'][currency_to]
-            return f'1 {currency_from} = {rate} {currency_to}'
+        except UnknownCurrencyError:
+            data = {'rates': {}}
         except Exception as e:
             return f'Currency API call failed: {e!s}'
+        rate = data['rates'].get(currency_to.upper())
+        if rate is None:
+            return (
+                f'Could not retrieve rate for {currency_from} to {currency_to}'
+            )
+        return f'1 {currency_from} = {rate} {currency_to}'
 
 
 # endregion
@@ -80,6 +88,63 @@ class ResponseFormat(BaseModel):
     message: str
 
 
+class _MessageFieldReader:
+    """Decodes the message of a ResponseFormat JSON document as it streams.
+
+    ``feed`` takes the next piece of the document and returns the text of
+    its "message" field decoded since the last call. ``status`` is set once
+    the "status" field has been read.
+    """
+
+    _STATUS = re.compile(r'"status"\s*:\s*"(\w+)"')
+    _MESSAGE = re.compile(r'"message"\s*:\s*"')
+    _HIGH_SURROGATE = re.compile(r'\\u[dD][89abAB]')
+
+    def __init__(self):
+        self.status: str | None = None
+        self._buffer = ''
+        # Where the undecoded rest of the message starts, once found.
+        self._position: int | None = None
+        self._done = False
+
+    def feed(self, text: str) -> str:
+        self._buffer += text
+        if self.status is None:
+            match = self._STATUS.search(self._buffer)
+            if match:
+                self.status = match.group(1)
+        if self._done:
+            return ''
+        if self._position is None:
+            match = self._MESSAGE.search(self._buffer)
+            if match is None:
+                return ''
+            self._position = match.end()
+
+        buffer = self._buffer
+        decoded = []
+        i = self._position
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._done = True
+                break
+            if char != '\\':
+                decoded.append(char)
+                i += 1
+                continue
+            if self._HIGH_SURROGATE.match(buffer, i):
+                length = 12  # a surrogate pair is decoded as a whole
+            else:
+                length = 6 if buffer[i + 1 : i + 2] == 'u' else 2
+            if i + length > len(buffer):
+                break  # wait for the rest of the escape sequence
+            decoded.append(json.loads(f'"{buffer[i : i + length]}"'))
+            i += length
+        self._position = i
+        return ''.join(decoded)
+
+
 # endregion
 
 # region Semantic Kernel Agent
@@ -191,6 +256,7 @@ class SemanticKernelTravelAgent:
         await self._ensure_thread_exists(session_id)
 
         chunks: list[StreamingChatMessageContent] = []
+        reader = _MessageFieldReader()
 
         # For the sample, to avoid too many messages, only show one "in-progress" message for each task
         tool_call_in_progress = False
@@ -224,6 +290,17 @@ class SemanticKernelTravelAgent:
 
                 chunks.append(response_chunk.message)
 
+                # Stream the answer text, unless the response turns out to
+                # be a question for the user rather than an answer.
+                text = reader.feed(response_chunk.message.content or '')
+                if text and reader.status in (None, 'completed'):
+                    yield {
+                        'is_task_complete': False,
+                        'require_user_input': False,
+                        'is_partial': True,
+                        'content': text,
+                    }
+
         full_message = sum(chunks[1:], chunks[0])
         yield self._get_agent_response(full_message)
 
@@ -1,9 +1,9 @@
-import asyncio
 import logging
 
 from collections.abc import AsyncIterable
 
 from agents.semantickernel.agent import SemanticKernelTravelAgent
+from common.server.artifact_chunker import TextArtifactStream
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
     Artifact,
@@ -56,9 +56,10 @@ class TaskManager(InMemoryTaskManager):
 
         query = request.params.message.parts[0].text
         try:
-            agent_response = await self.agent.invoke(
-                query, request.params.sessionId
-            )
+            async with self.agent_slot(request.params):
+                agent_response = await self.agent.invoke(
+                    query, request.params.sessionId
+                )
         except Exception as e:
             logger.error(f'Semantic Kernel Task Manager error: {e}')
             raise ValueError(f'Agent error: {e}')
@@ -83,7 +84,9 @@ class TaskManager(InMemoryTaskManager):
 
             await self.upsert_task(request.params)
             sse_queue = await self.setup_sse_consumer(request.params.id, False)
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_agent_run(
+                request.params, self._run_streaming_agent(request)
+            )
             return self.dequeue_events_for_sse(
                 request.id, request.params.id, sse_queue
             )
@@ -105,15 +108,30 @@ class TaskManager(InMemoryTaskManager):
         Yields:
             AsyncIterable[SendTaskStreamingResponse]: The streaming response.
         """
+        answer = TextArtifactStream()
         try:
             query = request.params.message.parts[0].text
             async for partial in self.agent.stream(
                 query, request.params.sessionId
             ):
+                if partial.get('is_partial'):
+                    # Answer text goes to subscribers in batches as it
+                    # arrives; the task stores the final answer only.
+                    chunk = answer.append(partial['content'])
+                    if chunk:
+                        await self.enqueue_events_for_sse(
+                            request.params.id,
+                            TaskArtifactUpdateEvent(
+                                id=request.params.id, artifact=chunk
+                            ),
+                        )
+                    continue
+
                 require_input = partial['require_user_input']
                 is_done = partial['is_task_complete']
                 text_content = partial['content']
                 artifact = None
+                chunk = None
 
                 new_status = TaskStatus(state=TaskState.WORKING)
                 # By default, don't end the stream
@@ -127,6 +145,9 @@ class TaskManager(InMemoryTaskManager):
                     )
                     # End the stream if we need user input
                     final = True
+                    # Withdraw any streamed text; the question for the user
+                    # is in the status message.
+                    chunk = answer.finish('')
                 elif is_done:
                     new_status.state = TaskState.COMPLETED
                     artifact = Artifact(
@@ -134,6 +155,7 @@ class TaskManager(InMemoryTaskManager):
                         index=0,
                         append=False,
                     )
+                    chunk = answer.finish(text_content)
                     # End the stream if the agent is fully done
                     final = True
                 else:
@@ -143,9 +165,9 @@ class TaskManager(InMemoryTaskManager):
                         parts=[{'type': 'text', 'text': text_content}],
                     )
 
-                if artifact:
+                if chunk:
                     task_artifact_update_event = TaskArtifactUpdateEvent(
-                        id=request.params.id, artifact=artifact
+                        id=request.params.id, artifact=chunk
                     )
                     await self.enqueue_events_for_sse(
                         request.params.id, task_artifact_update_event
@@ -241,6 +263,6 @@ class TaskManager(InMemoryTaskManager):
         if not await self.has_push_notification_info(task.id):
             return
         push_info = await self.get_push_notification_info(task.id)
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_sender_auth.enqueue_push_notification(
+            push_info.url, data=task.model_dump(exclude_none=True), key=task.id
         )
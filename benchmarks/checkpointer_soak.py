@@ -0,0 +1,134 @@
+"""Soak test of CurrencyAgent session memory over many sessions.
+
+Runs ``--sessions`` conversations of ``--turns`` turns each through
+CurrencyAgent, ``--concurrency`` at a time, with the fake chat model and
+FrankfurterStub of benchmarks.currency_agent so nothing leaves the process.
+Every ``--report-every`` sessions it prints throughput, process RSS and the
+checkpointer's thread counts. After the run a sample of the first sessions
+is looked up again to show whether their state is still available.
+
+With ``--saver memory`` the agent uses LangGraph's MemorySaver, whose memory
+grows with every session; with ``--saver bounded`` it uses
+BoundedCheckpointSaver, optionally spilling to ``--spill-path``.
+
+Requires the langgraph agent's dependencies. The output of a 100000-session
+run of the bounded saver with ``--max-threads 1000`` and a spill file is in
+benchmarks/results/checkpointer_soak_100000.txt.
+
+Usage:
+    python -m benchmarks.checkpointer_soak --sessions 100000
+    python -m benchmarks.checkpointer_soak --saver memory --sessions 20000
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+
+from uuid import uuid4
+
+import httpx
+
+from agents.langgraph import agent as agent_module
+from agents.langgraph.agent import CurrencyAgent
+from agents.langgraph.checkpointer import BoundedCheckpointSaver
+from benchmarks.currency_agent import _FakeCurrencyModel
+from benchmarks.frankfurter_stub import FrankfurterStub
+from common.server.utils import process_rss_bytes
+from common.utils.exchange_rates import ExchangeRateProvider
+from langgraph.checkpoint.memory import MemorySaver
+
+
+def _config(session_id: str) -> dict:
+    return {'configurable': {'thread_id': session_id}}
+
+
+async def _session(agent: CurrencyAgent, session_id: str, turns: int):
+    for _ in range(turns):
+        response = await agent.invoke('How much is 1 USD in EUR?', session_id)
+        assert response['is_task_complete'], response
+
+
+def _report(checkpointer, done: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    line = (
+        f'{done:>9} {elapsed:>8.1f} {done / elapsed:>9.0f}'
+        f' {process_rss_bytes() / 2**20:>8.1f}'
+    )
+    if isinstance(checkpointer, BoundedCheckpointSaver):
+        stats = checkpointer.stats()
+        line += (
+            f' {stats["threads"]:>8} {stats.get("spilled", 0):>8}'
+            f' {stats["evicted"]:>8}'
+        )
+    else:
+        line += f' {len(checkpointer.storage):>8}'
+    print(line, flush=True)
+
+
+async def main(args):
+    agent_module.rate_provider = ExchangeRateProvider(
+        base_url='http://frankfurter',
+        httpx_client=httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=FrankfurterStub().app)
+        ),
+    )
+    if args.saver == 'memory':
+        checkpointer = MemorySaver()
+    else:
+        checkpointer = BoundedCheckpointSaver(
+            max_threads=args.max_threads,
+            ttl=None,
+            max_messages=args.max_messages,
+            spill_path=args.spill_path,
+        )
+    agent = CurrencyAgent(_FakeCurrencyModel(latency=0), checkpointer)
+    session_ids = [uuid4().hex for _ in range(args.sessions)]
+
+    print(
+        f'{"sessions":>9} {"seconds":>8} {"sess/s":>9} {"RSS MiB":>8}'
+        f' {"threads":>8} {"spilled":>8} {"evicted":>8}'
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+    done = 0
+    started = time.perf_counter()
+
+    async def run(session_id):
+        nonlocal done
+        async with semaphore:
+            await _session(agent, session_id, args.turns)
+        done += 1
+        if done % args.report_every == 0:
+            _report(checkpointer, done, started)
+
+    await asyncio.gather(*(run(session_id) for session_id in session_ids))
+    if done % args.report_every:
+        _report(checkpointer, done, started)
+
+    sample = session_ids[: args.sample]
+    resumable = 0
+    for session_id in sample:
+        state = await agent.graph.aget_state(_config(session_id))
+        resumable += bool(state.values.get('messages'))
+    print(f'{resumable}/{len(sample)} of the first sessions can be resumed')
+
+    if isinstance(checkpointer, BoundedCheckpointSaver):
+        checkpointer.close()
+    await agent_module.rate_provider.aclose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=100000)
+    parser.add_argument('--turns', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument(
+        '--saver', choices=('bounded', 'memory'), default='bounded'
+    )
+    parser.add_argument('--max-threads', type=int, default=10000)
+    parser.add_argument('--max-messages', type=int, default=8)
+    parser.add_argument('--spill-path', help='SQLite file for evicted threads')
+    parser.add_argument('--report-every', type=int, default=10000)
+    parser.add_argument('--sample', type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+"""Measures A2AClient calls/sec against a local echo A2AServer.
+
+``fresh`` opens a new connection pool for every call, as A2AClient did
+before it kept a shared httpx.AsyncClient; ``pooled`` reuses one client.
+
+Usage:
+    python -m benchmarks.client_calls --calls 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from uuid import uuid4
+
+from benchmarks.echo_agent import serve_echo_agent
+from common.client import A2AClient
+
+
+def _payload() -> dict:
+    return {
+        'id': uuid4().hex,
+        'message': {'role': 'user', 'parts': [{'type': 'text', 'text': 'hi'}]},
+    }
+
+
+async def _run(url: str, calls: int, concurrency: int, pooled: bool) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    shared = A2AClient(url=url)
+
+    async def call():
+        async with semaphore:
+            if pooled:
+                await shared.send_task(_payload())
+            else:
+                async with A2AClient(url=url) as client:
+                    await client.send_task(_payload())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    await shared.aclose()
+    return calls / elapsed
+
+
+async def main(args):
+    logging.getLogger('common').setLevel(logging.WARNING)
+    async with serve_echo_agent() as url:
+        fresh = await _run(url, args.calls, args.concurrency, pooled=False)
+        pooled = await _run(url, args.calls, args.concurrency, pooled=True)
+    print(f'fresh client per call: {fresh:8.0f} calls/s')
+    print(f'pooled client:         {pooled:8.0f} calls/s')
+    print(f'speedup:               {pooled / fresh:8.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
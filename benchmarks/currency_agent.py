@@ -0,0 +1,117 @@
+"""Measures how CurrencyAgent sessions overlap on one event loop.
+
+The Gemini model is replaced by a fake chat model that waits
+``--model-latency`` seconds per call and always looks up a rate once, and
+the Frankfurter API by an in-process FrankfurterStub that waits
+``--tool-latency`` seconds. Nothing leaves the process. As the agent runs
+the graph with astream and the tool uses an async client, N concurrent
+sessions should take about as long as one.
+
+Requires the langgraph agent's dependencies.
+
+Usage:
+    python -m benchmarks.currency_agent --sessions 1 10 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from typing import Any
+from uuid import uuid4
+
+import httpx
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from agents.langgraph import agent as agent_module
+from agents.langgraph.agent import CurrencyAgent, ResponseFormat
+from benchmarks.frankfurter_stub import FrankfurterStub
+from common.utils.exchange_rates import ExchangeRateProvider
+
+
+class _FakeCurrencyModel(BaseChatModel):
+    """Asks for one exchange rate, then answers with it."""
+
+    latency: float = 0.1
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake-currency'
+
+    def bind_tools(self, tools, **kwargs) -> '_FakeCurrencyModel':
+        return self
+
+    def with_structured_output(self, schema, **kwargs) -> RunnableLambda:
+        async def respond(messages):
+            await asyncio.sleep(self.latency)
+            return ResponseFormat(status='completed', message='1 USD = 0.9 EUR')
+
+        return RunnableLambda(
+            lambda _: ResponseFormat(status='completed', message=''),
+            afunc=respond,
+        )
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs):
+        raise NotImplementedError('Only the async path is benchmarked')
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], *args, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        if isinstance(messages[-1], ToolMessage):
+            message = AIMessage(content='1 USD = 0.9 EUR')
+        else:
+            message = AIMessage(
+                content='',
+                tool_calls=[
+                    {
+                        'name': 'get_exchange_rate',
+                        'args': {'currency_from': 'USD', 'currency_to': 'EUR'},
+                        'id': uuid4().hex,
+                    }
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+async def _session(agent: CurrencyAgent) -> dict[str, Any]:
+    async for item in agent.stream('How much is 1 USD in EUR?', uuid4().hex):
+        last = item
+    return last
+
+
+async def main(args):
+    agent_module.rate_provider = ExchangeRateProvider(
+        base_url='http://frankfurter',
+        httpx_client=httpx.AsyncClient(
+            transport=httpx.ASGITransport(
+                app=FrankfurterStub(args.tool_latency).app
+            )
+        ),
+    )
+    agent = CurrencyAgent(_FakeCurrencyModel(latency=args.model_latency))
+
+    print(f'{"sessions":>8} {"seconds":>8} {"vs one":>8}')
+    single = None
+    for sessions in args.sessions:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(_session(agent) for _ in range(sessions))
+        )
+        elapsed = time.perf_counter() - start
+        assert all(result['is_task_complete'] for result in results)
+        single = single or elapsed
+        print(f'{sessions:>8} {elapsed:>8.2f} {elapsed / single:>7.1f}x')
+    await agent_module.rate_provider.aclose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--model-latency', type=float, default=0.1)
+    parser.add_argument('--tool-latency', type=float, default=0.1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,137 @@
+"""A deterministic echo agent for benchmarks: no LLM and no network calls."""
+
+import asyncio
+import socket
+
+from collections.abc import AsyncIterable
+from contextlib import asynccontextmanager
+
+import uvicorn
+
+from common.server import A2AServer, InMemoryTaskManager
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Artifact,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    """Completes every task with an artifact echoing the user's text.
+
+    Streaming tasks emit ``working_updates`` WORKING status updates before
+    the artifact and the final status.
+    """
+
+    def __init__(self, working_updates: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.working_updates = working_updates
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        text = request.params.message.parts[0].text
+        task = await self.update_store(
+            request.params.id,
+            TaskStatus(state=TaskState.COMPLETED),
+            [Artifact(parts=[TextPart(text=text)])],
+        )
+        return SendTaskResponse(
+            id=request.id,
+            result=await self.append_task_history(
+                task, request.params.historyLength
+            ),
+        )
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        await self.upsert_task(request.params)
+        sse_event_queue = await self.setup_sse_consumer(request.params.id)
+        self.start_agent_run(request.params, self._run_echo(request))
+        return self.dequeue_events_for_sse(
+            request.id, request.params.id, sse_event_queue
+        )
+
+    async def _run_echo(self, request: SendTaskStreamingRequest):
+        task_id = request.params.id
+        text = request.params.message.parts[0].text
+        for i in range(self.working_updates):
+            status = TaskStatus(
+                state=TaskState.WORKING,
+                message=Message(
+                    role='agent', parts=[TextPart(text=f'step {i}')]
+                ),
+            )
+            await self.update_store(task_id, status, None)
+            await self.enqueue_events_for_sse(
+                task_id, TaskStatusUpdateEvent(id=task_id, status=status)
+            )
+            await asyncio.sleep(0)
+
+        artifact = Artifact(parts=[TextPart(text=text)])
+        status = TaskStatus(state=TaskState.COMPLETED)
+        await self.update_store(task_id, status, [artifact])
+        await self.enqueue_events_for_sse(
+            task_id, TaskArtifactUpdateEvent(id=task_id, artifact=artifact)
+        )
+        await self.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(id=task_id, status=status, final=True),
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def create_echo_server(
+    port: int, task_manager: InMemoryTaskManager | None = None, **kwargs
+) -> A2AServer:
+    """Builds the echo A2AServer; kwargs are passed to A2AServer."""
+    agent_card = AgentCard(
+        name='Echo Agent',
+        url=f'http://127.0.0.1:{port}/',
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[AgentSkill(id='echo', name='Echo')],
+    )
+    return A2AServer(
+        host='127.0.0.1',
+        port=port,
+        agent_card=agent_card,
+        task_manager=task_manager or EchoTaskManager(),
+        **kwargs,
+    )
+
+
+@asynccontextmanager
+async def serve_echo_agent(task_manager: InMemoryTaskManager | None = None):
+    """Runs an echo A2AServer on a free local port, yielding its URL."""
+    port = _free_port()
+    server = create_echo_server(port, task_manager)
+    config = uvicorn.Config(
+        server.app, host='127.0.0.1', port=port, log_level='warning'
+    )
+    uvicorn_server = uvicorn.Server(config)
+    serve_task = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield server.agent_card.url
+    finally:
+        uvicorn_server.should_exit = True
+        await serve_task
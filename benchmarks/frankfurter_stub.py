@@ -0,0 +1,76 @@
+"""A local stand-in for the Frankfurter exchange rate API.
+
+Serves fixed rates for ``GET /{date}?from=...&to=...`` and counts the
+requests it receives, so tests and benchmarks of the currency agents need
+no network access. Point an agent at it with FRANKFURTER_URL.
+
+Usage:
+    python -m benchmarks.frankfurter_stub --port 8001 --latency 0.1
+"""
+
+import argparse
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+
+STUB_DATE = '2025-01-02'
+
+# Units of each currency per euro.
+EURO_RATES = {
+    'EUR': 1.0,
+    'USD': 1.1,
+    'GBP': 0.85,
+    'JPY': 160.0,
+    'INR': 90.0,
+    'CNY': 7.5,
+}
+
+
+class FrankfurterStub:
+    """Starlette app answering like Frankfurter after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.app = Starlette()
+        self.app.add_route('/{date}', self._get_rates, methods=['GET'])
+
+    async def _get_rates(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        base = request.query_params.get('from', 'EUR').upper()
+        to = request.query_params.get('to')
+        currencies = to.upper().split(',') if to else list(EURO_RATES)
+        if base not in EURO_RATES or any(
+            currency not in EURO_RATES for currency in currencies
+        ):
+            return JSONResponse({'message': 'not found'}, status_code=404)
+
+        date = request.path_params['date']
+        return JSONResponse(
+            {
+                'amount': 1.0,
+                'base': base,
+                'date': STUB_DATE if date == 'latest' else date,
+                'rates': {
+                    currency: round(EURO_RATES[currency] / EURO_RATES[base], 5)
+                    for currency in currencies
+                    if currency != base
+                },
+            }
+        )
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(FrankfurterStub(args.latency).app, port=args.port)
@@ -0,0 +1,97 @@
+"""Microbenchmark of A2AServer request decoding and response encoding.
+
+``before`` reproduces the original pipeline: json.loads, validation against
+the whole A2ARequest union, model_dump and Starlette's JSONResponse.
+``after`` is the current fast path: A2AServer._parse_request on the raw
+bytes and pydantic's direct JSON serialisation.
+
+Usage:
+    python -m benchmarks.request_decoding --iterations 20000
+"""
+
+import argparse
+import json
+import time
+
+from starlette.responses import JSONResponse
+
+from common.server import server as server_module
+from common.server.server import A2AServer
+from common.types import (
+    A2ARequest,
+    Artifact,
+    GetTaskRequest,
+    GetTaskResponse,
+    Message,
+    SendTaskRequest,
+    Task,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def _payloads() -> dict[str, bytes]:
+    message = Message(role='user', parts=[TextPart(text='hello ' * 50)])
+    send = SendTaskRequest(params=TaskSendParams(id='task', message=message))
+    get = GetTaskRequest(params=TaskQueryParams(id='task', historyLength=5))
+    return {
+        'tasks/send': send.model_dump_json().encode(),
+        'tasks/get': get.model_dump_json().encode(),
+    }
+
+
+def _response() -> GetTaskResponse:
+    message = Message(role='agent', parts=[TextPart(text='result ' * 50)])
+    task = Task(
+        id='task',
+        sessionId='session',
+        status=TaskStatus(state=TaskState.COMPLETED),
+        artifacts=[Artifact(parts=message.parts)],
+        history=[message] * 5,
+    )
+    return GetTaskResponse(id=1, result=task)
+
+
+def _before(body: bytes, response: GetTaskResponse) -> bytes:
+    A2ARequest.validate_python(json.loads(body))
+    return JSONResponse(response.model_dump(exclude_none=True)).body
+
+
+def _after(server: A2AServer, body: bytes, response: GetTaskResponse) -> bytes:
+    server._parse_request(body)
+    return server_module._json_response(response).body
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(args):
+    server = A2AServer()
+    response = _response()
+    print(f'orjson available: {server_module.orjson is not None}')
+    print(
+        f'{"method":<12} {"before req/s":>14} {"after req/s":>14} {"speedup":>8}'
+    )
+    for method, body in _payloads().items():
+        before = _rate(
+            lambda body=body: _before(body, response), args.iterations
+        )
+        after = _rate(
+            lambda body=body: _after(server, body, response), args.iterations
+        )
+        print(
+            f'{method:<12} {before:>14.0f} {after:>14.0f} {after / before:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10000)
+    main(parser.parse_args())
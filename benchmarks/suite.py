@@ -0,0 +1,239 @@
+"""Benchmark suite driving a local echo A2AServer through A2AClient.
+
+Each scenario runs ``--requests`` calls, ``--concurrency`` at a time, and
+reports throughput, p50/p99 latency and the change in process RSS (client
+and server share the process). A second, shorter pass per scenario runs
+under tracemalloc to report allocated and retained memory without slowing
+down the timed pass.
+
+Scenarios:
+    send          tasks/send
+    get           tasks/get on a completed task
+    subscribe     tasks/sendSubscribe, consuming the whole stream
+    resubscribe   tasks/resubscribe replaying a finished task's events
+
+Results can be saved as JSON and compared with a saved baseline; the run
+exits with status 1 when a scenario's throughput drops or its p99 latency
+grows by more than ``--max-regression``.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from benchmarks.echo_agent import serve_echo_agent
+from common.client import A2AClient
+from common.server.utils import process_rss_bytes
+
+
+SCENARIOS = ('send', 'get', 'subscribe', 'resubscribe')
+
+
+def _payload(task_id: str | None = None) -> dict:
+    return {
+        'id': task_id or uuid4().hex,
+        'message': {'role': 'user', 'parts': [{'type': 'text', 'text': 'hi'}]},
+    }
+
+
+def _percentile(latencies: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted latencies."""
+    index = min(len(latencies) - 1, max(0, round(q * len(latencies)) - 1))
+    return latencies[index]
+
+
+async def _prepare(client: A2AClient, scenario: str, requests: int) -> list:
+    """Creates the tasks a scenario reads; returns one argument per call."""
+    if scenario in ('send', 'subscribe'):
+        return [None] * requests
+
+    task_ids = [uuid4().hex for _ in range(requests)]
+    for task_id in task_ids:
+        if scenario == 'get':
+            await client.send_task(_payload(task_id))
+        else:
+            async for _ in client.send_task_streaming(_payload(task_id)):
+                pass
+    return task_ids
+
+
+def _operation(
+    client: A2AClient, scenario: str
+) -> Callable[[str | None], Awaitable[None]]:
+    async def send(_):
+        await client.send_task(_payload())
+
+    async def get(task_id):
+        await client.get_task({'id': task_id})
+
+    async def subscribe(_):
+        async for _ in client.send_task_streaming(_payload()):
+            pass
+
+    async def resubscribe(task_id):
+        async for _ in client.resubscribe_task({'id': task_id}, 0):
+            pass
+
+    return {
+        'send': send,
+        'get': get,
+        'subscribe': subscribe,
+        'resubscribe': resubscribe,
+    }[scenario]
+
+
+async def _drive(
+    operation: Callable[[str | None], Awaitable[None]],
+    arguments: list,
+    concurrency: int,
+) -> tuple[float, list[float]]:
+    """Runs the operation once per argument; returns elapsed and latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call(argument):
+        async with semaphore:
+            started = time.perf_counter()
+            await operation(argument)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(argument) for argument in arguments))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+async def run_scenario(url: str, scenario: str, args) -> dict:
+    async with A2AClient(url=url) as client:
+        operation = _operation(client, scenario)
+        # Warm up connections and code paths before measuring.
+        await _drive(
+            operation,
+            await _prepare(client, scenario, args.concurrency),
+            args.concurrency,
+        )
+
+        arguments = await _prepare(client, scenario, args.requests)
+        gc.collect()
+        rss_before = process_rss_bytes()
+        elapsed, latencies = await _drive(
+            operation, arguments, args.concurrency
+        )
+        rss_after = process_rss_bytes()
+
+        arguments = await _prepare(client, scenario, args.alloc_requests)
+        gc.collect()
+        tracemalloc.start()
+        await _drive(operation, arguments, args.concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'throughput': args.requests / elapsed,
+        'p50_ms': _percentile(latencies, 0.5) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        # None where process_rss_bytes cannot read the RSS.
+        'rss_delta_bytes': (
+            None
+            if rss_before is None or rss_after is None
+            else rss_after - rss_before
+        ),
+        'rss_bytes': rss_after,
+        'alloc_peak_bytes_per_request': peak / args.alloc_requests,
+        'alloc_retained_bytes_per_request': retained / args.alloc_requests,
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Lists scenarios that got slower than the baseline allows."""
+    regressions = []
+    for scenario, result in results['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(scenario)
+        if before is None:
+            continue
+        if result['throughput'] < before['throughput'] * (1 - max_regression):
+            regressions.append(
+                f'{scenario}: throughput {before["throughput"]:.0f} -> '
+                f'{result["throughput"]:.0f} req/s'
+            )
+        if result['p99_ms'] > before['p99_ms'] * (1 + max_regression):
+            regressions.append(
+                f'{scenario}: p99 {before["p99_ms"]:.2f} -> '
+                f'{result["p99_ms"]:.2f} ms'
+            )
+    return regressions
+
+
+async def run_suite(args) -> dict:
+    """Runs the selected scenarios against a local echo agent."""
+    results = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'scenarios': {},
+    }
+    print(
+        f'{"scenario":<12} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8}'
+        f' {"RSS +KiB":>9} {"alloc KiB/req":>14}'
+    )
+    async with serve_echo_agent() as url:
+        for scenario in args.scenarios:
+            result = await run_scenario(url, scenario, args)
+            results['scenarios'][scenario] = result
+            rss_delta = result['rss_delta_bytes']
+            rss_kib = 'n/a' if rss_delta is None else f'{rss_delta / 1024:.0f}'
+            print(
+                f'{scenario:<12} {result["throughput"]:>9.0f}'
+                f' {result["p50_ms"]:>8.2f} {result["p99_ms"]:>8.2f}'
+                f' {rss_kib:>9}'
+                f' {result["alloc_peak_bytes_per_request"] / 1024:>14.1f}'
+            )
+    return results
+
+
+def main(args) -> int:
+    logging.getLogger('common').setLevel(logging.WARNING)
+    results = asyncio.run(run_suite(args))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--alloc-requests', type=int, default=100)
+    parser.add_argument('--output', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Compare with saved results')
+    parser.add_argument('--max-regression', type=float, default=0.1)
+    sys.exit(main(parser.parse_args()))
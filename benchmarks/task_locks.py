@@ -0,0 +1,76 @@
+"""Measures task-store update throughput for global vs striped task locks.
+
+Each simulated streaming task sends a series of WORKING status updates
+through InMemoryTaskManager.update_store. With ``--hold-ms`` every update
+also keeps its task lock across an await for that long, modelling critical
+sections that yield to the event loop (slow stores, subclasses awaiting I/O
+under the lock). A single stripe behaves like the old global lock.
+
+Usage:
+    python -m benchmarks.task_locks --tasks 1 10 100 500 --hold-ms 1
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.echo_agent import EchoTaskManager
+from common.server.task_manager import InMemoryTaskManager
+from common.types import (
+    Message,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+async def _run_task(
+    manager: InMemoryTaskManager, task_id: str, updates: int, hold: float
+):
+    await manager.upsert_task(
+        TaskSendParams(
+            id=task_id,
+            message=Message(role='user', parts=[TextPart(text='hi')]),
+        )
+    )
+    for _ in range(updates):
+        if hold:
+            async with manager.task_locks.for_key(task_id):
+                await asyncio.sleep(hold)
+        await manager.update_store(
+            task_id, TaskStatus(state=TaskState.WORKING), None
+        )
+
+
+async def _measure(stripes: int, tasks: int, updates: int, hold: float):
+    manager = EchoTaskManager(lock_stripes=stripes)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_run_task(manager, f'task-{i}', updates, hold) for i in range(tasks))
+    )
+    elapsed = time.perf_counter() - start
+    return tasks * updates / elapsed
+
+
+async def main(args):
+    hold = args.hold_ms / 1000
+    print(
+        f'{"tasks":>8} {"global ops/s":>14} {"striped ops/s":>14} {"speedup":>8}'
+    )
+    for tasks in args.tasks:
+        global_ops = await _measure(1, tasks, args.updates, hold)
+        striped_ops = await _measure(args.stripes, tasks, args.updates, hold)
+        print(
+            f'{tasks:>8} {global_ops:>14.0f} {striped_ops:>14.0f}'
+            f' {striped_ops / global_ops:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--updates', type=int, default=20)
+    parser.add_argument('--stripes', type=int, default=64)
+    parser.add_argument('--hold-ms', type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
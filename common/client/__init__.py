@@ -1,5 +1,16 @@
-from .card_resolver import A2ACardResolver
+from .artifact_assembler import ArtifactAssembler
+from .card_resolver import (
+    A2ACardResolver,
+    AsyncA2ACardResolver,
+    resolve_agent_cards,
+)
 from .client import A2AClient
 
 
-__all__ = ['A2ACardResolver', 'A2AClient']
+__all__ = [
+    'A2ACardResolver',
+    'A2AClient',
+    'ArtifactAssembler',
+    'AsyncA2ACardResolver',
+    'resolve_agent_cards',
+]
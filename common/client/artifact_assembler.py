@@ -0,0 +1,161 @@
+import logging
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from common.types import (
+    ARTIFACT_CHUNK_INDEX_KEY,
+    PART_CONTINUED_KEY,
+    A2AClientArtifactTooLargeError,
+    Artifact,
+    FilePart,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _part_data(part: Part) -> str | None:
+    if isinstance(part, TextPart):
+        return part.text
+    if isinstance(part, FilePart):
+        return part.file.bytes
+    return None
+
+
+def _with_part_data(part: Part, data: str) -> Part:
+    if isinstance(part, TextPart):
+        return part.model_copy(update={'text': data})
+    return part.model_copy(
+        update={'file': part.file.model_copy(update={'bytes': data})}
+    )
+
+
+def _is_continuation(part: Part) -> bool:
+    return bool(part.metadata and part.metadata.get(PART_CONTINUED_KEY))
+
+
+@dataclass
+class _PendingArtifact:
+    chunks: dict[int, Artifact] = field(default_factory=dict)
+    next_position: int = 0
+    last_position: int | None = None
+    size: int = 0
+
+
+class ArtifactAssembler:
+    """Reassembles artifacts streamed as ``append``/``lastChunk`` chunks.
+
+    Feed every TaskArtifactUpdateEvent to ``add``; it returns each artifact
+    once it is complete. Chunks carrying a position (see
+    common.server.artifact_chunker) may arrive out of order or more than
+    once. Chunks without one are taken in arrival order.
+
+    Args:
+        max_artifact_size: Maximum characters of text and file data buffered
+            for one artifact; larger artifacts are dropped with an
+            A2AClientArtifactTooLargeError.
+        max_pending: Maximum number of artifacts assembled at once. Beyond
+            it the least recently updated artifact is dropped.
+    """
+
+    def __init__(
+        self, max_artifact_size: int = 64 * 1024 * 1024, max_pending: int = 64
+    ):
+        self.max_artifact_size = max_artifact_size
+        self.max_pending = max_pending
+        self._pending: OrderedDict[tuple[str, int], _PendingArtifact] = (
+            OrderedDict()
+        )
+
+    def add(self, event: TaskArtifactUpdateEvent) -> Artifact | None:
+        artifact = event.artifact
+        position = (artifact.metadata or {}).get(ARTIFACT_CHUNK_INDEX_KEY)
+        if (
+            position is None
+            and not artifact.append
+            and artifact.lastChunk is not False
+        ):
+            return artifact  # not chunked
+
+        key = (event.id, artifact.index)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingArtifact()
+            if len(self._pending) > self.max_pending:
+                dropped, _ = self._pending.popitem(last=False)
+                logger.warning(f'Dropped incomplete artifact {dropped}')
+        else:
+            self._pending.move_to_end(key)
+
+        if position is None:
+            position = pending.next_position if artifact.append else 0
+        pending.next_position = max(pending.next_position, position + 1)
+        if position not in pending.chunks:
+            pending.size += sum(
+                len(_part_data(part) or '') for part in artifact.parts
+            )
+            if pending.size > self.max_artifact_size:
+                del self._pending[key]
+                raise A2AClientArtifactTooLargeError(
+                    event.id, artifact.index, self.max_artifact_size
+                )
+        pending.chunks[position] = artifact
+        if artifact.lastChunk:
+            pending.last_position = position
+
+        if (
+            pending.last_position is None
+            or len(pending.chunks) <= pending.last_position
+        ):
+            return None
+        del self._pending[key]
+        return self._assemble(pending)
+
+    def discard(self, task_id: str):
+        """Drops the incomplete artifacts of a task, e.g. when it ends."""
+        for key in [key for key in self._pending if key[0] == task_id]:
+            del self._pending[key]
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _assemble(self, pending: _PendingArtifact) -> Artifact:
+        chunks = [
+            pending.chunks[position]
+            for position in range(pending.last_position + 1)
+        ]
+        # Each part with the data pieces that continue it.
+        merged: list[tuple[Part, list[str]]] = []
+        for chunk in chunks:
+            for part in chunk.parts:
+                data = _part_data(part)
+                if (
+                    _is_continuation(part)
+                    and merged
+                    and data is not None
+                    and type(merged[-1][0]) is type(part)
+                ):
+                    merged[-1][1].append(data)
+                else:
+                    merged.append((part, [data]))
+
+        parts = [
+            part if len(pieces) == 1 else _with_part_data(part, ''.join(pieces))
+            for part, pieces in merged
+        ]
+        first = chunks[0]
+        metadata = dict(first.metadata or {})
+        metadata.pop(ARTIFACT_CHUNK_INDEX_KEY, None)
+        return first.model_copy(
+            update={
+                'parts': parts,
+                'metadata': metadata or None,
+                'append': None,
+                'lastChunk': None,
+            }
+        )
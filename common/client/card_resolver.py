@@ -1,4 +1,11 @@
+import asyncio
 import json
+import logging
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
 import httpx
 
@@ -8,8 +15,20 @@ from common.types import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENT_CARD_PATH = '/.well-known/agent.json'
+
+
+def _parse_agent_card(response: httpx.Response) -> AgentCard:
+    try:
+        return AgentCard(**response.json())
+    except json.JSONDecodeError as e:
+        raise A2AClientJSONError(str(e)) from e
+
+
 class A2ACardResolver:
-    def __init__(self, base_url, agent_card_path='/.well-known/agent.json'):
+    def __init__(self, base_url, agent_card_path=DEFAULT_AGENT_CARD_PATH):
         self.base_url = base_url.rstrip('/')
         self.agent_card_path = agent_card_path.lstrip('/')
 
@@ -17,7 +36,181 @@ class A2ACardResolver:
         with httpx.Client() as client:
             response = client.get(self.base_url + '/' + self.agent_card_path)
             response.raise_for_status()
-            try:
-                return AgentCard(**response.json())
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+            return _parse_agent_card(response)
+
+
+class CachedAgentCard(NamedTuple):
+    card: AgentCard
+    etag: str | None
+    expires_at: float
+
+
+def _cache_ttl(response: httpx.Response, default_ttl: float) -> float | None:
+    """Returns how long a card may be served without revalidation.
+
+    None means the response must not be cached at all (``no-store``).
+    """
+    directives = {}
+    for directive in response.headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0.0
+    try:
+        return float(directives['max-age'])
+    except (KeyError, ValueError):
+        return default_ttl
+
+
+class AsyncA2ACardResolver:
+    """Fetches agent cards concurrently and keeps them in a TTL cache.
+
+    Cards are fresh for the response's Cache-Control ``max-age``, or ``ttl``
+    seconds when the agent does not send one. Stale cards with an ETag are
+    revalidated with a conditional request. Concurrent lookups of the same
+    agent share one request. When ``cache_path`` is set the cache is loaded
+    from and saved to that JSON file, so a restart does not refetch fresh
+    cards.
+    """
+
+    def __init__(
+        self,
+        agent_card_path: str = DEFAULT_AGENT_CARD_PATH,
+        ttl: float = 300.0,
+        cache_path: str | None = None,
+        timeout: float = 10.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        self.agent_card_path = agent_card_path.lstrip('/')
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+        self._cache: dict[str, CachedAgentCard] = {}
+        self._in_flight: dict[str, asyncio.Future[AgentCard]] = {}
+        if cache_path:
+            self._load_cache()
+
+    async def __aenter__(self) -> 'AsyncA2ACardResolver':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._httpx_client is not None and self._owns_httpx_client:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    def _card_url(self, base_url: str) -> str:
+        return base_url.rstrip('/') + '/' + self.agent_card_path
+
+    async def get_agent_card(self, base_url: str) -> AgentCard:
+        url = self._card_url(base_url)
+        cached = self._cache.get(url)
+        if cached is not None and cached.expires_at > time.time():
+            return cached.card
+
+        future = self._in_flight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url))
+            self._in_flight[url] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        return await asyncio.shield(future)
+
+    async def get_agent_cards(self, base_urls: list[str]) -> list[AgentCard]:
+        """Resolves the cards of several agents in one parallel round."""
+        cards = await asyncio.gather(
+            *(self.get_agent_card(base_url) for base_url in base_urls)
+        )
+        if self.cache_path:
+            self._save_cache()
+        return list(cards)
+
+    async def _fetch(self, url: str) -> AgentCard:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(timeout=self.timeout)
+
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        response = await self._httpx_client.get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            card = cached.card
+            etag = response.headers.get('ETag', cached.etag)
+        else:
+            response.raise_for_status()
+            card = _parse_agent_card(response)
+            etag = response.headers.get('ETag')
+
+        ttl = _cache_ttl(response, self.ttl)
+        if ttl is None:
+            self._cache.pop(url, None)
+        else:
+            self._cache[url] = CachedAgentCard(card, etag, time.time() + ttl)
+        return card
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+            self._cache = {
+                url: CachedAgentCard(
+                    AgentCard(**entry['card']),
+                    entry.get('etag'),
+                    entry['expires_at'],
+                )
+                for url, entry in entries.items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(
+                f'Ignoring unreadable agent card cache {self.cache_path}: {e}'
+            )
+
+    def _save_cache(self) -> None:
+        entries = {
+            url: {
+                'card': cached.card.model_dump(mode='json', exclude_none=True),
+                'etag': cached.etag,
+                'expires_at': cached.expires_at,
+            }
+            for url, cached in self._cache.items()
+        }
+        tmp_path = f'{self.cache_path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(
+                f'Failed to save agent card cache {self.cache_path}: {e}'
+            )
+
+
+def resolve_agent_cards(base_urls: list[str], **kwargs) -> list[AgentCard]:
+    """Synchronously resolves several agent cards in one parallel round.
+
+    Keyword arguments are passed to AsyncA2ACardResolver. When called from a
+    running event loop, as when an agent is built inside a server, the fetch
+    runs on its own loop in a worker thread; the calling loop is blocked until
+    it finishes, so async code should prefer awaiting
+    ``AsyncA2ACardResolver.get_agent_cards``.
+    """
+
+    async def resolve() -> list[AgentCard]:
+        async with AsyncA2ACardResolver(**kwargs) as resolver:
+            return await resolver.get_agent_cards(base_urls)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(resolve())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, resolve()).result()
@@ -1,4 +1,5 @@
 import json
+import time
 
 from collections.abc import AsyncIterable
 from typing import Any
@@ -6,7 +7,7 @@ from typing import Any
 import httpx
 
 from httpx._types import TimeoutTypes
-from httpx_sse import connect_sse
+from httpx_sse import aconnect_sse
 
 from common.types import (
     A2AClientHTTPError,
@@ -19,21 +20,74 @@ from common.types import (
     GetTaskRequest,
     GetTaskResponse,
     JSONRPCRequest,
+    JSONRPCResponse,
     SendTaskRequest,
     SendTaskResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
+    TaskResubscriptionRequest,
+)
+from common.utils.metrics import REGISTRY
+
+
+# Response model for each batchable JSON-RPC method.
+RESPONSE_TYPES: dict[str, type[JSONRPCResponse]] = {
+    'tasks/send': SendTaskResponse,
+    'tasks/get': GetTaskResponse,
+    'tasks/cancel': CancelTaskResponse,
+    'tasks/pushNotification/set': SetTaskPushNotificationResponse,
+    'tasks/pushNotification/get': GetTaskPushNotificationResponse,
+}
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    'a2a_client_request_duration_seconds',
+    'Time for a remote agent to answer a JSON-RPC request, by method. '
+    'Streaming requests are timed until their stream starts.',
+    labelnames=('method',),
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    'a2a_client_request_errors_total',
+    'JSON-RPC requests that failed at the HTTP or JSON level, by method.',
+    labelnames=('method',),
 )
 
 
 class A2AClient:
+    """JSON-RPC client for a remote A2A agent.
+
+    All calls share one pooled ``httpx.AsyncClient`` so connections are kept
+    alive between requests. The pool is created by the first call and is
+    bound to that call's event loop. Use the client as an async context
+    manager, or call ``aclose``, to release the pool; a call made after
+    that opens a new one. A caller-supplied ``httpx_client`` is used as-is
+    and left open.
+
+    Transport failures such as refused connections and timeouts are raised
+    as A2AClientHTTPError with status 400, like HTTP error responses.
+
+    Args:
+        agent_card: Card of the remote agent; its url is used.
+        url: Endpoint of the remote agent when no card is given.
+        timeout: Timeout for non-streaming calls.
+        http2: Negotiate HTTP/2. Requires the ``h2`` package.
+        limits: Connection pool limits, DEFAULT_LIMITS if not given.
+        httpx_client: An existing client to send requests with.
+    """
+
     def __init__(
         self,
         agent_card: AgentCard = None,
         url: str = None,
         timeout: TimeoutTypes = 60.0,
+        http2: bool = False,
+        limits: httpx.Limits | None = None,
+        httpx_client: httpx.AsyncClient | None = None,
     ):
         if agent_card:
             self.url = agent_card.url
@@ -42,6 +96,29 @@ class A2AClient:
         else:
             raise ValueError('Must provide either agent_card or url')
         self.timeout = timeout
+        self.http2 = http2
+        self.limits = limits or DEFAULT_LIMITS
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+
+    async def __aenter__(self) -> 'A2AClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the connection pool if this client created it."""
+        if self._owns_httpx_client and self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    def _get_httpx_client(self) -> httpx.AsyncClient:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout
+            )
+        return self._httpx_client
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
@@ -51,31 +128,113 @@ class A2AClient:
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, 'POST', self.url, json=request.model_dump()
+        async for response in self._send_streaming_request(request):
+            yield response
+
+    async def resubscribe_task(
+        self, payload: dict[str, Any], last_event_id: int | None = None
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """Reattaches to a task's event stream.
+
+        Pass the ``_event_id`` of the last response received that carried
+        one to have the server replay only the events missed since then.
+        Chunks of a large artifact carry no id until the last one.
+        """
+        request = TaskResubscriptionRequest(params=payload)
+        headers = {}
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = str(last_event_id)
+        async for response in self._send_streaming_request(request, headers):
+            yield response
+
+    async def _send_streaming_request(
+        self, request: JSONRPCRequest, headers: dict[str, str] | None = None
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        client = self._get_httpx_client()
+        started = time.perf_counter()
+        try:
+            async with aconnect_sse(
+                client,
+                'POST',
+                self.url,
+                json=request.model_dump(),
+                headers=headers or {},
+                timeout=None,
             ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
+                REQUEST_DURATION.labels(request.method).observe(
+                    time.perf_counter() - started
+                )
+                async for sse in event_source.aiter_sse():
+                    response = SendTaskStreamingResponse(**json.loads(sse.data))
+                    if sse.id.isdigit():
+                        response._event_id = int(sse.id)
+                    yield response
+        except json.JSONDecodeError as e:
+            REQUEST_ERRORS.labels(request.method).inc()
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            REQUEST_ERRORS.labels(request.method).inc()
+            raise A2AClientHTTPError(400, str(e)) from e
 
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=self.timeout
+    async def batch(
+        self, requests: list[JSONRPCRequest]
+    ) -> list[JSONRPCResponse]:
+        """Sends several non-streaming requests in one HTTP round trip.
+
+        The server runs the requests concurrently. Responses are returned in
+        the order of ``requests``, each parsed into the response type of its
+        method (e.g. GetTaskResponse for a GetTaskRequest).
+        """
+        if not requests:
+            return []
+
+        for request in requests:
+            if request.method not in RESPONSE_TYPES:
+                raise ValueError(f'{request.method} cannot be batched')
+
+        body = await self._post(
+            [request.model_dump() for request in requests], 'batch'
+        )
+        if not isinstance(body, list):
+            raise A2AClientJSONError(f'Expected a batch response, got {body}')
+
+        responses_by_id = {response.get('id'): response for response in body}
+        responses = []
+        for request in requests:
+            if request.id not in responses_by_id:
+                raise A2AClientJSONError(
+                    f'Missing batch response for request {request.id}'
                 )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+            response_type = RESPONSE_TYPES[request.method]
+            responses.append(response_type(**responses_by_id[request.id]))
+        return responses
+
+    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+        return await self._post(request.model_dump(), request.method)
+
+    async def _post(self, payload: Any, method: str) -> Any:
+        client = self._get_httpx_client()
+        started = time.perf_counter()
+        try:
+            # Image generation could take time, adding timeout
+            response = await client.post(
+                self.url, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            REQUEST_ERRORS.labels(method).inc()
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            REQUEST_ERRORS.labels(method).inc()
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            REQUEST_ERRORS.labels(method).inc()
+            raise A2AClientHTTPError(400, str(e)) from e
+        finally:
+            REQUEST_DURATION.labels(method).observe(
+                time.perf_counter() - started
+            )
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
@@ -1,5 +1,28 @@
+from .admission import AdmissionController, AdmissionRejected
+from .blob_store import BlobStore
+from .coalescer import CoalescingStats, EventCoalescer
+from .profiling import RequestProfiler
+from .scheduler import FairScheduler, Scheduler
 from .server import A2AServer
 from .task_manager import InMemoryTaskManager, TaskManager
+from .task_runner import TaskRunner
+from .task_store import InMemoryTaskStore, SQLiteTaskStore, TaskStore
 
 
-__all__ = ['A2AServer', 'InMemoryTaskManager', 'TaskManager']
+__all__ = [
+    'A2AServer',
+    'AdmissionController',
+    'AdmissionRejected',
+    'BlobStore',
+    'CoalescingStats',
+    'EventCoalescer',
+    'FairScheduler',
+    'InMemoryTaskManager',
+    'InMemoryTaskStore',
+    'RequestProfiler',
+    'SQLiteTaskStore',
+    'Scheduler',
+    'TaskManager',
+    'TaskRunner',
+    'TaskStore',
+]
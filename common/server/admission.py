@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import math
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being admitted."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f'Request rejected: {reason}')
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass(eq=False)
+class _Waiter:
+    session_id: str | None
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionPermit:
+    """A slot held by an admitted request. Releasing it twice is a no-op."""
+
+    def __init__(
+        self, controller: 'AdmissionController', session_id: str | None
+    ):
+        self._controller = controller
+        self._session_id = session_id
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(
+            self._session_id, time.monotonic() - self._started
+        )
+
+
+class AdmissionController:
+    """Limits how many task executions A2AServer runs at once.
+
+    At most ``max_concurrent`` requests run in total and at most
+    ``max_per_session`` per sessionId. Other requests wait in a FIFO queue
+    of up to ``max_queue`` entries for no longer than ``max_wait`` seconds.
+    A request is shed straight away when the queue is full or when the
+    estimated wait, based on recent execution times, exceeds ``max_wait``.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 64,
+        max_per_session: int | None = 4,
+        max_queue: int = 256,
+        max_wait: float = 10.0,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_session = max_per_session
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self._session_active: dict[str, int] = {}
+        self._waiters: deque[_Waiter] = deque()
+        # Moving average of how long an admitted request holds its slot.
+        self._service_time = 1.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self, position: int) -> float:
+        """Estimates the wait for the request ``position`` places back."""
+        return (position + 1) * self._service_time / self.max_concurrent
+
+    def _can_run(self, session_id: str | None) -> bool:
+        if self.active >= self.max_concurrent:
+            return False
+        if session_id is None or self.max_per_session is None:
+            return True
+        return self._session_active.get(session_id, 0) < self.max_per_session
+
+    def _admit(self, session_id: str | None) -> AdmissionPermit:
+        self.active += 1
+        self.admitted += 1
+        if session_id is not None:
+            self._session_active[session_id] = (
+                self._session_active.get(session_id, 0) + 1
+            )
+        return AdmissionPermit(self, session_id)
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionRejected:
+        self.shed += 1
+        logger.warning(
+            f'Shedding request ({reason}): {self.active} active, '
+            f'{self.queued} queued'
+        )
+        return AdmissionRejected(reason, retry_after)
+
+    async def acquire(self, session_id: str | None = None) -> AdmissionPermit:
+        """Waits for a slot, raising AdmissionRejected if none is available."""
+        # _wake admits waiters as soon as they can run, so any request that
+        # can run now has nobody eligible queued ahead of it.
+        if self._can_run(session_id):
+            return self._admit(session_id)
+
+        estimate = self.estimated_wait(self.queued)
+        if self.queued >= self.max_queue:
+            raise self._reject('queue full', estimate)
+        if estimate > self.max_wait:
+            raise self._reject('estimated wait exceeds deadline', estimate)
+
+        waiter = _Waiter(session_id, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(waiter.future), self.max_wait
+            )
+        except TimeoutError:
+            if waiter.future.done():
+                return waiter.future.result()
+            self.timed_out += 1
+            raise self._reject('timed out in queue', estimate)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                waiter.future.result().release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            waiter.future.cancel()
+
+    def _release(self, session_id: str | None, held: float):
+        self.active -= 1
+        if session_id is not None:
+            remaining = self._session_active.get(session_id, 1) - 1
+            if remaining > 0:
+                self._session_active[session_id] = remaining
+            else:
+                self._session_active.pop(session_id, None)
+        self._service_time += 0.2 * (held - self._service_time)
+        self._wake()
+
+    def _wake(self):
+        # Sessions at their own limit are skipped, so they cannot hold up
+        # requests from other sessions queued behind them.
+        for waiter in list(self._waiters):
+            if self.active >= self.max_concurrent:
+                break
+            if waiter.future.done() or not self._can_run(waiter.session_id):
+                continue
+            self._waiters.remove(waiter)
+            waiter.future.set_result(self._admit(waiter.session_id))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'active': self.active,
+            'queued': self.queued,
+            'admitted': self.admitted,
+            'shed': self.shed,
+            'timed_out': self.timed_out,
+        }
@@ -0,0 +1,201 @@
+import json
+import time
+
+from common.types import (
+    ARTIFACT_CHUNK_INDEX_KEY,
+    PART_CONTINUED_KEY,
+    Artifact,
+    FilePart,
+    Part,
+    TextPart,
+)
+
+
+def _part_size(part: Part) -> int:
+    if isinstance(part, TextPart):
+        return len(part.text)
+    if isinstance(part, FilePart):
+        return len(part.file.bytes or '') + len(part.file.uri or '')
+    return len(json.dumps(part.data))
+
+
+def _split_part(part: Part, size: int) -> tuple[Part | None, Part]:
+    """Splits off the first ``size`` characters of a text or file part.
+
+    Returns the head (None if nothing fits) and the remaining part, which is
+    marked as continuing the head.
+    """
+    metadata = {**(part.metadata or {}), PART_CONTINUED_KEY: True}
+    if isinstance(part, TextPart):
+        head = part.model_copy(update={'text': part.text[:size]})
+        rest = part.model_copy(
+            update={'text': part.text[size:], 'metadata': metadata}
+        )
+    elif isinstance(part, FilePart) and part.file.bytes:
+        # Cut base64 on a 4 character boundary so every piece decodes.
+        size -= size % 4
+        data = part.file.bytes
+        head = part.model_copy(
+            update={'file': part.file.model_copy(update={'bytes': data[:size]})}
+        )
+        rest = part.model_copy(
+            update={
+                'file': part.file.model_copy(update={'bytes': data[size:]}),
+                'metadata': metadata,
+            }
+        )
+    else:
+        return None, part
+    return (head if size > 0 else None), rest
+
+
+def chunk_artifact(artifact: Artifact, max_chunk_size: int) -> list[Artifact]:
+    """Splits an artifact into chunks of about ``max_chunk_size`` characters.
+
+    Size counts text and base64 file data. Large text and file parts are
+    split across chunks, with each continuation part flagged in its
+    metadata; data parts are never split. Chunks follow the A2A
+    ``append``/``lastChunk`` convention and carry their position under
+    ARTIFACT_CHUNK_INDEX_KEY, so an assembler can order them. An artifact
+    that already fits is returned unchanged as the only chunk.
+    """
+    if sum(_part_size(part) for part in artifact.parts) <= max_chunk_size:
+        return [artifact]
+
+    chunks: list[list[Part]] = [[]]
+    budget = max_chunk_size
+    pending = list(artifact.parts)
+    while pending:
+        part = pending.pop(0)
+        size = _part_size(part)
+        if size <= budget:
+            chunks[-1].append(part)
+            budget -= size
+            continue
+
+        head, rest = _split_part(part, budget)
+        if head is not None:
+            chunks[-1].append(head)
+        elif not chunks[-1]:
+            # An unsplittable part larger than a chunk goes out on its own.
+            chunks[-1].append(part)
+            chunks.append([])
+            budget = max_chunk_size
+            continue
+        pending.insert(0, rest)
+        chunks.append([])
+        budget = max_chunk_size
+
+    if not chunks[-1]:
+        chunks.pop()
+
+    result = []
+    for position, parts in enumerate(chunks):
+        first = position == 0
+        metadata = artifact.metadata if first else None
+        result.append(
+            Artifact(
+                name=artifact.name if first else None,
+                description=artifact.description if first else None,
+                parts=parts,
+                metadata={
+                    **(metadata or {}),
+                    ARTIFACT_CHUNK_INDEX_KEY: position,
+                },
+                index=artifact.index,
+                append=not first,
+                lastChunk=position == len(chunks) - 1,
+            )
+        )
+    return result
+
+
+class TextArtifactStream:
+    """Builds the chunks of a text artifact streamed as it is generated.
+
+    Appended text is buffered and sent once ``flush_interval`` seconds have
+    passed since the last chunk or ``flush_size`` characters are waiting, so
+    a token stream does not fill the event log and subscriber queues with
+    one event per token. Each chunk follows the convention of
+    chunk_artifact, so ArtifactAssembler joins them into a single text
+    part. ``finish`` sends the last chunk; when the final text does not
+    continue what was sent, it restarts the artifact so that it reads the
+    final text alone.
+
+    Args:
+        index: Index of the streamed artifact.
+        name: Name of the artifact, sent with its first chunk.
+        flush_interval: Seconds after the last chunk at which appended text
+            is sent. 0 sends every piece as it is appended.
+        flush_size: Characters of buffered text that are sent at once.
+    """
+
+    def __init__(
+        self,
+        index: int = 0,
+        name: str | None = None,
+        flush_interval: float = 0.05,
+        flush_size: int = 1024,
+    ):
+        self.index = index
+        self.name = name
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.text = ''
+        self._sent = ''
+        self._position = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def started(self) -> bool:
+        """Whether a chunk has been sent."""
+        return self._position > 0
+
+    def append(self, text: str) -> Artifact | None:
+        """Buffers text, returning a chunk if the buffer is due to be sent."""
+        self.text += text
+        buffered = self.text[len(self._sent) :]
+        now = time.monotonic()
+        if (
+            len(buffered) < self.flush_size
+            and now - self._last_flush < self.flush_interval
+        ):
+            return None
+        self._sent = self.text
+        self._last_flush = now
+        return self._chunk(buffered, last_chunk=False)
+
+    def finish(self, text: str) -> Artifact | None:
+        """Returns the last chunk, after which the artifact reads ``text``.
+
+        Returns None if nothing was sent and ``text`` is empty; buffered
+        text is then dropped.
+        """
+        started = self.started
+        if started and text.startswith(self._sent):
+            rest = text[len(self._sent) :]
+        else:
+            self._position = 0
+            rest = text
+        self.text = self._sent = text
+        if not started and not text:
+            return None
+        return self._chunk(rest, last_chunk=True)
+
+    def _chunk(self, text: str, last_chunk: bool) -> Artifact:
+        first = self._position == 0
+        chunk = Artifact(
+            name=self.name if first else None,
+            parts=[
+                TextPart(
+                    text=text,
+                    metadata=None if first else {PART_CONTINUED_KEY: True},
+                )
+            ],
+            metadata={ARTIFACT_CHUNK_INDEX_KEY: self._position},
+            index=self.index,
+            append=not first,
+            lastChunk=last_chunk,
+        )
+        self._position += 1
+        return chunk
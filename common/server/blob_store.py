@@ -0,0 +1,109 @@
+import base64
+import hashlib
+import logging
+import os
+import re
+import tempfile
+
+from pathlib import Path
+
+from common.types import FilePart
+
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_PATTERN = re.compile(r'[0-9a-f]{64}')
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Content-addressed, on-disk storage for file payloads.
+
+    Blobs are keyed by the SHA-256 hex digest of their content, so storing
+    the same bytes twice keeps a single copy. When the store is passed to
+    A2AServer, blobs are served under ``/blobs/<digest>`` and FileParts can
+    reference them by ``uri`` instead of carrying inline base64.
+
+    Args:
+        root: Directory the blobs are written to; created if missing.
+        base_url: URL prefix blobs are downloaded from, e.g.
+            ``http://localhost:10001/blobs/``. Required by ``to_uri_part``.
+    """
+
+    def __init__(self, root: str | os.PathLike, base_url: str | None = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url
+
+    def path(self, digest: str) -> Path:
+        """Returns where the blob with ``digest`` is stored.
+
+        Raises ValueError if ``digest`` is not a SHA-256 hex digest, so
+        untrusted input cannot point outside the store.
+        """
+        if not _DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f'Invalid blob digest: {digest!r}')
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        try:
+            return self.path(digest).is_file()
+        except ValueError:
+            return False
+
+    def put(self, data: bytes) -> str:
+        """Stores ``data`` and returns its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self:
+            self._write(digest, [data])
+        return digest
+
+    def put_file(self, source: str | os.PathLike) -> str:
+        """Stores the contents of a file without reading it into memory."""
+        sha256 = hashlib.sha256()
+        with open(source, 'rb') as f:
+            while chunk := f.read(_COPY_CHUNK_SIZE):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        if digest not in self:
+            with open(source, 'rb') as f:
+                self._write(digest, iter(lambda: f.read(_COPY_CHUNK_SIZE), b''))
+        return digest
+
+    def _write(self, digest: str, chunks):
+        target = self.path(digest)
+        target.parent.mkdir(exist_ok=True)
+        # Readers never see a partial blob: it is renamed into place once
+        # complete, and concurrent writers of the same content are harmless.
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f'Stored blob {digest}')
+
+    def uri(self, digest: str) -> str:
+        if self.base_url is None:
+            raise ValueError('BlobStore has no base_url to build URIs from')
+        return f'{self.base_url.rstrip("/")}/{digest}'
+
+    def to_uri_part(self, part: FilePart) -> FilePart:
+        """Moves the inline base64 payload of a FilePart into the store.
+
+        Returns a copy that references the blob by ``uri``. Parts without
+        inline bytes are returned unchanged.
+        """
+        if not part.file.bytes:
+            return part
+        digest = self.put(base64.b64decode(part.file.bytes))
+        return part.model_copy(
+            update={
+                'file': part.file.model_copy(
+                    update={'bytes': None, 'uri': self.uri(digest)}
+                )
+            }
+        )
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import time
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from common.types import Part, TaskState, TaskStatusUpdateEvent, TextPart
+
+
+@dataclass
+class CoalescingStats:
+    """Counters of one coalesced event stream.
+
+    ``events`` counts the events read from the source and ``frames`` the
+    events sent on. ``cpu_seconds`` is the CPU time spent coalescing plus
+    whatever the stream's producer and consumer measure with ``timing``.
+    """
+
+    events: int = 0
+    frames: int = 0
+    cpu_seconds: float = 0.0
+
+    @contextlib.contextmanager
+    def timing(self) -> Iterator[None]:
+        """Adds the CPU time of the block, which should not await I/O."""
+        started = time.thread_time()
+        try:
+            yield
+        finally:
+            self.cpu_seconds += time.thread_time() - started
+
+
+class EventCoalescer:
+    """Batches consecutive WORKING status updates of a task's event stream.
+
+    Agents that report every token as a status update would otherwise cost
+    a store write and a frame per token. Non-final WORKING status updates
+    whose messages have the same role and metadata are merged into one
+    message, joining adjacent text parts. A batch is sent once ``window``
+    seconds have passed since its first update, even if the source is
+    quiet, or as soon as its text reaches ``max_bytes``. Any other event,
+    such as a state change, an artifact or the final event, first sends
+    the pending batch and then goes out immediately, so order is kept.
+
+    Use one coalescer per stream; its ``stats`` count that stream.
+
+    Args:
+        window: Seconds a batch may wait for more updates.
+        max_bytes: UTF-8 bytes of text that send a batch right away.
+    """
+
+    def __init__(self, window: float = 0.05, max_bytes: int = 4096):
+        self.window = window
+        self.max_bytes = max_bytes
+        self.stats = CoalescingStats()
+        self._batch: list[TaskStatusUpdateEvent] = []
+        # Parts of the batched messages, each with the text pieces joined
+        # into it.
+        self._parts: list[tuple[Part, list[str]]] = []
+        self._size = 0
+        self._deadline = 0.0
+
+    async def coalesce(self, events: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Yields the events of ``events`` with WORKING updates batched."""
+        loop = asyncio.get_running_loop()
+        iterator = aiter(events)
+        pending: asyncio.Future | None = None
+        try:
+            while True:
+                if self._batch:
+                    # Wait for the next event only until the batch is due,
+                    # without cancelling the read of the source.
+                    if pending is None:
+                        pending = asyncio.ensure_future(anext(iterator))
+                    timeout = max(self._deadline - loop.time(), 0)
+                    done, _ = await asyncio.wait({pending}, timeout=timeout)
+                    if not done:
+                        with self.stats.timing():
+                            frame = self._flush()
+                        yield frame
+                        continue
+                try:
+                    if pending is not None:
+                        event = await pending
+                    else:
+                        event = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+
+                self.stats.events += 1
+                with self.stats.timing():
+                    frames = self._add(event, loop.time())
+                for frame in frames:
+                    yield frame
+
+            if self._batch:
+                with self.stats.timing():
+                    frame = self._flush()
+                yield frame
+        finally:
+            if pending is not None:
+                pending.cancel()
+                with contextlib.suppress(
+                    asyncio.CancelledError, StopAsyncIteration, Exception
+                ):
+                    await pending
+
+    def _add(self, event: Any, now: float) -> list[Any]:
+        """Takes in one event; returns the events to send now."""
+        frames = []
+        if not _is_working_update(event):
+            if self._batch:
+                frames.append(self._flush())
+            self.stats.frames += 1
+            frames.append(event)
+            return frames
+
+        if self._batch and not _same_stream(self._batch[0], event):
+            frames.append(self._flush())
+        if not self._batch:
+            self._deadline = now + self.window
+        self._batch.append(event)
+        for part in event.status.message.parts:
+            self._append_part(part)
+        if self._size >= self.max_bytes:
+            frames.append(self._flush())
+        return frames
+
+    def _append_part(self, part: Part) -> None:
+        if isinstance(part, TextPart):
+            self._size += len(part.text.encode())
+            if self._parts:
+                last, pieces = self._parts[-1]
+                if (
+                    isinstance(last, TextPart)
+                    and last.metadata == part.metadata
+                ):
+                    pieces.append(part.text)
+                    return
+            self._parts.append((part, [part.text]))
+        else:
+            self._parts.append((part, []))
+
+    def _flush(self) -> TaskStatusUpdateEvent:
+        """Returns the batch as one event and starts a new batch."""
+        batch, parts = self._batch, self._parts
+        self._batch, self._parts, self._size = [], [], 0
+        self.stats.frames += 1
+        if len(batch) == 1:
+            return batch[0]
+
+        first, last = batch[0], batch[-1]
+        message = first.status.message.model_copy(
+            update={
+                'parts': [
+                    part
+                    if len(pieces) <= 1
+                    else part.model_copy(update={'text': ''.join(pieces)})
+                    for part, pieces in parts
+                ]
+            }
+        )
+        return first.model_copy(
+            update={
+                'status': last.status.model_copy(update={'message': message})
+            }
+        )
+
+
+def _is_working_update(event: Any) -> bool:
+    return (
+        isinstance(event, TaskStatusUpdateEvent)
+        and not event.final
+        and event.status.state == TaskState.WORKING
+        and event.status.message is not None
+    )
+
+
+def _same_stream(
+    batched: TaskStatusUpdateEvent, event: TaskStatusUpdateEvent
+) -> bool:
+    """Whether an update can join a batch without losing information."""
+    return (
+        batched.id == event.id
+        and batched.metadata == event.metadata
+        and batched.status.message.role == event.status.message.role
+        and batched.status.message.metadata == event.status.message.metadata
+    )
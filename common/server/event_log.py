@@ -0,0 +1,67 @@
+import itertools
+
+from collections import deque
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from common.types import JSONRPCError, TaskStatusUpdateEvent
+
+
+class LoggedEvent(NamedTuple):
+    event_id: int
+    event: Any
+
+
+class TaskEventLog:
+    """A bounded journal of the streaming events emitted for one task.
+
+    Every event gets a higher id than the previous one, so a client that
+    reconnects with the id of the last event it saw can be sent exactly the
+    events it missed. Only the most recent ``max_events`` are kept.
+
+    Args:
+        max_events: Number of events retained for replay.
+        event_ids: Source of event ids. Logs sharing one keep numbering
+            above each other, so a log that replaces a discarded one for
+            the same task never reuses its ids. Defaults to 1, 2, 3...
+    """
+
+    def __init__(
+        self, max_events: int = 100, event_ids: Iterator[int] | None = None
+    ):
+        self._events: deque[LoggedEvent] = deque(maxlen=max_events)
+        self._event_ids = event_ids or itertools.count(1)
+        self._last_event_id = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_event_id
+
+    @property
+    def stream_ended(self) -> bool:
+        """Whether the most recent event closed the stream."""
+        if not self._events:
+            return False
+        last = self._events[-1].event
+        if isinstance(last, TaskStatusUpdateEvent):
+            return last.final
+        return isinstance(last, JSONRPCError)
+
+    def append(self, event: Any) -> LoggedEvent:
+        self._last_event_id = next(self._event_ids)
+        entry = LoggedEvent(self._last_event_id, event)
+        self._events.append(entry)
+        return entry
+
+    def since(self, last_event_id: int) -> list[LoggedEvent]:
+        """Returns the retained events newer than ``last_event_id``.
+
+        If older events have already been discarded the replay starts at the
+        oldest retained event.
+        """
+        return [
+            entry for entry in self._events if entry.event_id > last_event_id
+        ]
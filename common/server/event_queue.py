@@ -0,0 +1,108 @@
+import asyncio
+import logging
+
+from collections import deque
+from enum import Enum
+
+from common.server.event_log import LoggedEvent
+from common.types import InternalError, TaskStatusUpdateEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with a new event.
+
+    DROP_OLDEST discards the oldest queued event. COALESCE discards the
+    oldest queued non-final status update, since a newer status supersedes
+    it, and disconnects the subscriber if only artifacts or final events are
+    queued. DISCONNECT drops the subscriber straight away.
+    """
+
+    DROP_OLDEST = 'drop-oldest'
+    COALESCE = 'coalesce'
+    DISCONNECT = 'disconnect'
+
+
+class SubscriberQueue:
+    """A bounded, never-blocking event buffer for one SSE subscriber.
+
+    ``put_nowait`` never waits on the consumer, so a stalled client cannot
+    hold up fan-out to the other subscribers of a task. When the buffer is
+    full the overflow policy decides which event to give up. A disconnected
+    subscriber releases its buffer and its next ``get`` returns an error
+    that ends the stream.
+
+    Args:
+        maxsize: Maximum number of buffered events.
+        policy: The OverflowPolicy applied when the buffer is full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy = OverflowPolicy.COALESCE,
+    ):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.disconnected = False
+        self._events: deque[LoggedEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def put_nowait(self, event: LoggedEvent) -> bool:
+        """Buffers an event, returning False if the subscriber is gone."""
+        if self.disconnected:
+            return False
+
+        if len(self._events) >= self.maxsize and not self._make_room():
+            self.disconnect()
+            return False
+
+        self._events.append(event)
+        self._ready.set()
+        return True
+
+    async def get(self) -> LoggedEvent | InternalError:
+        while not self._events:
+            if self.disconnected:
+                return InternalError(
+                    message='Subscriber disconnected after falling behind'
+                )
+            self._ready.clear()
+            await self._ready.wait()
+        return self._events.popleft()
+
+    def disconnect(self) -> None:
+        if not self.disconnected:
+            logger.warning(
+                f'Disconnecting slow SSE subscriber after dropping '
+                f'{self.dropped} events'
+            )
+        self.disconnected = True
+        self._events.clear()
+        self._ready.set()
+
+    def _make_room(self) -> bool:
+        if self.policy == OverflowPolicy.DROP_OLDEST:
+            self._events.popleft()
+            self.dropped += 1
+            return True
+
+        if self.policy == OverflowPolicy.COALESCE:
+            for i, (_, queued) in enumerate(self._events):
+                if (
+                    isinstance(queued, TaskStatusUpdateEvent)
+                    and not queued.final
+                ):
+                    del self._events[i]
+                    self.dropped += 1
+                    return True
+
+        return False
@@ -0,0 +1,41 @@
+import asyncio
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from common.server.profiling import phase
+
+
+class StripedLock:
+    """A fixed pool of asyncio locks selected by hashing a key.
+
+    Operations on different keys usually take different locks and do not
+    wait on each other, while operations on the same key are always
+    serialised. Memory stays constant no matter how many keys are seen.
+
+    Args:
+        stripes: Number of locks in the pool. A single stripe behaves like one
+            global lock.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError('stripes must be at least 1')
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def for_key(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Holds the lock for ``key``, timing the wait as ``lock_wait``."""
+        lock = self.for_key(key)
+        with phase('lock_wait'):
+            await lock.acquire()
+        try:
+            yield
+        finally:
+            lock.release()
@@ -0,0 +1,155 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import time
+
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar['RequestProfile | None'] = ContextVar(
+    'a2a_request_profile', default=None
+)
+
+
+@dataclass(eq=False)
+class RequestProfile:
+    """Phase timings of one request, in seconds.
+
+    Phases may nest: ``handler`` includes the ``lock_wait`` and
+    ``store_write`` time spent inside it.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    duration: float | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    fields: dict[str, Any] = field(default_factory=dict)
+    # pstats report, for requests sampled for cProfile capture.
+    profile: str | None = None
+
+    def add(self, name: str, elapsed: float):
+        # Background work started by the request inherits its context, but
+        # is not counted once the request has finished.
+        if self.duration is None:
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.fields,
+            'duration': self.duration,
+            'phases': self.phases,
+        }
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Times a phase of the request being profiled, if there is one."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def annotate(**fields: Any):
+    """Attaches fields, e.g. the JSON-RPC method, to the current profile."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.fields.update(fields)
+
+
+class RequestProfiler:
+    """Opt-in phase timing and slow-request capture for A2AServer.
+
+    Requests taking at least ``slow_threshold`` seconds are logged with
+    their phase timings as a JSON object and kept, newest last, for the
+    admin ``slow-requests`` route. A ``profile_rate`` share of requests is
+    also run under cProfile, one at a time; as cProfile sees the whole
+    thread, a capture includes whatever else the event loop ran meanwhile.
+
+    Args:
+        slow_threshold: Duration in seconds from which a request is slow.
+        profile_rate: Share of requests, from 0 to 1, captured with cProfile.
+        max_slow_requests: Number of slow requests kept.
+        profile_lines: Number of functions listed in a captured profile.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float = 1.0,
+        profile_rate: float = 0.0,
+        max_slow_requests: int = 100,
+        profile_lines: int = 30,
+    ):
+        self.slow_threshold = slow_threshold
+        self.profile_rate = profile_rate
+        self.profile_lines = profile_lines
+        self.slow_requests: deque[RequestProfile] = deque(
+            maxlen=max_slow_requests
+        )
+        self.requests = 0
+        self._profiling = False
+
+    @asynccontextmanager
+    async def profile(self) -> AsyncIterator[RequestProfile]:
+        """Profiles the request handled inside the context."""
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        profiler = self._start_cprofile()
+        try:
+            yield profile
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            _current_profile.reset(token)
+            profile.duration = time.perf_counter() - profile.started
+            self.requests += 1
+            if profile.duration >= self.slow_threshold:
+                self._record_slow(profile, profiler)
+
+    def _start_cprofile(self) -> cProfile.Profile | None:
+        if self._profiling or random.random() >= self.profile_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler, e.g. a debugger, is already active.
+            return None
+        self._profiling = True
+        return profiler
+
+    def _record_slow(
+        self, profile: RequestProfile, profiler: cProfile.Profile | None
+    ):
+        if profiler is not None:
+            out = io.StringIO()
+            stats = pstats.Stats(profiler, stream=out)
+            stats.sort_stats('cumulative').print_stats(self.profile_lines)
+            profile.profile = out.getvalue()
+        self.slow_requests.append(profile)
+        logger.warning(f'Slow request: {json.dumps(profile.to_dict())}')
+
+    def report(self) -> dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'slow_threshold': self.slow_threshold,
+            'slow_requests': [
+                {**profile.to_dict(), 'profile': profile.profile}
+                for profile in self.slow_requests
+            ],
+        }
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+
+from common.types import TaskSendParams
+
+
+logger = logging.getLogger(__name__)
+
+# Weights for the named priorities accepted in TaskSendParams.metadata.
+PRIORITY_WEIGHTS = {'low': 0.5, 'normal': 1.0, 'high': 2.0}
+
+
+class Scheduler(ABC):
+    """Decides when an agent execution for a task may start."""
+
+    @abstractmethod
+    def slot(self, params: TaskSendParams) -> AbstractAsyncContextManager[None]:
+        """Returns a context that waits for, then holds, an execution slot."""
+
+    def stats(self) -> dict[str, int]:
+        """Reports running and queued executions; empty if not tracked."""
+        return {}
+
+
+@dataclass(eq=False)
+class _Job:
+    weight: float
+    future: asyncio.Future
+
+
+@dataclass(eq=False)
+class _Flow:
+    """A session (holding jobs) or a tenant (holding sessions)."""
+
+    vtime: float = 0.0
+    jobs: deque[_Job] = field(default_factory=deque)
+    sessions: dict[str, '_Flow'] = field(default_factory=dict)
+    # Virtual time of the sessions of a tenant.
+    floor: float = 0.0
+
+
+class FairScheduler(Scheduler):
+    """Weighted fair queuing of agent executions across tenants and sessions.
+
+    At most ``max_concurrent`` executions run at once. When more are
+    waiting, tenants get an equal share of the free slots, split equally
+    between each tenant's sessions, so a client opening many sessions
+    cannot starve others. Each execution is charged ``1 / weight`` of
+    virtual time, where the weight comes from the ``priority`` metadata key:
+    a positive number or one of PRIORITY_WEIGHTS. The tenant is read from
+    the ``tenant`` metadata key; tasks without one share a default tenant.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        tenant_key: str = 'tenant',
+        priority_key: str = 'priority',
+    ):
+        self.max_concurrent = max_concurrent
+        self.tenant_key = tenant_key
+        self.priority_key = priority_key
+        self.running = 0
+        self.queued = 0
+        self.dispatched = 0
+        self._tenants: dict[str, _Flow] = {}
+        self._vtime = 0.0
+
+    def _weight(self, metadata: dict) -> float:
+        priority = metadata.get(self.priority_key)
+        if isinstance(priority, str):
+            return PRIORITY_WEIGHTS.get(priority.lower(), 1.0)
+        if isinstance(priority, int | float) and priority > 0:
+            return float(priority)
+        return 1.0
+
+    @asynccontextmanager
+    async def slot(self, params: TaskSendParams) -> AsyncIterator[None]:
+        if self.running < self.max_concurrent and not self.queued:
+            self.running += 1
+            self.dispatched += 1
+        else:
+            await self._wait(params)
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._dispatch()
+
+    async def _wait(self, params: TaskSendParams):
+        metadata = params.metadata or {}
+        tenant_id = str(metadata.get(self.tenant_key))
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            tenant = self._tenants[tenant_id] = _Flow()
+        if not tenant.sessions:
+            # An idle tenant does not bank credit while it is away.
+            tenant.vtime = max(tenant.vtime, self._vtime)
+        session = tenant.sessions.get(params.sessionId)
+        if session is None:
+            session = tenant.sessions[params.sessionId] = _Flow(
+                vtime=tenant.floor
+            )
+
+        job = _Job(
+            self._weight(metadata), asyncio.get_running_loop().create_future()
+        )
+        session.jobs.append(job)
+        self.queued += 1
+        try:
+            await job.future
+        except asyncio.CancelledError:
+            if job.future.done() and not job.future.cancelled():
+                # Admitted just as the waiter was cancelled.
+                self.running -= 1
+                self._dispatch()
+            else:
+                job.future.cancel()
+                session.jobs.remove(job)
+                self.queued -= 1
+                if not session.jobs and (
+                    tenant.sessions.get(params.sessionId) is session
+                ):
+                    del tenant.sessions[params.sessionId]
+            raise
+
+    def _next_job(self) -> _Job | None:
+        tenant = min(
+            (t for t in self._tenants.values() if t.sessions),
+            key=lambda t: t.vtime,
+            default=None,
+        )
+        if tenant is None:
+            return None
+
+        session_id, session = min(
+            tenant.sessions.items(), key=lambda item: item[1].vtime
+        )
+        self._vtime = tenant.vtime
+        tenant.floor = session.vtime
+        job = session.jobs.popleft()
+        self.queued -= 1
+        if not session.jobs:
+            del tenant.sessions[session_id]
+
+        tenant.vtime += 1 / job.weight
+        session.vtime += 1 / job.weight
+        return job
+
+    def _dispatch(self):
+        while self.running < self.max_concurrent:
+            job = self._next_job()
+            if job is None:
+                break
+            self.running += 1
+            self.dispatched += 1
+            job.future.set_result(None)
+
+        if not self.queued:
+            # Without contention there is no share to keep track of.
+            self._tenants.clear()
+            self._vtime = 0.0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'running': self.running,
+            'queued': self.queued,
+            'dispatched': self.dispatched,
+        }
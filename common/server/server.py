@@ -1,16 +1,29 @@
+import asyncio
+import inspect
 import json
 import logging
+import re
+import time
 
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Callable
+from contextlib import asynccontextmanager
 from typing import Any
 
 from pydantic import ValidationError
 from sse_starlette.sse import EventSourceResponse
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import FileResponse, JSONResponse, Response
 
+from common.server.admission import (
+    AdmissionController,
+    AdmissionPermit,
+    AdmissionRejected,
+)
+from common.server.blob_store import BlobStore
+from common.server.profiling import RequestProfiler, annotate, phase
 from common.server.task_manager import TaskManager
+from common.server.utils import process_rss_bytes
 from common.types import (
     A2ARequest,
     AgentCard,
@@ -20,16 +33,70 @@ from common.types import (
     InternalError,
     InvalidRequestError,
     JSONParseError,
+    JSONRPCError,
+    JSONRPCRequest,
     JSONRPCResponse,
     SendTaskRequest,
     SendTaskStreamingRequest,
+    ServerBusyError,
     SetTaskPushNotificationRequest,
     TaskResubscriptionRequest,
 )
+from common.utils.metrics import CONTENT_TYPE, REGISTRY, MetricsRegistry
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+# JSON-RPC method -> (request model, TaskManager handler name).
+METHOD_HANDLERS: dict[str, tuple[type[JSONRPCRequest], str]] = {
+    'tasks/get': (GetTaskRequest, 'on_get_task'),
+    'tasks/send': (SendTaskRequest, 'on_send_task'),
+    'tasks/sendSubscribe': (SendTaskStreamingRequest, 'on_send_task_subscribe'),
+    'tasks/cancel': (CancelTaskRequest, 'on_cancel_task'),
+    'tasks/pushNotification/set': (
+        SetTaskPushNotificationRequest,
+        'on_set_task_push_notification',
+    ),
+    'tasks/pushNotification/get': (
+        GetTaskPushNotificationRequest,
+        'on_get_task_push_notification',
+    ),
+    'tasks/resubscribe': (TaskResubscriptionRequest, 'on_resubscribe_to_task'),
+}
+
+# Methods that may start an agent run and are subject to admission control.
+ADMITTED_REQUESTS = (SendTaskRequest, SendTaskStreamingRequest)
+
+_METHOD_PATTERN = re.compile(rb'"method"\s*:\s*"([^"\\]+)"')
+
+
+def _json_loads(data: bytes) -> Any:
+    # orjson is an optional speedup; both raise json.JSONDecodeError.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_response(
+    response: JSONRPCResponse,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    # pydantic-core serialises straight to JSON, skipping the intermediate
+    # dict and the stdlib encoder JSONResponse would use.
+    return Response(
+        response.model_dump_json(exclude_none=True),
+        status_code=status_code,
+        headers=headers,
+        media_type='application/json',
+    )
+
 
 class A2AServer:
     def __init__(
@@ -39,19 +106,71 @@ class A2AServer:
         endpoint='/',
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        max_batch_size: int = 100,
+        admission_controller: AdmissionController | None = None,
+        admin_path: str | None = None,
+        blob_store: BlobStore | None = None,
+        metrics_path: str | None = '/metrics',
+        profiler: RequestProfiler | None = None,
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
-        self.app = Starlette()
+        self.max_batch_size = max_batch_size
+        # Without an admission controller every request is admitted.
+        self.admission_controller = admission_controller
+        # Phase timing and slow-request capture are off without a profiler.
+        self.profiler = profiler
+        self._shutdown_handlers: list[Callable[[], Any]] = []
+        self.app = Starlette(lifespan=self._lifespan)
         self.app.add_route(
             self.endpoint, self._process_request, methods=['POST']
         )
         self.app.add_route(
             '/.well-known/agent.json', self._get_agent_card, methods=['GET']
         )
+        # Admin routes expose internals and are only served when enabled.
+        self.admin_path = admin_path
+        if admin_path is not None:
+            self.app.add_route(
+                f'{admin_path.rstrip("/")}/memory',
+                self._get_memory_stats,
+                methods=['GET'],
+            )
+            if profiler is not None:
+                self.app.add_route(
+                    f'{admin_path.rstrip("/")}/slow-requests',
+                    self._get_slow_requests,
+                    methods=['GET'],
+                )
+        self.blob_store = blob_store
+        if blob_store is not None:
+            self.app.add_route(
+                '/blobs/{digest}', self._get_blob, methods=['GET', 'HEAD']
+            )
+
+        # Metrics of this server, served together with the process-wide
+        # REGISTRY (client and push-notification metrics).
+        self.metrics = MetricsRegistry()
+        self._request_duration = self.metrics.histogram(
+            'a2a_server_request_duration_seconds',
+            'Time to handle a JSON-RPC request, by method. Streaming requests '
+            'are timed until their stream starts.',
+            labelnames=('method',),
+        )
+        self._request_errors = self.metrics.counter(
+            'a2a_server_request_errors_total',
+            'JSON-RPC requests answered with an error, by method.',
+            labelnames=('method',),
+        )
+        if task_manager is not None:
+            task_manager.register_metrics(self.metrics)
+        if admission_controller is not None:
+            self._register_admission_metrics(admission_controller)
+        if metrics_path is not None:
+            self.app.add_route(metrics_path, self._get_metrics, methods=['GET'])
 
     def start(self):
         if self.agent_card is None:
@@ -64,74 +183,301 @@ class A2AServer:
 
         uvicorn.run(self.app, host=self.host, port=self.port)
 
+    def add_shutdown_handler(self, handler: Callable[[], Any]):
+        """Registers a function, sync or async, to call on server shutdown.
+
+        Handlers run after the task manager is closed, in the order they
+        were added, e.g. to stop a PushNotificationSenderAuth's deliveries.
+        """
+        self._shutdown_handlers.append(handler)
+
+    @asynccontextmanager
+    async def _lifespan(self, app: Starlette):
+        yield
+        if self.task_manager is not None:
+            self.task_manager.close()
+        for handler in self._shutdown_handlers:
+            try:
+                result = handler()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f'Error in shutdown handler {handler}: {e}')
+
     def _get_agent_card(self, request: Request) -> JSONResponse:
         return JSONResponse(self.agent_card.model_dump(exclude_none=True))
 
+    def _get_memory_stats(self, request: Request) -> JSONResponse:
+        stats = {'rss_bytes': process_rss_bytes()}
+        if self.task_manager is not None:
+            stats['task_manager'] = self.task_manager.memory_stats()
+        return JSONResponse(stats)
+
+    def _register_admission_metrics(self, controller: AdmissionController):
+        self.metrics.gauge(
+            'a2a_admission_active',
+            'Requests holding an admission slot.',
+            callback=lambda: controller.active,
+        )
+        self.metrics.gauge(
+            'a2a_admission_queued',
+            'Requests waiting for an admission slot.',
+            callback=lambda: controller.queued,
+        )
+        self.metrics.counter(
+            'a2a_admission_shed_total',
+            'Requests rejected by admission control.',
+            callback=lambda: controller.shed,
+        )
+
+    async def _get_slow_requests(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.profiler.report())
+
+    async def _get_metrics(self, request: Request) -> Response:
+        # Served on the event loop, so the tables read by metric callbacks
+        # cannot change mid-scrape.
+        return Response(
+            self.metrics.render() + REGISTRY.render(),
+            media_type=CONTENT_TYPE,
+        )
+
+    def _get_blob(self, request: Request) -> Response:
+        digest = request.path_params['digest']
+        if digest not in self.blob_store:
+            return Response(status_code=404)
+
+        # Blobs never change, so the digest is a strong ETag and clients may
+        # cache them for good. FileResponse answers Range requests itself.
+        headers = {
+            'ETag': f'"{digest}"',
+            'Cache-Control': 'public, max-age=31536000, immutable',
+        }
+        if_none_match = request.headers.get('If-None-Match', '')
+        if headers['ETag'] in if_none_match or if_none_match.strip() == '*':
+            return Response(status_code=304, headers=headers)
+        return FileResponse(
+            self.blob_store.path(digest),
+            headers=headers,
+            media_type='application/octet-stream',
+        )
+
     async def _process_request(self, request: Request):
+        if self.profiler is None:
+            return await self._handle_request(request)
+        async with self.profiler.profile():
+            return await self._handle_request(request)
+
+    async def _handle_request(self, request: Request):
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
-                )
-            else:
-                logger.warning(
-                    f'Unexpected request type: {type(json_rpc_request)}'
-                )
-                raise ValueError(f'Unexpected request type: {type(request)}')
+            with phase('read_body'):
+                body = await request.body()
+            with phase('parse'):
+                json_rpc_request = self._parse_request(body)
+            if isinstance(json_rpc_request, list):
+                annotate(method='batch', batch_size=len(json_rpc_request))
+                return await self._process_batch(json_rpc_request)
+            annotate(method=json_rpc_request.method, id=json_rpc_request.id)
+
+            if isinstance(json_rpc_request, TaskResubscriptionRequest):
+                last_event_id = request.headers.get('Last-Event-ID')
+                if last_event_id is not None:
+                    params = json_rpc_request.params
+                    params.metadata = {
+                        'lastEventId': last_event_id,
+                        **(params.metadata or {}),
+                    }
 
+            result = await self._dispatch(json_rpc_request)
             return self._create_response(result)
 
+        except AdmissionRejected as e:
+            response = JSONRPCResponse(
+                id=json_rpc_request.id, error=self._to_rpc_error(e)
+            )
+            return _json_response(
+                response,
+                status_code=503,
+                headers={'Retry-After': e.retry_after_header},
+            )
         except Exception as e:
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
+    def _parse_request(self, body: bytes) -> JSONRPCRequest | list[Any]:
+        """Decodes a request body into its request model, or a batch list.
+
+        The fast path peeks at the method name and validates the raw bytes
+        against that method's model alone. Bodies it cannot handle (batches,
+        unknown methods, invalid payloads) go through full decoding and the
+        A2ARequest union, which also produces the detailed error.
+        """
+        if not body.lstrip().startswith(b'['):
+            match = _METHOD_PATTERN.search(body)
+            handler = match and METHOD_HANDLERS.get(
+                match.group(1).decode(errors='replace')
+            )
+            if handler:
+                try:
+                    return handler[0].model_validate_json(body)
+                except ValidationError:
+                    pass
+
+        payload = _json_loads(body)
+        if isinstance(payload, list):
+            return payload
+        return A2ARequest.validate_python(payload)
+
+    async def _dispatch(self, json_rpc_request: JSONRPCRequest) -> Any:
+        handler = METHOD_HANDLERS.get(json_rpc_request.method)
+        if handler is None:
+            logger.warning(f'Unexpected request type: {type(json_rpc_request)}')
+            raise ValueError(
+                f'Unexpected request type: {type(json_rpc_request)}'
+            )
+
+        method = json_rpc_request.method
+        started = time.perf_counter()
+        try:
+            result = await self._call_handler(json_rpc_request, handler[1])
+        except Exception:
+            self._request_errors.labels(method).inc()
+            raise
+        finally:
+            self._request_duration.labels(method).observe(
+                time.perf_counter() - started
+            )
+        if isinstance(result, JSONRPCResponse) and result.error is not None:
+            self._request_errors.labels(method).inc()
+        return result
+
+    async def _call_handler(
+        self, json_rpc_request: JSONRPCRequest, handler_name: str
+    ) -> Any:
+        handler = getattr(self.task_manager, handler_name)
+        if self.admission_controller is None or not isinstance(
+            json_rpc_request, ADMITTED_REQUESTS
+        ):
+            with phase('handler'):
+                return await handler(json_rpc_request)
+
+        with phase('admission'):
+            permit = await self.admission_controller.acquire(
+                json_rpc_request.params.sessionId
+            )
+        try:
+            with phase('handler'):
+                result = await handler(json_rpc_request)
+        except BaseException:
+            permit.release()
+            raise
+        if isinstance(result, AsyncIterable):
+            # A stream keeps its slot until it ends.
+            return self._release_after_stream(result, permit)
+        permit.release()
+        return result
+
+    @staticmethod
+    async def _release_after_stream(
+        result: AsyncIterable[Any], permit: AdmissionPermit
+    ) -> AsyncIterable[Any]:
+        try:
+            async for item in result:
+                yield item
+        finally:
+            permit.release()
+
+    async def _process_batch(self, body: list[Any]) -> Response:
+        """Handles a JSON-RPC 2.0 batch, running its requests concurrently.
+
+        Streaming methods cannot be part of a batch and are answered with an
+        error entry. Responses are returned in request order. Notifications,
+        entries without an ``id``, are run but get no response; a batch of
+        only notifications is answered with an empty 204 response.
+        """
+        if not body or len(body) > self.max_batch_size:
+            response = JSONRPCResponse(
+                id=None,
+                error=InvalidRequestError(
+                    message=f'Batch must contain 1 to {self.max_batch_size} '
+                    'requests'
+                ),
+            )
+            return _json_response(response, status_code=400)
+
+        responses = [
+            response
+            for response in await asyncio.gather(
+                *(self._process_batch_item(item) for item in body)
+            )
+            if response is not None
+        ]
+        if not responses:
+            return Response(status_code=204)
+        with phase('serialize'):
+            content = ','.join(
+                response.model_dump_json(exclude_none=True)
+                for response in responses
+            )
+        return Response(f'[{content}]', media_type='application/json')
+
+    async def _process_batch_item(self, item: Any) -> JSONRPCResponse | None:
+        """Runs one batch entry; returns None for a notification."""
+        # Checked before validation, which would give the request a
+        # default id.
+        is_notification = isinstance(item, dict) and 'id' not in item
+        response = await self._run_batch_item(item)
+        return None if is_notification else response
+
+    async def _run_batch_item(self, item: Any) -> JSONRPCResponse:
+        request_id = item.get('id') if isinstance(item, dict) else None
+        try:
+            json_rpc_request = A2ARequest.validate_python(item)
+            if isinstance(
+                json_rpc_request,
+                SendTaskStreamingRequest | TaskResubscriptionRequest,
+            ):
+                return JSONRPCResponse(
+                    id=request_id,
+                    error=InvalidRequestError(
+                        message='Streaming methods cannot be batched'
+                    ),
+                )
+
+            result = await self._dispatch(json_rpc_request)
+            if not isinstance(result, JSONRPCResponse):
+                raise ValueError(f'Unexpected result type: {type(result)}')
+            return result
+        except Exception as e:
+            return JSONRPCResponse(id=request_id, error=self._to_rpc_error(e))
+
+    def _to_rpc_error(self, e: Exception) -> JSONRPCError:
         if isinstance(e, json.decoder.JSONDecodeError):
-            json_rpc_error = JSONParseError()
-        elif isinstance(e, ValidationError):
-            json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
-        else:
-            logger.error(f'Unhandled exception: {e}')
-            json_rpc_error = InternalError()
-
-        response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(
-            response.model_dump(exclude_none=True), status_code=400
-        )
+            return JSONParseError()
+        if isinstance(e, AdmissionRejected):
+            return ServerBusyError(data={'retryAfter': e.retry_after})
+        if isinstance(e, ValidationError):
+            return InvalidRequestError(data=json.loads(e.json()))
+        logger.error(f'Unhandled exception: {e}')
+        return InternalError()
+
+    def _handle_exception(self, e: Exception) -> Response:
+        response = JSONRPCResponse(id=None, error=self._to_rpc_error(e))
+        return _json_response(response, status_code=400)
 
-    def _create_response(
-        self, result: Any
-    ) -> JSONResponse | EventSourceResponse:
+    def _create_response(self, result: Any) -> Response | EventSourceResponse:
         if isinstance(result, AsyncIterable):
 
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
                 async for item in result:
-                    yield {'data': item.model_dump_json(exclude_none=True)}
+                    event = {'data': item.model_dump_json(exclude_none=True)}
+                    # Event ids let clients resume with Last-Event-ID.
+                    event_id = getattr(item, '_event_id', None)
+                    if event_id is not None:
+                        event['id'] = str(event_id)
+                    yield event
 
             return EventSourceResponse(event_generator(result))
         if isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            with phase('serialize'):
+                return _json_response(result)
         logger.error(f'Unexpected result type: {type(result)}')
         raise ValueError(f'Unexpected result type: {type(result)}')
@@ -1,10 +1,26 @@
 import asyncio
+import itertools
 import logging
+import time
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterable
-
-from common.server.utils import new_not_implemented_error
+from collections.abc import AsyncIterable, Coroutine
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any
+
+from common.server.artifact_chunker import chunk_artifact
+from common.server.coalescer import CoalescingStats
+from common.server.event_log import LoggedEvent, TaskEventLog
+from common.server.event_queue import OverflowPolicy, SubscriberQueue
+from common.server.locks import StripedLock
+from common.server.profiling import phase
+from common.server.scheduler import Scheduler
+from common.server.task_runner import TaskRunner
+from common.server.task_store import (
+    TERMINAL_STATES,
+    InMemoryTaskStore,
+    TaskStore,
+)
 from common.types import (
     Artifact,
     CancelTaskRequest,
@@ -14,8 +30,10 @@ from common.types import (
     GetTaskRequest,
     GetTaskResponse,
     InternalError,
+    InvalidParamsError,
     JSONRPCError,
     JSONRPCResponse,
+    Message,
     PushNotificationConfig,
     SendTaskRequest,
     SendTaskResponse,
@@ -24,6 +42,7 @@ from common.types import (
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
     Task,
+    TaskArtifactUpdateEvent,
     TaskIdParams,
     TaskNotCancelableError,
     TaskNotFoundError,
@@ -35,10 +54,19 @@ from common.types import (
     TaskStatus,
     TaskStatusUpdateEvent,
 )
+from common.utils.metrics import MetricsRegistry
 
 
 logger = logging.getLogger(__name__)
 
+# States in which a task's event stream has ended.
+FINAL_STATES = (
+    TaskState.COMPLETED,
+    TaskState.CANCELED,
+    TaskState.FAILED,
+    TaskState.INPUT_REQUIRED,
+)
+
 
 class TaskManager(ABC):
     @abstractmethod
@@ -79,25 +107,101 @@ class TaskManager(ABC):
     ) -> AsyncIterable[SendTaskResponse] | JSONRPCResponse:
         pass
 
+    def close(self):
+        """Releases resources held by the task manager on server shutdown."""
+
+    def memory_stats(self) -> dict[str, Any]:
+        """Reports the size of the task manager's tables."""
+        return {}
+
+    def register_metrics(self, registry: MetricsRegistry):
+        """Adds the task manager's metrics to a server's registry."""
+
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
+    def __init__(
+        self,
+        task_store: TaskStore | None = None,
+        lock_stripes: int = 64,
+        sse_queue_size: int = 256,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        event_log_size: int = 100,
+        orphaned_run_grace: float | None = 10.0,
+        scheduler: Scheduler | None = None,
+        history_limit: int | None = None,
+        task_retention: float | None = None,
+        sweep_interval: float = 60.0,
+        artifact_chunk_size: int | None = 64 * 1024,
+        event_log_retention: float | None = 60.0,
+    ):
+        self.tasks: TaskStore = (
+            task_store if task_store is not None else InMemoryTaskStore()
+        )
         self.push_notification_infos: dict[str, PushNotificationConfig] = {}
-        self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, list[asyncio.Queue]] = {}
+        # Per-task state is guarded by a lock picked from a striped pool, so
+        # updates to unrelated tasks do not queue behind each other.
+        self.task_locks = StripedLock(lock_stripes)
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = sse_overflow_policy
+        self.task_sse_subscribers: dict[str, list[SubscriberQueue]] = {}
+        self.event_log_size = event_log_size
+        self.task_event_logs: dict[str, TaskEventLog] = {}
+        # A task's event log is dropped event_log_retention seconds after
+        # its stream ends, unless the task streams again. Ids come from one
+        # counter, so a log created afterwards continues above the dropped
+        # one. None keeps logs until the task is swept.
+        self.event_log_retention = event_log_retention
+        self._event_ids = itertools.count(1)
+        self._event_log_expiry: dict[str, asyncio.TimerHandle] = {}
         self.subscriber_lock = asyncio.Lock()
+        # Agent runs started through the runner can be cancelled by
+        # tasks/cancel. A streaming run left without SSE subscribers for
+        # orphaned_run_grace seconds is cancelled too, unless the task has
+        # push notifications; the grace period leaves time to resubscribe.
+        # None disables cancellation on disconnect.
+        self.runner = TaskRunner()
+        self.orphaned_run_grace = orphaned_run_grace
+        self._orphan_checks: dict[str, asyncio.Task] = {}
+        # Decides when agent executions start, e.g. a FairScheduler. None
+        # starts them straight away.
+        self.scheduler = scheduler
+        # Tasks keep at most history_limit messages; older ones are spilled
+        # to the task store. None keeps the whole history on the task.
+        self.history_limit = history_limit
+        # Tasks that reached a terminal state more than task_retention
+        # seconds ago are evicted with their side tables by a background
+        # sweep every sweep_interval seconds. None keeps them forever.
+        self.task_retention = task_retention
+        self.sweep_interval = sweep_interval
+        self.evicted_tasks = 0
+        self._finished_at: dict[str, float] = {}
+        self._sweeper: asyncio.Task | None = None
+        # Artifact events larger than this many characters of text or file
+        # data are streamed as append/lastChunk chunks. Chunking happens as
+        # each subscriber sends the event, so an artifact still takes one
+        # queue and event log slot. None disables it.
+        self.artifact_chunk_size = artifact_chunk_size
+        # Number of tasks in each state. Every state change goes through
+        # _track_state, which also counts tasks the first time they are
+        # loaded from a store that outlived a restart. Tasks the store drops
+        # on its own are not noticed.
+        self.task_state_counts: dict[TaskState, int] = dict.fromkeys(
+            TaskState, 0
+        )
+        self._task_states: dict[str, TaskState] = {}
+        # Totals of the streams passed to record_stream_stats.
+        self.stream_stats = CoalescingStats()
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f'Getting task {request.params.id}')
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
+        async with self.task_locks.hold(task_query_params.id):
+            task = await self._load_task(task_query_params.id)
             if task is None:
                 return GetTaskResponse(id=request.id, error=TaskNotFoundError())
 
-            task_result = self.append_task_history(
+            task_result = await self.append_task_history(
                 task, task_query_params.historyLength
             )
 
@@ -109,14 +213,76 @@ class InMemoryTaskManager(TaskManager):
         logger.info(f'Cancelling task {request.params.id}')
         task_id_params: TaskIdParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
+        async with self.task_locks.hold(task_id_params.id):
+            task = await self._load_task(task_id_params.id)
             if task is None:
                 return CancelTaskResponse(
                     id=request.id, error=TaskNotFoundError()
                 )
 
-        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+        task = await self.cancel_task_run(task_id_params.id)
+        if task is None:
+            return CancelTaskResponse(
+                id=request.id, error=TaskNotCancelableError()
+            )
+
+        return CancelTaskResponse(
+            id=request.id, result=await self.append_task_history(task, None)
+        )
+
+    def agent_slot(
+        self, params: TaskSendParams
+    ) -> AbstractAsyncContextManager[None]:
+        """Returns the scheduler slot held while the agent works on a task."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(params)
+
+    def start_agent_run(
+        self, params: TaskSendParams, coro: Coroutine[Any, Any, Any]
+    ) -> asyncio.Task:
+        """Starts an agent run in the background once the scheduler allows."""
+        return self.runner.start(params.id, self._run_in_slot(params, coro))
+
+    async def _run_in_slot(
+        self, params: TaskSendParams, coro: Coroutine[Any, Any, Any]
+    ) -> Any:
+        try:
+            async with self.agent_slot(params):
+                return await coro
+        finally:
+            # Closes the coroutine if it was cancelled before it started.
+            coro.close()
+
+    async def cancel_task_run(self, task_id: str) -> Task | None:
+        """Cancels a task's live agent run and marks the task CANCELED.
+
+        Subscribers receive a final status event. Returns None if the task
+        had no run to cancel.
+        """
+        if not await self.runner.cancel(task_id):
+            return None
+
+        status = TaskStatus(state=TaskState.CANCELED)
+        task = await self.update_store(task_id, status, None)
+        await self.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(id=task_id, status=status, final=True),
+        )
+        return task
+
+    async def _cancel_if_orphaned(self, task_id: str):
+        try:
+            await asyncio.sleep(self.orphaned_run_grace)
+            async with self.subscriber_lock:
+                if self.task_sse_subscribers.get(task_id):
+                    return
+            if task_id in self.push_notification_infos:
+                return
+            if await self.cancel_task_run(task_id) is not None:
+                logger.info(f'Cancelled task {task_id} with no subscribers')
+        finally:
+            self._orphan_checks.pop(task_id, None)
 
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -131,8 +297,8 @@ class InMemoryTaskManager(TaskManager):
     async def set_push_notification_info(
         self, task_id: str, notification_config: PushNotificationConfig
     ):
-        async with self.lock:
-            task = self.tasks.get(task_id)
+        async with self.task_locks.hold(task_id):
+            task = await self._load_task(task_id)
             if task is None:
                 raise ValueError(f'Task not found for {task_id}')
 
@@ -141,17 +307,15 @@ class InMemoryTaskManager(TaskManager):
     async def get_push_notification_info(
         self, task_id: str
     ) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
+        async with self.task_locks.hold(task_id):
+            task = await self._load_task(task_id)
             if task is None:
                 raise ValueError(f'Task not found for {task_id}')
 
             return self.push_notification_infos[task_id]
 
-    
-
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
+        async with self.task_locks.hold(task_id):
             return task_id in self.push_notification_infos
 
     async def on_set_task_push_notification(
@@ -206,8 +370,9 @@ class InMemoryTaskManager(TaskManager):
 
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f'Upserting task {task_send_params.id}')
-        async with self.lock:
-            task = self.tasks.get(task_send_params.id)
+        self._ensure_sweeper()
+        async with self.task_locks.hold(task_send_params.id):
+            task = await self._load_task(task_send_params.id)
             if task is None:
                 task = Task(
                     id=task_send_params.id,
@@ -216,84 +381,488 @@ class InMemoryTaskManager(TaskManager):
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[task_send_params.message],
                 )
-                self.tasks[task_send_params.id] = task
+                self._track_state(task.id, TaskState.SUBMITTED)
             else:
-                task.history.append(task_send_params.message)
+                await self._append_history(task, task_send_params.message)
 
+            with phase('store_write'):
+                await self.tasks.aset(task_send_params.id, task)
             return task
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        return new_not_implemented_error(request.id)
+        """Reattaches a client to a task's event stream.
+
+        Events emitted after ``metadata.lastEventId`` (or the Last-Event-ID
+        header, see A2AServer) are replayed from the task's event log before
+        live events. If the stream has already ended and nothing was missed,
+        the current status is sent as a final event.
+        """
+        task_id_params: TaskIdParams = request.params
+        logger.info(f'Resubscribing to task {task_id_params.id}')
+
+        metadata = task_id_params.metadata or {}
+        last_event_id = metadata.get('lastEventId')
+        try:
+            if last_event_id is not None:
+                last_event_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return JSONRPCResponse(
+                id=request.id,
+                error=InvalidParamsError(message='Invalid lastEventId'),
+            )
+
+        async with self.task_locks.hold(task_id_params.id):
+            task = await self._load_task(task_id_params.id)
+            if task is None:
+                return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        sse_event_queue = await self.setup_sse_consumer(
+            task.id, True, last_event_id
+        )
+        if sse_event_queue.qsize() == 0:
+            event_log = self.task_event_logs.get(task.id)
+            if event_log is not None and len(event_log) > 0:
+                stream_ended = event_log.stream_ended
+            else:
+                stream_ended = task.status.state in FINAL_STATES
+            if stream_ended:
+                sse_event_queue.put_nowait(
+                    LoggedEvent(
+                        event_log.last_event_id if event_log else 0,
+                        TaskStatusUpdateEvent(
+                            id=task.id, status=task.status, final=True
+                        ),
+                    )
+                )
+
+        return self.dequeue_events_for_sse(request.id, task.id, sse_event_queue)
 
     async def update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
+        self,
+        task_id: str,
+        status: TaskStatus,
+        artifacts: list[Artifact],
+        record_history: bool = True,
     ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
+        """Stores a task's new status and artifacts.
+
+        The status message is appended to history unless record_history is
+        False, which agents pass for streamed fragments.
+        """
+        async with self.task_locks.hold(task_id):
+            task = await self._load_task(task_id)
+            if task is None:
                 logger.error(f'Task {task_id} not found for updating the task')
                 raise ValueError(f'Task {task_id} not found')
 
+            self._track_state(task_id, status.state)
             task.status = status
+            if status.state in TERMINAL_STATES:
+                self._finished_at[task_id] = time.monotonic()
+            else:
+                self._finished_at.pop(task_id, None)
 
-            if status.message is not None:
-                task.history.append(status.message)
+            if record_history and status.message is not None:
+                await self._append_history(task, status.message)
 
             if artifacts is not None:
                 if task.artifacts is None:
                     task.artifacts = []
                 task.artifacts.extend(artifacts)
 
+            with phase('store_write'):
+                await self.tasks.aset(task_id, task)
             return task
 
-    def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
-        else:
-            new_task.history = []
+    async def _load_task(self, task_id: str) -> Task | None:
+        task = await self.tasks.aget(task_id)
+        if task is not None and task_id not in self._task_states:
+            # Loaded from a store that outlived a restart.
+            self._track_state(task_id, task.status.state)
+            if task.status.state in TERMINAL_STATES:
+                self._finished_at.setdefault(task_id, time.monotonic())
+        return task
+
+    def _track_state(self, task_id: str, state: TaskState | None):
+        """Moves a task to ``state`` in task_state_counts.
+
+        None removes the task from the counts.
+        """
+        previous = self._task_states.pop(task_id, None)
+        if previous is not None:
+            self.task_state_counts[previous] -= 1
+        if state is not None:
+            self._task_states[task_id] = state
+            self.task_state_counts[state] += 1
+
+    def close(self):
+        """Cancels live agent runs, then flushes and releases the task store."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        for check in self._orphan_checks.values():
+            check.cancel()
+        for handle in self._event_log_expiry.values():
+            handle.cancel()
+        self.runner.cancel_all()
+        self.tasks.close()
+
+    def _ensure_sweeper(self):
+        if self.task_retention is not None and self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f'Error while sweeping finished tasks: {e}')
+
+    async def sweep(self) -> int:
+        """Evicts tasks that finished more than task_retention seconds ago.
+
+        The task's push notification config, event log and subscriber list
+        go with it. Tasks with a live run or subscribers are kept. Returns
+        the number of evicted tasks.
+        """
+        if self.task_retention is None:
+            return 0
+
+        cutoff = time.monotonic() - self.task_retention
+        expired = [
+            task_id
+            for task_id, finished_at in self._finished_at.items()
+            if finished_at <= cutoff
+        ]
+        evicted = 0
+        for task_id in expired:
+            if self.runner.is_running(task_id):
+                continue
+            async with self.task_locks.hold(task_id):
+                if self._finished_at.get(task_id, cutoff + 1) > cutoff:
+                    continue  # the task was resumed
+                async with self.subscriber_lock:
+                    if self.task_sse_subscribers.get(task_id):
+                        continue
+                    self.task_sse_subscribers.pop(task_id, None)
+                    self._drop_event_log(task_id)
+                del self._finished_at[task_id]
+                await self.tasks.apop(task_id)
+                self._track_state(task_id, None)
+                self.push_notification_infos.pop(task_id, None)
+                evicted += 1
+
+        if evicted:
+            self.evicted_tasks += evicted
+            logger.info(f'Evicted {evicted} finished tasks')
+        return evicted
+
+    def memory_stats(self) -> dict[str, Any]:
+        return {
+            'tasks': len(self.tasks),
+            'finished_tasks': len(self._finished_at),
+            'evicted_tasks': self.evicted_tasks,
+            'push_notification_configs': len(self.push_notification_infos),
+            'subscriber_lists': len(self.task_sse_subscribers),
+            'subscribers': sum(
+                len(subscribers)
+                for subscribers in self.task_sse_subscribers.values()
+            ),
+            'event_logs': len(self.task_event_logs),
+            'logged_events': sum(
+                len(event_log) for event_log in self.task_event_logs.values()
+            ),
+            'runs': self.runner.stats(),
+        }
+
+    def register_metrics(self, registry: MetricsRegistry):
+        # Everything is read when metrics are scraped, so handling tasks and
+        # events costs nothing extra.
+        registry.gauge(
+            'a2a_tasks',
+            'Tasks held by the task manager, by state.',
+            labelnames=('state',),
+            callback=lambda: {
+                (state.value,): count
+                for state, count in self.task_state_counts.items()
+            },
+        )
+        registry.counter(
+            'a2a_tasks_evicted_total',
+            'Finished tasks evicted by the sweep.',
+            callback=lambda: self.evicted_tasks,
+        )
+        registry.gauge(
+            'a2a_sse_subscribers',
+            'Open SSE subscriptions.',
+            callback=lambda: sum(
+                len(subscribers)
+                for subscribers in self.task_sse_subscribers.values()
+            ),
+        )
+        registry.gauge(
+            'a2a_sse_queued_events',
+            'Events waiting in SSE subscriber queues.',
+            callback=lambda: sum(
+                subscriber.qsize()
+                for subscribers in self.task_sse_subscribers.values()
+                for subscriber in subscribers
+            ),
+        )
+        registry.gauge(
+            'a2a_sse_max_queue_depth',
+            'Events waiting in the fullest SSE subscriber queue.',
+            callback=lambda: max(
+                (
+                    subscriber.qsize()
+                    for subscribers in self.task_sse_subscribers.values()
+                    for subscriber in subscribers
+                ),
+                default=0,
+            ),
+        )
+        registry.gauge(
+            'a2a_agent_runs',
+            'Live agent runs.',
+            callback=lambda: self.runner.live,
+        )
+        registry.counter(
+            'a2a_agent_runs_started_total',
+            'Agent runs started.',
+            callback=lambda: self.runner.started,
+        )
+        registry.counter(
+            'a2a_agent_runs_cancelled_total',
+            'Agent runs cancelled.',
+            callback=lambda: self.runner.cancelled,
+        )
+        registry.counter(
+            'a2a_agent_runs_failed_total',
+            'Agent runs that raised an exception.',
+            callback=lambda: self.runner.failed,
+        )
+        registry.counter(
+            'a2a_stream_events_total',
+            'Events produced by coalesced task streams.',
+            callback=lambda: self.stream_stats.events,
+        )
+        registry.counter(
+            'a2a_stream_frames_total',
+            'Frames sent by coalesced task streams.',
+            callback=lambda: self.stream_stats.frames,
+        )
+        registry.counter(
+            'a2a_stream_cpu_seconds_total',
+            'CPU time spent producing coalesced task streams.',
+            callback=lambda: self.stream_stats.cpu_seconds,
+        )
+        if self.scheduler is not None:
+            registry.gauge(
+                'a2a_scheduler_running',
+                'Agent executions holding a scheduler slot.',
+                callback=lambda: self.scheduler.stats().get('running', 0),
+            )
+            registry.gauge(
+                'a2a_scheduler_queued',
+                'Agent executions waiting for a scheduler slot.',
+                callback=lambda: self.scheduler.stats().get('queued', 0),
+            )
 
-        return new_task
+    def record_stream_stats(self, task_id: str, stats: CoalescingStats):
+        """Logs the counters of a task's coalesced stream and adds them up."""
+        logger.info(
+            f'Task {task_id} streamed {stats.events} events in '
+            f'{stats.frames} frames using {stats.cpu_seconds * 1000:.1f} ms '
+            f'CPU'
+        )
+        self.stream_stats.events += stats.events
+        self.stream_stats.frames += stats.frames
+        self.stream_stats.cpu_seconds += stats.cpu_seconds
+
+    async def _append_history(self, task: Task, message: Message):
+        if task.history is None:
+            task.history = []
+        task.history.append(message)
+        if self.history_limit is None:
+            return
+
+        excess = len(task.history) - self.history_limit
+        if excess > 0:
+            await self.tasks.aspill_history(task.id, task.history[:excess])
+            del task.history[:excess]
+
+    async def append_task_history(
+        self, task: Task, historyLength: int | None
+    ) -> Task:
+        """Returns a shallow copy of the task with its latest history messages.
+
+        Only the requested messages are copied. Messages spilled to the task
+        store are loaded when more are requested than the task retains.
+        """
+        history = []
+        if historyLength is not None and historyLength > 0:
+            retained = task.history or []
+            history = retained[-historyLength:]
+            missing = historyLength - len(history)
+            if (
+                missing > 0
+                and self.history_limit is not None
+                and len(retained) >= self.history_limit
+            ):
+                with phase('history_load'):
+                    spilled = await self.tasks.aload_history(task.id, missing)
+                history = spilled + history
+
+        return task.model_copy(update={'history': history})
 
     async def setup_sse_consumer(
-        self, task_id: str, is_resubscribe: bool = False
+        self,
+        task_id: str,
+        is_resubscribe: bool = False,
+        last_event_id: int | None = None,
     ):
         async with self.subscriber_lock:
             if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
+                if is_resubscribe and await self._load_task(task_id) is None:
                     raise ValueError('Task not found for resubscription')
                 self.task_sse_subscribers[task_id] = []
 
-            sse_event_queue = asyncio.Queue(maxsize=0)  # <=0 is unlimited
+            sse_event_queue = SubscriberQueue(
+                self.sse_queue_size, self.sse_overflow_policy
+            )
+            # Replaying under the lock that also guards the event log means
+            # no event can fall between the replayed tail and live events.
+            event_log = self.task_event_logs.get(task_id)
+            if last_event_id is not None and event_log is not None:
+                for entry in event_log.since(last_event_id):
+                    sse_event_queue.put_nowait(entry)
+
             self.task_sse_subscribers[task_id].append(sse_event_queue)
             return sse_event_queue
 
     async def enqueue_events_for_sse(self, task_id, task_update_event):
         async with self.subscriber_lock:
+            event_log = self.task_event_logs.get(task_id)
+            if event_log is None:
+                event_log = TaskEventLog(self.event_log_size, self._event_ids)
+                self.task_event_logs[task_id] = event_log
+            entry = event_log.append(task_update_event)
+            if event_log.stream_ended:
+                self._expire_event_log(task_id)
+
             if task_id not in self.task_sse_subscribers:
                 return
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+            current_subscribers = list(self.task_sse_subscribers[task_id])
+
+        # Delivery never blocks, and happens outside the lock so that
+        # subscribers can come and go while events are fanned out.
+        disconnected = [
+            subscriber
+            for subscriber in current_subscribers
+            if not subscriber.put_nowait(entry)
+        ]
+        if disconnected:
+            async with self.subscriber_lock:
+                subscribers = self.task_sse_subscribers.get(task_id, [])
+                for subscriber in disconnected:
+                    if subscriber in subscribers:
+                        subscribers.remove(subscriber)
+                if not subscribers:
+                    self.task_sse_subscribers.pop(task_id, None)
+
+    def _expire_event_log(self, task_id: str):
+        if self.event_log_retention is None:
+            return
+        handle = self._event_log_expiry.pop(task_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._event_log_expiry[task_id] = asyncio.get_running_loop().call_later(
+            self.event_log_retention, self._drop_ended_event_log, task_id
+        )
+
+    def _drop_ended_event_log(self, task_id: str):
+        event_log = self.task_event_logs.get(task_id)
+        if event_log is not None and not event_log.stream_ended:
+            # The task streamed again; its new final event reschedules this.
+            self._event_log_expiry.pop(task_id, None)
+            return
+        self._drop_event_log(task_id)
+
+    def _drop_event_log(self, task_id: str):
+        self.task_event_logs.pop(task_id, None)
+        handle = self._event_log_expiry.pop(task_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _responses_for_event(
+        self, request_id, event_id: int, event
+    ) -> list[SendTaskStreamingResponse]:
+        """Builds the stream responses for one logged event.
+
+        A large artifact takes a single slot in the subscriber queues and the
+        event log, and is only split into chunks here, as it is sent. Only
+        the last chunk carries the event id, so a client that reconnects
+        part way through an artifact is sent the whole artifact again.
+        """
+        if isinstance(event, JSONRPCError):
+            response = SendTaskStreamingResponse(id=request_id, error=event)
+            response._event_id = event_id
+            return [response]
+
+        events = [event]
+        if self.artifact_chunk_size is not None and isinstance(
+            event, TaskArtifactUpdateEvent
+        ):
+            events = [
+                event.model_copy(update={'artifact': chunk})
+                for chunk in chunk_artifact(
+                    event.artifact, self.artifact_chunk_size
+                )
+            ]
+        responses = [
+            SendTaskStreamingResponse(id=request_id, result=item)
+            for item in events
+        ]
+        responses[-1]._event_id = event_id
+        return responses
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
+        self, request_id, task_id, sse_event_queue: SubscriberQueue
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         try:
             while True:
-                event = await sse_event_queue.get()
-                if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                entry = await sse_event_queue.get()
+                if isinstance(entry, JSONRPCError):
+                    yield SendTaskStreamingResponse(id=request_id, error=entry)
                     break
 
-                yield SendTaskStreamingResponse(id=request_id, result=event)
-                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                event_id, event = entry
+                for response in self._responses_for_event(
+                    request_id, event_id, event
+                ):
+                    yield response
+
+                if isinstance(event, JSONRPCError) or (
+                    isinstance(event, TaskStatusUpdateEvent) and event.final
+                ):
                     break
         finally:
             async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                subscribers = self.task_sse_subscribers.get(task_id, [])
+                if sse_event_queue in subscribers:
+                    subscribers.remove(sse_event_queue)
+                orphaned = (
+                    not subscribers
+                    and self.orphaned_run_grace is not None
+                    and self.runner.is_running(task_id)
+                    and task_id not in self._orphan_checks
+                )
+                if orphaned:
+                    self._orphan_checks[task_id] = asyncio.create_task(
+                        self._cancel_if_orphaned(task_id)
+                    )
+                if not subscribers:
+                    self.task_sse_subscribers.pop(task_id, None)
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+
+from collections.abc import Coroutine
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRunner:
+    """Owns the background coroutines that run agents for A2A tasks.
+
+    Task managers start agent runs with ``start`` instead of a bare
+    ``asyncio.create_task``, so a run can be found and cancelled by task id
+    and nothing is left running unobserved.
+    """
+
+    def __init__(self):
+        self._runs: dict[str, set[asyncio.Task]] = {}
+        self.started = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    def start(
+        self, task_id: str, coro: Coroutine[Any, Any, Any]
+    ) -> asyncio.Task:
+        """Runs ``coro`` in the background on behalf of ``task_id``."""
+        run = asyncio.create_task(coro, name=f'a2a-task-{task_id}')
+        self._runs.setdefault(task_id, set()).add(run)
+        run.add_done_callback(lambda run: self._on_done(task_id, run))
+        self.started += 1
+        return run
+
+    def _on_done(self, task_id: str, run: asyncio.Task):
+        runs = self._runs.get(task_id)
+        if runs is not None:
+            runs.discard(run)
+            if not runs:
+                del self._runs[task_id]
+
+        if run.cancelled():
+            self.cancelled += 1
+        elif run.exception() is not None:
+            self.failed += 1
+            logger.error(f'Run for task {task_id} failed: {run.exception()!r}')
+
+    def is_running(self, task_id: str) -> bool:
+        return task_id in self._runs
+
+    async def cancel(self, task_id: str) -> bool:
+        """Cancels the runs of a task and waits for them to finish.
+
+        Returns False if the task had no live run.
+        """
+        runs = self._runs.get(task_id)
+        if not runs:
+            return False
+
+        runs = set(runs)
+        for run in runs:
+            run.cancel()
+        await asyncio.wait(runs)
+        logger.info(f'Cancelled {len(runs)} run(s) for task {task_id}')
+        return True
+
+    def cancel_all(self):
+        """Requests cancellation of every live run, e.g. on shutdown."""
+        for runs in self._runs.values():
+            for run in runs:
+                run.cancel()
+
+    @property
+    def live(self) -> int:
+        return sum(len(runs) for runs in self._runs.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'live': self.live,
+            'started': self.started,
+            'cancelled': self.cancelled,
+            'failed': self.failed,
+        }
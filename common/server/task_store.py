@@ -0,0 +1,457 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+
+from common.types import Message, Task, TaskState
+
+
+logger = logging.getLogger(__name__)
+
+# States after which a task receives no further work and may be evicted.
+TERMINAL_STATES = (TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED)
+
+
+class TaskStore(MutableMapping[str, Task]):
+    """Storage backend for the tasks tracked by an InMemoryTaskManager.
+
+    A store behaves like a ``dict[str, Task]``. Callers that mutate a task in
+    place must assign it back (``store[task.id] = task``) so that persistent
+    backends see the change.
+
+    Code running on the event loop uses the ``a``-prefixed methods, which
+    backends doing blocking I/O run in a worker thread.
+    """
+
+    @abstractmethod
+    def __getitem__(self, task_id: str) -> Task:
+        pass
+
+    @abstractmethod
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    def __delitem__(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def spill_history(self, task_id: str, messages: list[Message]) -> None:
+        """Archive history messages trimmed from a task, oldest first.
+
+        Stores without an archive discard them.
+        """
+
+    def load_history(self, task_id: str, count: int) -> list[Message]:
+        """Return up to ``count`` latest archived messages, oldest first."""
+        return []
+
+    def flush(self) -> None:
+        """Write any buffered changes to the backing storage."""
+
+    def close(self) -> None:
+        """Flush pending changes and release the backing storage."""
+        self.flush()
+
+    async def aget(self, task_id: str) -> Task | None:
+        """Return the task, or None if it is not stored."""
+        return self.get(task_id)
+
+    async def aset(self, task_id: str, task: Task) -> None:
+        """Store the task."""
+        self[task_id] = task
+
+    async def apop(self, task_id: str) -> Task | None:
+        """Remove the task and return it, or None if it is not stored."""
+        return self.pop(task_id, None)
+
+    async def aspill_history(
+        self, task_id: str, messages: list[Message]
+    ) -> None:
+        """Async ``spill_history``."""
+        self.spill_history(task_id, messages)
+
+    async def aload_history(self, task_id: str, count: int) -> list[Message]:
+        """Async ``load_history``."""
+        return self.load_history(task_id, count)
+
+
+class InMemoryTaskStore(TaskStore):
+    """Keeps tasks in process memory with optional LRU and idle-TTL eviction.
+
+    Args:
+        max_tasks: Maximum number of tasks to keep. The least recently used
+            finished task is evicted first; tasks that are still running or
+            waiting for input are never evicted for capacity, so the store
+            may hold more while that many tasks are in flight. None keeps
+            every task.
+        ttl: Seconds a task may stay untouched before it is evicted. None
+            disables expiry.
+    """
+
+    def __init__(self, max_tasks: int | None = None, ttl: float | None = None):
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self._tasks: OrderedDict[str, Task] = OrderedDict()
+        self._touched: dict[str, float] = {}
+        # Ids of the tasks stored in a terminal state, least recent first,
+        # so capacity eviction never has to walk past tasks in flight.
+        self._finished: OrderedDict[str, None] = OrderedDict()
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._tasks[task_id]
+        if self._is_expired(task_id, time.monotonic()):
+            del self[task_id]
+            raise KeyError(task_id)
+        self._touch(task_id)
+        return task
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        self._tasks[task_id] = task
+        if task.status.state in TERMINAL_STATES:
+            self._finished[task_id] = None
+        else:
+            self._finished.pop(task_id, None)
+        self._touch(task_id)
+        self._evict()
+
+    def __delitem__(self, task_id: str) -> None:
+        del self._tasks[task_id]
+        self._touched.pop(task_id, None)
+        self._finished.pop(task_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        self._evict()
+        return iter(list(self._tasks))
+
+    def __len__(self) -> int:
+        self._evict()
+        return len(self._tasks)
+
+    def _touch(self, task_id: str) -> None:
+        self._tasks.move_to_end(task_id)
+        if task_id in self._finished:
+            self._finished.move_to_end(task_id)
+        if self.ttl is not None:
+            self._touched[task_id] = time.monotonic()
+
+    def _is_expired(self, task_id: str, now: float) -> bool:
+        if self.ttl is None:
+            return False
+        return now - self._touched.get(task_id, now) > self.ttl
+
+    def _evict(self) -> None:
+        # Entries are ordered by last access, so expired tasks are always at
+        # the front, and so is the least recently used finished task.
+        if self.ttl is not None:
+            now = time.monotonic()
+            expired = []
+            for task_id in self._tasks:
+                if not self._is_expired(task_id, now):
+                    break
+                expired.append(task_id)
+            for task_id in expired:
+                del self[task_id]
+
+        if self.max_tasks is not None:
+            while len(self._tasks) > self.max_tasks and self._finished:
+                del self[next(iter(self._finished))]
+
+
+class SQLiteTaskStore(TaskStore):
+    """Persists tasks in a SQLite database running in WAL mode.
+
+    Writes are buffered and flushed in a single transaction once
+    ``batch_size`` tasks are pending, or by a background timer at most
+    ``flush_interval`` seconds after the first pending write. Repeated
+    updates to the same task between flushes are written once. Recently
+    used tasks, in any state, are kept in a least recently used cache of
+    ``cache_size`` entries so hot tasks are not re-parsed on every read.
+    History messages spilled from tasks are kept in a separate table.
+
+    The store is thread-safe. Its async methods serve buffered and cached
+    tasks directly and run database reads and flushes in a worker thread,
+    so the event loop never waits on SQLite.
+
+    Args:
+        path: Database file, created if missing.
+        batch_size: Number of pending writes that triggers a flush.
+        flush_interval: Maximum age in seconds of a pending write.
+        cache_size: Number of deserialized tasks kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        cache_size: int = 1024,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Task] = OrderedDict()
+        # task id -> task to write, or None for a pending delete
+        self._pending: dict[str, Task | None] = {}
+        # (task id, serialized message) rows to append to the history table
+        self._pending_history: list[tuple[str, str]] = []
+        # Writes taken by a flush that has not committed them yet.
+        self._flushing: dict[str, Task | None] = {}
+        self._flush_timer: threading.Timer | None = None
+        # _lock guards the buffers and the cache and is never held during
+        # I/O; _db_lock serialises use of the connection.
+        self._lock = threading.RLock()
+        self._db_lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            'id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS history ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'task_id TEXT NOT NULL, data TEXT NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS history_task_id '
+            'ON history (task_id, seq)'
+        )
+        self._conn.commit()
+
+    def __getitem__(self, task_id: str) -> Task:
+        found, task = self._lookup(task_id)
+        if found:
+            if task is None:
+                raise KeyError(task_id)
+            return task
+
+        with self._db_lock:
+            row = self._conn.execute(
+                'SELECT data FROM tasks WHERE id = ?', (task_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+
+        task = Task.model_validate_json(row[0])
+        with self._lock:
+            # A write that raced the read wins.
+            found, newer = self._lookup(task_id)
+            if found:
+                if newer is None:
+                    raise KeyError(task_id)
+                return newer
+            self._cache_task(task_id, task)
+        return task
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        if self._buffer(task_id, task):
+            self.flush()
+
+    def __delitem__(self, task_id: str) -> None:
+        if task_id not in self:
+            raise KeyError(task_id)
+        if self._buffer(task_id, None):
+            self.flush()
+
+    def __contains__(self, task_id: object) -> bool:
+        try:
+            self[task_id]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute('SELECT id FROM tasks').fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._db_lock:
+            return self._conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[
+                0
+            ]
+
+    def spill_history(self, task_id: str, messages: list[Message]) -> None:
+        if self._buffer_history(task_id, messages):
+            self.flush()
+
+    def load_history(self, task_id: str, count: int) -> list[Message]:
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                'SELECT data FROM history WHERE task_id = ? '
+                'ORDER BY seq DESC LIMIT ?',
+                (task_id, count),
+            ).fetchall()
+        return [Message.model_validate_json(row[0]) for row in reversed(rows)]
+
+    async def aget(self, task_id: str) -> Task | None:
+        found, task = self._lookup(task_id)
+        if found:
+            return task
+        return await asyncio.to_thread(self.get, task_id)
+
+    async def aset(self, task_id: str, task: Task) -> None:
+        if self._buffer(task_id, task):
+            await asyncio.to_thread(self.flush)
+
+    async def apop(self, task_id: str) -> Task | None:
+        return await asyncio.to_thread(self.pop, task_id, None)
+
+    async def aspill_history(
+        self, task_id: str, messages: list[Message]
+    ) -> None:
+        if self._buffer_history(task_id, messages):
+            await asyncio.to_thread(self.flush)
+
+    async def aload_history(self, task_id: str, count: int) -> list[Message]:
+        return await asyncio.to_thread(self.load_history, task_id, count)
+
+    def _lookup(self, task_id: str) -> tuple[bool, Task | None]:
+        """Looks a task up without I/O.
+
+        Returns whether the buffers or the cache know the task, and the
+        task, which is None for a pending delete.
+        """
+        with self._lock:
+            for writes in (self._pending, self._flushing):
+                if task_id in writes:
+                    return True, writes[task_id]
+            task = self._cache.get(task_id)
+            if task is None:
+                return False, None
+            self._cache.move_to_end(task_id)
+            return True, task
+
+    def _buffer(self, task_id: str, task: Task | None) -> bool:
+        """Buffers a write or delete; returns whether a flush is due."""
+        with self._lock:
+            if task is None:
+                self._cache.pop(task_id, None)
+            else:
+                self._cache_task(task_id, task)
+            self._pending[task_id] = task
+            return self._flush_due()
+
+    def _cache_task(self, task_id: str, task: Task) -> None:
+        # Every task is on disk, so any of them can leave the cache.
+        self._cache[task_id] = task
+        self._cache.move_to_end(task_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _buffer_history(self, task_id: str, messages: list[Message]) -> bool:
+        with self._lock:
+            self._pending_history.extend(
+                (task_id, message.model_dump_json(exclude_none=True))
+                for message in messages
+            )
+            return self._flush_due()
+
+    def _flush_due(self) -> bool:
+        if len(self._pending) + len(self._pending_history) >= self.batch_size:
+            return True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                self.flush_interval, self._flush_on_timer
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return False
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f'Error while flushing the task store: {e}')
+
+    def flush(self) -> None:
+        # Flushes commit one after another, so a later write is never
+        # overwritten by an earlier flush.
+        with self._db_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._pending and not self._pending_history:
+                    return
+                self._flushing = self._pending
+                history = self._pending_history
+                self._pending = {}
+                self._pending_history = []
+
+            try:
+                self._write(self._flushing, history)
+            except BaseException:
+                # Put the writes back so the next flush retries them.
+                with self._lock:
+                    self._pending = {**self._flushing, **self._pending}
+                    self._pending_history = history + self._pending_history
+                    self._flushing = {}
+                raise
+
+            with self._lock:
+                self._flushing = {}
+
+    def _write(
+        self, writes: dict[str, Task | None], history: list[tuple[str, str]]
+    ) -> None:
+        now = time.time()
+        upserts = []
+        deletes = []
+        for task_id, task in writes.items():
+            if task is None:
+                deletes.append((task_id,))
+            else:
+                upserts.append(
+                    (task_id, task.model_dump_json(exclude_none=True), now)
+                )
+
+        with self._conn:
+            if history:
+                self._conn.executemany(
+                    'INSERT INTO history (task_id, data) VALUES (?, ?)',
+                    history,
+                )
+            if upserts:
+                self._conn.executemany(
+                    'INSERT INTO tasks (id, data, updated_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(id) DO UPDATE SET '
+                    'data = excluded.data, updated_at = excluded.updated_at',
+                    upserts,
+                )
+            if deletes:
+                self._conn.executemany(
+                    'DELETE FROM tasks WHERE id = ?', deletes
+                )
+                self._conn.executemany(
+                    'DELETE FROM history WHERE task_id = ?', deletes
+                )
+
+        logger.debug(
+            f'Flushed {len(upserts)} task writes, {len(deletes)} deletes and '
+            f'{len(history)} history messages'
+        )
+
+    def close(self) -> None:
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
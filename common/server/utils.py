@@ -1,3 +1,6 @@
+import os
+import sys
+
 from common.types import (
     ContentTypeNotSupportedError,
     JSONRPCResponse,
@@ -26,3 +29,20 @@ def new_incompatible_types_error(request_id):
 
 def new_not_implemented_error(request_id):
     return JSONRPCResponse(id=request_id, error=UnsupportedOperationError())
+
+
+def process_rss_bytes() -> int | None:
+    """Returns the resident set size of this process, if the OS exposes it."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Without /proc fall back to the peak RSS, which ru_maxrss reports in
+    # bytes on macOS and in KiB elsewhere.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
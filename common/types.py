@@ -7,6 +7,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PrivateAttr,
     TypeAdapter,
     field_serializer,
     model_validator,
@@ -79,6 +80,13 @@ class TaskStatus(BaseModel):
         return dt.isoformat()
 
 
+# Artifact.metadata key holding a chunk's position in a chunked artifact.
+ARTIFACT_CHUNK_INDEX_KEY = 'chunkIndex'
+# Part.metadata key marking a part whose text or file bytes continue the
+# previous part, when a chunked artifact splits a large part.
+PART_CONTINUED_KEY = 'continued'
+
+
 class Artifact(BaseModel):
     name: str | None = None
     description: str | None = None
@@ -188,6 +196,8 @@ class SendTaskStreamingRequest(JSONRPCRequest):
 
 class SendTaskStreamingResponse(JSONRPCResponse):
     result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None
+    # Id of the event in the task's event log, sent as the SSE event id.
+    _event_id: int | None = PrivateAttr(default=None)
 
 
 class GetTaskRequest(JSONRPCRequest):
@@ -311,6 +321,12 @@ class ContentTypeNotSupportedError(JSONRPCError):
     data: None = None
 
 
+class ServerBusyError(JSONRPCError):
+    code: int = -32000
+    message: str = 'Server is busy, retry later'
+    data: Any | None = None
+
+
 class AgentProvider(BaseModel):
     organization: str
     url: str | None = None
@@ -368,5 +384,15 @@ class A2AClientJSONError(A2AClientError):
         super().__init__(f'JSON Error: {message}')
 
 
+class A2AClientArtifactTooLargeError(A2AClientError):
+    def __init__(self, task_id: str, index: int, limit: int):
+        self.task_id = task_id
+        self.index = index
+        self.limit = limit
+        super().__init__(
+            f'Artifact {index} of task {task_id} exceeds {limit} bytes'
+        )
+
+
 class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from typing import Any, NamedTuple
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://api.frankfurter.app'
+
+
+class ExchangeRateError(Exception):
+    """Raised when rates cannot be fetched or a currency is unknown."""
+
+
+class UnknownCurrencyError(ExchangeRateError):
+    """Raised when a currency has no published rate."""
+
+
+class RateTable(NamedTuple):
+    """Rates of every known currency against ``base``, itself included."""
+
+    base: str
+    date: str
+    rates: dict[str, float]
+    expires_at: float
+
+
+class ExchangeRateProvider:
+    """Exchange rates from the Frankfurter API, cached and coalesced.
+
+    A lookup fetches the base currency's full rate table, which is then
+    cached for ``ttl`` seconds by (base, date). Later lookups for any pair
+    of currencies in a cached table of the same date are computed from it
+    as cross rates, so most lookups never reach the API. Concurrent lookups
+    that miss the cache share one request. When ``cache_path`` is set the
+    tables are also kept in that JSON file and survive a restart; async
+    lookups write it in a worker thread, coalescing writes that pile up.
+
+    Cross rates are computed from rounded published rates and may differ
+    from Frankfurter's own in the last digits.
+
+    Args:
+        base_url: Frankfurter API to use. Defaults to the FRANKFURTER_URL
+            environment variable, then to the public API.
+        ttl: Seconds a rate table stays fresh.
+        cache_path: JSON file the cache is loaded from and saved to.
+        timeout: Timeout for API requests.
+        httpx_client: Client for async requests instead of an owned one.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        ttl: float = 3600.0,
+        cache_path: str | None = None,
+        timeout: float = 10.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        self.base_url = (
+            base_url or os.getenv('FRANKFURTER_URL') or DEFAULT_BASE_URL
+        ).rstrip('/')
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+        self._sync_client: httpx.Client | None = None
+        self._tables: dict[tuple[str, str], RateTable] = {}
+        self._in_flight: dict[tuple[str, str], asyncio.Future[RateTable]] = {}
+        self.upstream_requests = 0
+        self._save_lock = threading.Lock()
+        self._save_task: asyncio.Task | None = None
+        self._cache_dirty = False
+        if cache_path:
+            self._load_cache()
+
+    async def aclose(self) -> None:
+        if self._save_task is not None:
+            await self._save_task
+        if self._httpx_client is not None and self._owns_httpx_client:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def get_rates(
+        self,
+        currency_from: str = 'USD',
+        currency_to: str = 'EUR',
+        date: str = 'latest',
+    ) -> dict[str, Any]:
+        """Returns rates in the shape of a Frankfurter response.
+
+        ``currency_to`` may list several comma-separated currencies.
+        """
+        currency_from = currency_from.upper()
+        table = self._cached_table(currency_from, currency_to, date)
+        if table is None:
+            key = (currency_from, date)
+            future = self._in_flight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._fetch(currency_from, date))
+                self._in_flight[key] = future
+                future.add_done_callback(
+                    lambda _: self._in_flight.pop(key, None)
+                )
+            table = await asyncio.shield(future)
+        return _response(table, currency_from, currency_to)
+
+    def get_rates_sync(
+        self,
+        currency_from: str = 'USD',
+        currency_to: str = 'EUR',
+        date: str = 'latest',
+    ) -> dict[str, Any]:
+        """Blocking variant of ``get_rates`` for synchronous callers.
+
+        It shares the cache but not the coalescing of ``get_rates``.
+        """
+        currency_from = currency_from.upper()
+        table = self._cached_table(currency_from, currency_to, date)
+        if table is None:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(timeout=self.timeout)
+            table = self._store(
+                currency_from,
+                date,
+                self._sync_client.get(
+                    f'{self.base_url}/{date}', params={'from': currency_from}
+                ),
+            )
+            if self.cache_path:
+                self._save_cache(self._cache_entries())
+        return _response(table, currency_from, currency_to)
+
+    def _cached_table(
+        self, currency_from: str, currency_to: str, date: str
+    ) -> RateTable | None:
+        """Finds a fresh table of ``date`` to answer a lookup from.
+
+        That is the table of ``currency_from`` itself or, for cross rates,
+        any table that contains every requested currency.
+        """
+        now = time.time()
+        table = self._tables.get((currency_from, date))
+        if table is not None and table.expires_at > now:
+            return table
+
+        currencies = {currency_from, *_split(currency_to)}
+        for (_, table_date), table in self._tables.items():
+            if (
+                table_date == date
+                and table.expires_at > now
+                and currencies <= table.rates.keys()
+            ):
+                return table
+        return None
+
+    async def _fetch(self, base: str, date: str) -> RateTable:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._httpx_client.get(
+            f'{self.base_url}/{date}', params={'from': base}
+        )
+        table = self._store(base, date, response)
+        if self.cache_path:
+            self._cache_dirty = True
+            if self._save_task is None or self._save_task.done():
+                self._save_task = asyncio.create_task(self._save_pending())
+        return table
+
+    def _store(
+        self, base: str, date: str, response: httpx.Response
+    ) -> RateTable:
+        self.upstream_requests += 1
+        if response.status_code == 404:
+            raise UnknownCurrencyError(f'Unknown currency {base}')
+        try:
+            response.raise_for_status()
+            data = response.json()
+            rates = {**data['rates'], base: 1.0}
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            raise ExchangeRateError(f'Exchange rate request failed: {e}') from e
+
+        table = RateTable(
+            base, data.get('date', date), rates, time.time() + self.ttl
+        )
+        self._tables[(base, date)] = table
+        self._evict_expired()
+        return table
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for key in [k for k, t in self._tables.items() if t.expires_at <= now]:
+            del self._tables[key]
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+            for entry in entries:
+                table = RateTable(**entry['table'])
+                self._tables[(table.base, entry['date'])] = table
+            self._evict_expired()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(
+                f'Ignoring unreadable exchange rate cache {self.cache_path}: '
+                f'{e}'
+            )
+
+    def _cache_entries(self) -> list[dict[str, Any]]:
+        return [
+            {'date': date, 'table': table._asdict()}
+            for (_, date), table in self._tables.items()
+        ]
+
+    async def _save_pending(self) -> None:
+        # Tables fetched while a write is running are saved by one more
+        # write once it finishes.
+        while self._cache_dirty:
+            self._cache_dirty = False
+            await asyncio.to_thread(self._save_cache, self._cache_entries())
+
+    def _save_cache(self, entries: list[dict[str, Any]]) -> None:
+        tmp_path = f'{self.cache_path}.tmp'
+        with self._save_lock:
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logger.warning(
+                    f'Failed to save exchange rate cache {self.cache_path}: {e}'
+                )
+
+
+def _split(currencies: str) -> list[str]:
+    return [c.strip().upper() for c in currencies.split(',') if c.strip()]
+
+
+def _response(
+    table: RateTable, currency_from: str, currency_to: str
+) -> dict[str, Any]:
+    unknown = [c for c in _split(currency_to) if c not in table.rates]
+    if unknown:
+        raise UnknownCurrencyError(f'Unknown currency {", ".join(unknown)}')
+    base_rate = table.rates[currency_from]
+    return {
+        'amount': 1.0,
+        'base': currency_from,
+        'date': table.date,
+        'rates': {
+            currency: table.rates[currency] / base_rate
+            for currency in _split(currency_to)
+        },
+    }
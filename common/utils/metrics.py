@@ -0,0 +1,250 @@
+"""A minimal metrics registry rendered in the Prometheus text format.
+
+Metrics are updated in place: a labelled metric creates one child per label
+combination on first use and reuses it afterwards, so recording a value does
+not allocate. Gauges and counters can also be read from a callback when the
+registry is rendered, which suits values the code already keeps track of,
+such as queue lengths.
+"""
+
+import bisect
+import math
+import threading
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency buckets in seconds, from sub-millisecond handlers to slow agents.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# A callback returns a single value, or a value per tuple of label values.
+MetricCallback = Callable[[], float | Mapping[tuple[str, ...], float]]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return f'{{{pairs}}}'
+
+
+class _Value:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket plus the +Inf bucket, not yet cumulative.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """Base class of the metric types.
+
+    Args:
+        name: Metric name, e.g. ``a2a_server_requests_total``.
+        documentation: Help text shown with the metric.
+        labelnames: Names of the labels; values are given to ``labels``.
+        callback: Reads the value(s) when the registry is rendered, instead
+            of the metric being updated in place.
+    """
+
+    type_name = ''
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: MetricCallback | None = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *labelvalues: str):
+        """Returns the child for a combination of label values."""
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(
+                    f'{self.name} expects labels {self.labelnames}, got '
+                    f'{labelvalues}'
+                )
+            with self._lock:
+                child = self._children.setdefault(
+                    labelvalues, self._new_child()
+                )
+        return child
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], float]]:
+        if self.callback is None:
+            for labelvalues, child in list(self._children.items()):
+                yield '', labelvalues, child.value
+            return
+
+        values = self.callback()
+        if not isinstance(values, Mapping):
+            values = {(): values}
+        for labelvalues, value in values.items():
+            yield '', labelvalues, value
+
+    def render(self) -> str:
+        lines = [
+            f'# HELP {self.name} {_escape(self.documentation)}',
+            f'# TYPE {self.name} {self.type_name}',
+        ]
+        for suffix, labelvalues, value in self._samples():
+            names = self.labelnames
+            if suffix == '_bucket':
+                names = (*names, 'le')
+            labels = _format_labels(names, labelvalues)
+            lines.append(f'{self.name}{suffix}{labels} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """A value that only goes up, such as a number of requests."""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    """A value that goes up and down, such as a queue length."""
+
+    type_name = 'gauge'
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    """Counts observations, such as latencies, in cumulative buckets."""
+
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], float]]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for labelvalues, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, list(child.counts)):
+                cumulative += count
+                yield '_bucket', (*labelvalues, bound), cumulative
+            yield '_sum', labelvalues, child.sum
+            yield '_count', labelvalues, cumulative
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together, e.g. for a ``/metrics`` route."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, **kwargs) -> Counter:
+        return self.register(Counter(name, documentation, **kwargs))
+
+    def gauge(self, name: str, documentation: str, **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, **kwargs))
+
+    def histogram(self, name: str, documentation: str, **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, **kwargs))
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        return ''.join(
+            f'{metric.render()}\n' for metric in self._metrics.values()
+        )
+
+
+# Process-wide registry for metrics not tied to one server, such as those of
+# A2AClient and push-notification delivery.
+REGISTRY = MetricsRegistry()
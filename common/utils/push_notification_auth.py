@@ -1,9 +1,12 @@
+import asyncio
 import hashlib
 import json
 import logging
+import random
 import time
 import uuid
 
+from collections import OrderedDict
 from typing import Any
 
 import httpx
@@ -14,31 +17,64 @@ from jwt import PyJWK, PyJWKClient
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from common.server.profiling import phase
+from common.utils.metrics import REGISTRY
+
 
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = 'Bearer '
+# Key parameters for each supported signing algorithm. ES256 and EdDSA sign
+# and verify considerably faster than RS256.
+SIGNING_KEY_PARAMS = {
+    'RS256': {'kty': 'RSA', 'size': 2048},
+    'ES256': {'kty': 'EC', 'crv': 'P-256'},
+    'EdDSA': {'kty': 'OKP', 'crv': 'Ed25519'},
+}
+SUPPORTED_ALGORITHMS = list(SIGNING_KEY_PARAMS)
 
+DELIVERY_DURATION = REGISTRY.histogram(
+    'a2a_push_notification_duration_seconds',
+    'Time taken by each push-notification delivery attempt.',
+)
+DELIVERY_FAILURES = REGISTRY.counter(
+    'a2a_push_notification_failures_total',
+    'Push notifications given up after failing to be delivered.',
+)
+# Push-notifications older than this are rejected to prevent replay attacks.
+MAX_TOKEN_AGE = 60 * 5
+# A token signed for a body is reused for identical bodies (e.g. delivery
+# retries) for at most this long, well inside MAX_TOKEN_AGE.
+TOKEN_REUSE_SECONDS = 60
 
-class PushNotificationAuth:
-    def _calculate_request_body_sha256(self, data: dict[str, Any]):
-        """Calculates the SHA256 hash of a request body.
 
-        This logic needs to be same for both the agent who signs the payload and the client verifier.
-        """
-        body_str = json.dumps(
+class PushNotificationAuth:
+    def _serialize_request_body(self, data: dict[str, Any]) -> bytes:
+        """Serializes a request body to the canonical bytes that are signed."""
+        return json.dumps(
             data,
             ensure_ascii=False,
             allow_nan=False,
             indent=None,
             separators=(',', ':'),
-        )
-        return hashlib.sha256(body_str.encode()).hexdigest()
+        ).encode()
+
+    def _calculate_request_body_sha256(self, data: dict[str, Any]):
+        """Calculates the SHA256 hash of a request body.
+
+        This logic needs to be same for both the agent who signs the payload and the client verifier.
+        """
+        return hashlib.sha256(self._serialize_request_body(data)).hexdigest()
 
 
 class PushNotificationSenderAuth(PushNotificationAuth):
-    def __init__(self):
+    def __init__(self, token_cache_size: int = 1024):
         self.public_keys = []
         self.private_key_jwk: PyJWK = None
+        self.algorithm = 'RS256'
+        self.dispatcher: PushNotificationDispatcher | None = None
+        self.token_cache_size = token_cache_size
+        # body digest -> (token, iat)
+        self._token_cache: OrderedDict[str, tuple[str, int]] = OrderedDict()
 
     @staticmethod
     async def verify_push_notification_url(url: str) -> bool:
@@ -62,12 +98,22 @@ class PushNotificationSenderAuth(PushNotificationAuth):
 
         return False
 
-    def generate_jwk(self):
+    def generate_jwk(self, algorithm: str = 'RS256'):
+        """Generates the signing key, one of SUPPORTED_ALGORITHMS."""
+        if algorithm not in SIGNING_KEY_PARAMS:
+            raise ValueError(f'Unsupported signing algorithm: {algorithm}')
         key = jwk.JWK.generate(
-            kty='RSA', size=2048, kid=str(uuid.uuid4()), use='sig'
+            **SIGNING_KEY_PARAMS[algorithm],
+            kid=str(uuid.uuid4()),
+            use='sig',
+            alg=algorithm,
         )
         self.public_keys.append(key.export_public(as_dict=True))
-        self.private_key_jwk = PyJWK.from_json(key.export_private())
+        self.private_key_jwk = PyJWK.from_json(
+            key.export_private(), algorithm=algorithm
+        )
+        self.algorithm = algorithm
+        self._token_cache.clear()
 
     def handle_jwks_endpoint(self, _request: Request):
         """Allow clients to fetch public keys."""
@@ -79,68 +125,318 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         Payload is signed with private key and it ensures the integrity of payload for client.
         Including iat prevents from replay attack.
         """
-        iat = int(time.time())
-
-        return jwt.encode(
-            {
-                'iat': iat,
-                'request_body_sha256': self._calculate_request_body_sha256(
-                    data
-                ),
-            },
+        return self._get_jwt(self._calculate_request_body_sha256(data))
+
+    def _get_jwt(self, body_sha256: str) -> str:
+        """Returns a token for the body digest, reusing a recent one if any."""
+        now = int(time.time())
+        cached = self._token_cache.get(body_sha256)
+        if cached is not None and now - cached[1] < TOKEN_REUSE_SECONDS:
+            self._token_cache.move_to_end(body_sha256)
+            return cached[0]
+
+        token = jwt.encode(
+            {'iat': now, 'request_body_sha256': body_sha256},
             key=self.private_key_jwk,
             headers={'kid': self.private_key_jwk.key_id},
-            algorithm='RS256',
+            algorithm=self.algorithm,
         )
+        self._token_cache[body_sha256] = (token, now)
+        self._token_cache.move_to_end(body_sha256)
+        while len(self._token_cache) > self.token_cache_size:
+            self._token_cache.popitem(last=False)
+        return token
 
     async def send_push_notification(self, url: str, data: dict[str, Any]):
-        jwt_token = self._generate_jwt(data)
-        headers = {'Authorization': f'Bearer {jwt_token}'}
         async with httpx.AsyncClient(timeout=10) as client:
             try:
-                response = await client.post(url, json=data, headers=headers)
-                response.raise_for_status()
+                await self._post_notification(client, url, data)
                 logger.info(f'Push-notification sent for URL: {url}')
             except Exception as e:
+                DELIVERY_FAILURES.inc()
                 logger.warning(
                     f'Error during sending push-notification for URL {url}: {e}'
                 )
 
+    def enqueue_push_notification(
+        self, url: str, data: dict[str, Any], key: str | None = None
+    ) -> bool:
+        """Queues a notification for background delivery without waiting.
+
+        Uses a PushNotificationDispatcher created on first use. Pass the task
+        id as ``key`` so a queued update is replaced by a newer one for the
+        same task. Returns False if the notification was dropped.
+        """
+        if self.dispatcher is None:
+            self.dispatcher = PushNotificationDispatcher(self)
+        return self.dispatcher.submit(url, data, key)
+
+    async def aclose(self, drain_timeout: float | None = 5.0):
+        """Stops background delivery, e.g. on server shutdown.
+
+        Notifications still queued get up to ``drain_timeout`` seconds to
+        be delivered before the dispatcher's workers are cancelled.
+        """
+        if self.dispatcher is None:
+            return
+        try:
+            await asyncio.wait_for(self.dispatcher.drain(), drain_timeout)
+        except TimeoutError:
+            logger.warning('Push-notifications still queued at shutdown')
+        await self.dispatcher.aclose()
+
+    async def _post_notification(
+        self, client: httpx.AsyncClient, url: str, data: dict[str, Any]
+    ):
+        # Serialize once so the signed digest covers the exact bytes sent.
+        body = self._serialize_request_body(data)
+        jwt_token = self._get_jwt(hashlib.sha256(body).hexdigest())
+        headers = {
+            'Authorization': f'Bearer {jwt_token}',
+            'Content-Type': 'application/json',
+        }
+        started = time.perf_counter()
+        try:
+            with phase('push_notification'):
+                response = await client.post(url, content=body, headers=headers)
+        finally:
+            DELIVERY_DURATION.observe(time.perf_counter() - started)
+        response.raise_for_status()
+
+
+class PushNotificationDispatcher:
+    """Delivers push notifications from background workers.
+
+    Notifications queued with ``submit`` are signed and sent by a pool of
+    worker tasks sharing one connection pool, so a slow webhook never stalls
+    the agent. While a notification for a key is still queued, a newer one
+    for the same key replaces it, and deliveries for one key never overlap,
+    so receivers see updates in order. Transport errors, 429 and 5xx
+    responses are retried with jittered exponential backoff.
+
+    Args:
+        sender_auth: Signs the notifications.
+        max_pending: Maximum number of queued notifications. New keys are
+            dropped while the queue is full.
+        workers: Maximum number of deliveries in flight overall.
+        per_destination: Maximum number of deliveries in flight per host.
+        max_attempts: Delivery attempts before a notification is given up.
+        backoff_base: Delay in seconds before the first retry.
+        backoff_max: Upper bound in seconds for the retry delay.
+        timeout: Timeout in seconds for each delivery attempt.
+        httpx_client: Client to deliver with instead of an owned pool.
+    """
+
+    def __init__(
+        self,
+        sender_auth: PushNotificationSenderAuth,
+        max_pending: int = 1000,
+        workers: int = 16,
+        per_destination: int = 4,
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        timeout: float = 10.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        self.sender_auth = sender_auth
+        self.max_pending = max_pending
+        self.workers = workers
+        self.per_destination = per_destination
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._httpx_client = httpx_client
+        self._owns_httpx_client = httpx_client is None
+
+        # key -> latest (url, data) waiting to be delivered
+        self._pending: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._in_flight: set[str] = set()
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._destination_limits: dict[str, asyncio.Semaphore] = {}
+        self._worker_tasks: list[asyncio.Task] = []
+
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def submit(
+        self, url: str, data: dict[str, Any], key: str | None = None
+    ) -> bool:
+        if key is None:
+            key = uuid.uuid4().hex
+
+        if key in self._pending:
+            self._pending[key] = (url, data)
+            self.coalesced += 1
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f'Push-notification queue full, dropping {key}')
+            return False
+
+        self._pending[key] = (url, data)
+        if key not in self._in_flight:
+            self._queue.put_nowait(key)
+        self._ensure_workers()
+        return True
+
+    async def drain(self):
+        """Waits until every queued notification has been handled."""
+        await self._queue.join()
+
+    async def aclose(self):
+        for worker in self._worker_tasks:
+            worker.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._owns_httpx_client and self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+    def _ensure_workers(self):
+        if self._worker_tasks:
+            return
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.workers),
+            )
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def _worker(self):
+        while True:
+            key = await self._queue.get()
+            url, data = self._pending.pop(key)
+            self._in_flight.add(key)
+            try:
+                await self._deliver(key, url, data)
+            except Exception as e:
+                logger.error(f'Unexpected push-notification error: {e}')
+            finally:
+                self._in_flight.discard(key)
+                # A newer update arrived while this one was being delivered.
+                if key in self._pending:
+                    self._queue.put_nowait(key)
+                self._queue.task_done()
+
+    async def _deliver(self, key: str, url: str, data: dict[str, Any]):
+        host = httpx.URL(url).host
+        limit = self._destination_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_destination)
+            self._destination_limits[host] = limit
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                async with limit:
+                    await self.sender_auth._post_notification(
+                        self._httpx_client, url, data
+                    )
+                self.delivered += 1
+                logger.info(f'Push-notification sent for URL: {url}')
+                return
+            except Exception as e:
+                if attempt == self.max_attempts or not self._is_retryable(e):
+                    self.failed += 1
+                    DELIVERY_FAILURES.inc()
+                    logger.warning(
+                        f'Error during sending push-notification for URL '
+                        f'{url} after {attempt} attempts: {e}'
+                    )
+                    return
+
+            delay = min(
+                self.backoff_max, self.backoff_base * 2 ** (attempt - 1)
+            )
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            if key in self._pending:
+                # Superseded while backing off; the newer update goes next.
+                self.coalesced += 1
+                return
+            self.retried += 1
+
+    @staticmethod
+    def _is_retryable(e: Exception) -> bool:
+        if isinstance(e, httpx.HTTPStatusError):
+            status_code = e.response.status_code
+            return status_code == 429 or status_code >= 500
+        return isinstance(e, httpx.TransportError)
+
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
-    def __init__(self):
+    def __init__(self, verified_token_cache_size: int = 1024):
         self.public_keys_jwks = []
         self.jwks_client = None
+        self.verified_token_cache_size = verified_token_cache_size
+        # kid -> signing key, so the JWKS is not searched per request.
+        self._signing_keys: dict[str, PyJWK] = {}
+        # token -> claims of tokens whose signature was already verified.
+        self._verified_tokens: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
     async def load_jwks(self, jwks_url: str):
         self.jwks_client = PyJWKClient(jwks_url)
+        self._signing_keys.clear()
+        self._verified_tokens.clear()
 
-    async def verify_push_notification(self, request: Request) -> bool:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
-            print('Invalid authorization header')
-            return False
+    def _get_signing_key(self, token: str) -> PyJWK:
+        kid = jwt.get_unverified_header(token).get('kid')
+        signing_key = self._signing_keys.get(kid)
+        if signing_key is None:
+            # Unknown kids (e.g. after key rotation) refresh the JWKS.
+            signing_key = self.jwks_client.get_signing_key(kid)
+            self._signing_keys[kid] = signing_key
+        return signing_key
 
-        token = auth_header[len(AUTH_HEADER_PREFIX) :]
-        signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+    def _decode_token(self, token: str) -> dict[str, Any]:
+        """Verifies the token signature, caching the claims of valid tokens."""
+        claims = self._verified_tokens.get(token)
+        if claims is not None:
+            self._verified_tokens.move_to_end(token)
+            return claims
 
-        decode_token = jwt.decode(
+        claims = jwt.decode(
             token,
-            signing_key,
+            self._get_signing_key(token),
             options={'require': ['iat', 'request_body_sha256']},
-            algorithms=['RS256'],
+            algorithms=SUPPORTED_ALGORITHMS,
         )
+        self._verified_tokens[token] = claims
+        while len(self._verified_tokens) > self.verified_token_cache_size:
+            self._verified_tokens.popitem(last=False)
+        return claims
 
-        actual_body_sha256 = self._calculate_request_body_sha256(
-            await request.json()
-        )
-        if actual_body_sha256 != decode_token['request_body_sha256']:
-            # Payload signature does not match the digest in signed token.
-            raise ValueError('Invalid request body')
+    async def verify_push_notification(self, request: Request) -> bool:
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
+            logger.warning('Invalid authorization header')
+            return False
+
+        token = auth_header[len(AUTH_HEADER_PREFIX) :]
+        decode_token = self._decode_token(token)
 
-        if time.time() - decode_token['iat'] > 60 * 5:
+        if time.time() - decode_token['iat'] > MAX_TOKEN_AGE:
             # Do not allow push-notifications older than 5 minutes.
             # This is to prevent replay attack.
+            self._verified_tokens.pop(token, None)
             raise ValueError('Token is expired')
 
+        body = await request.body()
+        expected_sha256 = decode_token['request_body_sha256']
+        if hashlib.sha256(body).hexdigest() != expected_sha256:
+            # Senders that re-serialize the body after signing only match
+            # on the canonical form.
+            actual_body_sha256 = self._calculate_request_body_sha256(
+                json.loads(body)
+            )
+            if actual_body_sha256 != expected_sha256:
+                # Payload signature does not match the digest in signed token.
+                raise ValueError('Invalid request body')
+
         return True
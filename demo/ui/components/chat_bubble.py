@@ -47,7 +47,9 @@ def chat_box(
             style=me.Style(display='flex', flex_direction='column', gap=5)
         ):
             if media_type == 'image/png':
-                if '/message/file' not in content:
+                if '/message/file' not in content and not content.startswith(
+                    ('http://', 'https://')
+                ):
                     content = 'data:image/png;base64,' + content
                 me.image(
                     src=content,
@@ -1,10 +1,13 @@
 import base64
 import datetime
 import json
+import logging
 import os
 import uuid
 
+from common.client import ArtifactAssembler
 from common.types import (
+    A2AClientArtifactTooLargeError,
     AgentCard,
     DataPart,
     FileContent,
@@ -34,6 +37,9 @@ from service.types import Conversation, Event
 from utils.agent_card import get_agent_card
 
 
+logger = logging.getLogger(__name__)
+
+
 class ADKHostManager(ApplicationManager):
     """An implementation of memory based management with fake agent actions
 
@@ -57,7 +63,7 @@ class ADKHostManager(ApplicationManager):
         self._events = {}
         self._pending_message_ids = []
         self._agents = []
-        self._artifact_chunks = {}
+        self._artifact_assembler = ArtifactAssembler()
         self._session_service = InMemorySessionService()
         self._artifact_service = InMemoryArtifactService()
         self._memory_service = InMemoryMemoryService()
@@ -370,32 +376,15 @@ class ADKHostManager(ApplicationManager):
     def process_artifact_event(
         self, current_task: Task, task_update_event: TaskArtifactUpdateEvent
     ):
-        artifact = task_update_event.artifact
-        if not artifact.append:
-            # received the first chunk or entire payload for an artifact
-            if artifact.lastChunk is None or artifact.lastChunk:
-                # lastChunk bit is missing or is set to true, so this is the entire payload
-                # add this to artifacts
-                if not current_task.artifacts:
-                    current_task.artifacts = []
-                current_task.artifacts.append(artifact)
-            else:
-                # this is a chunk of an artifact, stash it in temp store for assembling
-                if task_update_event.id not in self._artifact_chunks:
-                    self._artifact_chunks[task_update_event.id] = {}
-                self._artifact_chunks[task_update_event.id][artifact.index] = (
-                    artifact
-                )
-        else:
-            # we received an append chunk, add to the existing temp artifact
-            current_temp_artifact = self._artifact_chunks[task_update_event.id][
-                artifact.index
-            ]
-            # TODO handle if current_temp_artifact is missing
-            current_temp_artifact.parts.extend(artifact.parts)
-            if artifact.lastChunk:
-                current_task.artifacts.append(current_temp_artifact)
-                del self._artifact_chunks[task_update_event.id][artifact.index]
+        try:
+            artifact = self._artifact_assembler.add(task_update_event)
+        except A2AClientArtifactTooLargeError as e:
+            logger.warning(f'Dropping artifact: {e}')
+            return
+        if artifact is not None:
+            if not current_task.artifacts:
+                current_task.artifacts = []
+            current_task.artifacts.append(artifact)
 
     def add_event(self, event: Event):
         self._events[event.id] = event
@@ -568,19 +557,24 @@ class ADKHostManager(ApplicationManager):
                             app_name=self.app_name,
                             filename=p.data['artifact-file-id'],
                         )
-                        file_data = file_part.inline_data
-                        base64_data = base64.b64encode(file_data.data).decode(
-                            'utf-8'
-                        )
-                        parts.append(
-                            FilePart(
-                                file=FileContent(
-                                    bytes=base64_data,
-                                    mimeType=file_data.mime_type,
-                                    name='artifact_file',
-                                )
+                        if file_part.file_data is not None:
+                            # Blob-backed files are passed on by reference.
+                            file_data = file_part.file_data
+                            file_content = FileContent(
+                                uri=file_data.file_uri,
+                                mimeType=file_data.mime_type,
+                                name='artifact_file',
                             )
-                        )
+                        else:
+                            file_data = file_part.inline_data
+                            file_content = FileContent(
+                                bytes=base64.b64encode(file_data.data).decode(
+                                    'utf-8'
+                                ),
+                                mimeType=file_data.mime_type,
+                                name='artifact_file',
+                            )
+                        parts.append(FilePart(file=file_content))
                     else:
                         parts.append(DataPart(data=p.data))
                 else:
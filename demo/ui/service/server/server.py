@@ -123,7 +123,8 @@ class ConversationServer:
                 continue
             new_parts = []
             for i, part in enumerate(m.parts):
-                if part.type != 'file':
+                if part.type != 'file' or not part.file.bytes:
+                    # Parts referencing a uri are already served elsewhere.
                     new_parts.append(part)
                     continue
                 message_part_id = f'{message_id}:{i}'
@@ -1,6 +1,18 @@
 import unittest
 
-from common.types import DataPart, FilePart, TextPart
+from unittest import mock
+
+from common.client import ArtifactAssembler
+from common.types import (
+    Artifact,
+    DataPart,
+    FilePart,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
 from google.genai import types
 from service.server.adk_host_manager import ADKHostManager
 
@@ -115,6 +127,30 @@ class ADKHostManagerTest(unittest.TestCase):
             message.metadata['conversation_id'], self.conversation_id
         )
 
+    def test_adk_content_to_message_function_response_file_uri(self):
+        """Test that a blob-backed artifact file is passed on by uri."""
+        artifact = types.Part(
+            file_data=types.FileData(
+                file_uri='http://agent/blobs/abc', mime_type='image/png'
+            )
+        )
+        part = types.Part()
+        part.function_response = types.FunctionResponse(
+            name='send_task',
+            response={'result': [DataPart(data={'artifact-file-id': 'img'})]},
+        )
+        content = types.Content(parts=[part], role='model')
+        self.manager._artifact_service = mock.Mock()
+        self.manager._artifact_service.load_artifact.return_value = artifact
+        message = self.manager.adk_content_to_message(
+            content, self.conversation_id
+        )
+        self.assertEqual(len(message.parts), 1)
+        self.assertIsInstance(message.parts[0], FilePart)
+        self.assertEqual(message.parts[0].file.uri, 'http://agent/blobs/abc')
+        self.assertEqual(message.parts[0].file.mimeType, 'image/png')
+        self.assertIsNone(message.parts[0].file.bytes)
+
     def test_adk_content_to_message_empty_parts(self):
         """Test converting ADK content with empty parts to message."""
         content = types.Content(parts=[], role='user')
@@ -198,6 +234,34 @@ class ADKHostManagerTest(unittest.TestCase):
             message.parts[2], DataPart, 'Third part should be DataPart'
         )
 
+    def test_process_artifact_event_drops_oversized_artifact(self):
+        """An artifact over the assembler's limit is dropped, not raised."""
+        self.manager._artifact_assembler = ArtifactAssembler(
+            max_artifact_size=10
+        )
+        task = Task(
+            id='task',
+            sessionId=self.conversation_id,
+            status=TaskStatus(state=TaskState.WORKING),
+        )
+        first, last = (
+            TaskArtifactUpdateEvent(
+                id='task',
+                artifact=Artifact(
+                    parts=[TextPart(text='x' * 8)],
+                    append=True,
+                    lastChunk=last_chunk,
+                ),
+            )
+            for last_chunk in (False, True)
+        )
+        self.manager.process_artifact_event(task, first)
+        with self.assertLogs('service.server.adk_host_manager', 'WARNING'):
+            self.manager.process_artifact_event(task, last)
+
+        self.assertFalse(task.artifacts)
+        self.assertEqual(self.manager._artifact_assembler.pending, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,7 @@ import base64
 import json
 import uuid
 
-from common.client import A2ACardResolver
+from common.client import resolve_agent_cards
 from common.types import (
     AgentCard,
     DataPart,
@@ -33,13 +33,20 @@ class HostAgent:
         self,
         remote_agent_addresses: list[str],
         task_callback: TaskUpdateCallback | None = None,
+        card_cache_path: str | None = None,
     ):
         self.task_callback = task_callback
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
-        for address in remote_agent_addresses:
-            card_resolver = A2ACardResolver(address)
-            card = card_resolver.get_agent_card()
+        # Fetch all the remote agent cards concurrently.
+        cards = (
+            resolve_agent_cards(
+                remote_agent_addresses, cache_path=card_cache_path
+            )
+            if remote_agent_addresses
+            else []
+        )
+        for card in cards:
             remote_connection = RemoteAgentConnections(card)
             self.remote_agent_connections[card.name] = remote_connection
             self.cards[card.name] = card
@@ -228,12 +235,20 @@ def convert_part(part: Part, tool_context: ToolContext):
         # Repackage A2A FilePart to google.genai Blob
         # Currently not considering plain text as files
         file_id = part.file.name
-        file_bytes = base64.b64decode(part.file.bytes)
-        file_part = types.Part(
-            inline_data=types.Blob(
-                mime_type=part.file.mimeType, data=file_bytes
+        if part.file.uri:
+            # Payloads served from a blob store are passed on by reference.
+            file_part = types.Part(
+                file_data=types.FileData(
+                    file_uri=part.file.uri, mime_type=part.file.mimeType
+                )
+            )
+        else:
+            file_bytes = base64.b64decode(part.file.bytes)
+            file_part = types.Part(
+                inline_data=types.Blob(
+                    mime_type=part.file.mimeType, data=file_bytes
+                )
             )
-        )
         tool_context.save_artifact(file_id, file_part)
         tool_context.actions.skip_summarization = True
         tool_context.actions.escalate = True
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+import httpx
+
+from benchmarks.echo_agent import create_echo_server
+from common.server import AdmissionController, AdmissionRejected
+from common.types import SendTaskRequest, ServerBusyError, TaskSendParams
+
+
+class AdmissionControllerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for concurrency limits and load shedding."""
+
+    async def test_per_session_limit_does_not_block_others(self):
+        """A session at its limit waits while other sessions run."""
+        controller = AdmissionController(max_concurrent=3, max_per_session=1)
+        first = await controller.acquire('heavy')
+        waiting = asyncio.create_task(controller.acquire('heavy'))
+        await asyncio.sleep(0)
+        light = await controller.acquire('light')
+
+        self.assertEqual(controller.stats()['queued'], 1)
+        first.release()
+        second = await waiting
+        self.assertEqual(controller.active, 2)
+        second.release()
+        light.release()
+        self.assertEqual(controller.active, 0)
+
+    async def test_sheds_when_queue_is_full(self):
+        """Requests beyond the wait queue are rejected with a retry hint."""
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        permit = await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        with self.assertRaises(AdmissionRejected) as cm:
+            await controller.acquire()
+        self.assertEqual(cm.exception.retry_after_header, '2')
+        self.assertEqual(controller.shed, 1)
+        permit.release()
+        (await waiting).release()
+
+    async def test_times_out_in_queue(self):
+        """A request that cannot be admitted before max_wait is shed."""
+        controller = AdmissionController(max_concurrent=1, max_wait=0.01)
+        controller._service_time = 0.001
+        permit = await controller.acquire()
+
+        with self.assertRaises(AdmissionRejected):
+            await controller.acquire()
+        self.assertEqual(controller.timed_out, 1)
+        self.assertEqual(controller.queued, 0)
+        permit.release()
+
+
+class A2AServerAdmissionTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for load shedding in A2AServer."""
+
+    async def test_busy_server_returns_retry_after(self):
+        """A shed request gets a busy error, HTTP 503 and Retry-After."""
+        server = create_echo_server(port=5000)
+        server.admission_controller = AdmissionController(
+            max_concurrent=1, max_queue=0
+        )
+        permit = await server.admission_controller.acquire()
+        request = SendTaskRequest(
+            id=1,
+            params=TaskSendParams(
+                id='task',
+                message={
+                    'role': 'user',
+                    'parts': [{'type': 'text', 'text': 'hi'}],
+                },
+            ),
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://testserver',
+        ) as client:
+            response = await client.post('/', content=request.model_dump_json())
+        permit.release()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        body = response.json()
+        self.assertEqual(body['id'], 1)
+        self.assertEqual(body['error']['code'], ServerBusyError().code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import base64
+import random
+import unittest
+
+from common.client import ArtifactAssembler
+from common.server.artifact_chunker import TextArtifactStream, chunk_artifact
+from common.types import (
+    A2AClientArtifactTooLargeError,
+    Artifact,
+    DataPart,
+    FileContent,
+    FilePart,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+
+
+def large_artifact() -> Artifact:
+    data = base64.b64encode(bytes(range(256)) * 40).decode()
+    return Artifact(
+        name='report',
+        metadata={'source': 'test'},
+        parts=[
+            TextPart(text='x' * 2500),
+            DataPart(data={'rows': 3}),
+            FilePart(file=FileContent(name='blob.bin', bytes=data)),
+        ],
+        index=2,
+    )
+
+
+def events(chunks: list[Artifact]) -> list[TaskArtifactUpdateEvent]:
+    return [TaskArtifactUpdateEvent(id='task', artifact=c) for c in chunks]
+
+
+class ArtifactChunkingTest(unittest.TestCase):
+    """Tests for chunking artifacts and reassembling them."""
+
+    def test_small_artifact_is_not_chunked(self):
+        """An artifact within the limit is sent as is."""
+        artifact = Artifact(parts=[TextPart(text='hi')])
+        self.assertEqual(chunk_artifact(artifact, 1024), [artifact])
+
+    def test_chunks_are_bounded(self):
+        """Every chunk stays within the limit and only the last is final."""
+        chunks = chunk_artifact(large_artifact(), 1000)
+        self.assertGreater(len(chunks), 10)
+        for chunk in chunks:
+            size = sum(
+                len(p.text) if isinstance(p, TextPart) else len(p.file.bytes)
+                for p in chunk.parts
+                if not isinstance(p, DataPart)
+            )
+            self.assertLessEqual(size, 1000)
+        self.assertFalse(chunks[0].append)
+        self.assertTrue(all(chunk.append for chunk in chunks[1:]))
+        self.assertEqual([chunk.lastChunk for chunk in chunks].count(True), 1)
+        self.assertTrue(chunks[-1].lastChunk)
+
+    def test_round_trip_out_of_order(self):
+        """Shuffled and duplicated chunks reassemble into the original."""
+        artifact = large_artifact()
+        chunk_events = events(chunk_artifact(artifact, 1000))
+        chunk_events += chunk_events[:3]
+        random.Random(7).shuffle(chunk_events)
+
+        assembler = ArtifactAssembler()
+        results = [assembler.add(event) for event in chunk_events]
+        assembled = [result for result in results if result is not None]
+
+        self.assertEqual(len(assembled), 1)
+        self.assertEqual(assembled[0], artifact)
+        self.assertEqual(assembler.pending, 0)
+
+    def test_unindexed_append_chunks(self):
+        """Plain append/lastChunk chunks are assembled in arrival order."""
+        assembler = ArtifactAssembler()
+        chunks = [
+            Artifact(parts=[TextPart(text='a')], lastChunk=False),
+            Artifact(parts=[TextPart(text='b')], append=True),
+            Artifact(parts=[TextPart(text='c')], append=True, lastChunk=True),
+        ]
+        results = [assembler.add(event) for event in events(chunks)]
+
+        self.assertEqual(results[:2], [None, None])
+        self.assertEqual([p.text for p in results[2].parts], ['a', 'b', 'c'])
+
+    def test_size_limit(self):
+        """An artifact over the memory cap is dropped with an error."""
+        assembler = ArtifactAssembler(max_artifact_size=2000)
+        with self.assertRaises(A2AClientArtifactTooLargeError):
+            for event in events(chunk_artifact(large_artifact(), 1000)):
+                assembler.add(event)
+        self.assertEqual(assembler.pending, 0)
+
+
+class TextArtifactStreamTest(unittest.TestCase):
+    """Tests for streaming a text artifact piece by piece."""
+
+    def assemble(self, chunks: list[Artifact]) -> list[Artifact]:
+        assembler = ArtifactAssembler()
+        results = [assembler.add(event) for event in events(chunks)]
+        return [result for result in results if result is not None]
+
+    def test_pieces_join_into_one_part(self):
+        """Streamed pieces and the missing tail assemble into one part."""
+        stream = TextArtifactStream(name='answer', flush_interval=0)
+        chunks = [stream.append('1 USD '), stream.append('is ')]
+        chunks.append(stream.finish('1 USD is 0.9 EUR'))
+
+        self.assertEqual(chunks[-1].parts[0].text, '0.9 EUR')
+        self.assertEqual([c.append for c in chunks], [False, True, True])
+        (artifact,) = self.assemble(chunks)
+        self.assertEqual(artifact.name, 'answer')
+        self.assertEqual([p.text for p in artifact.parts], ['1 USD is 0.9 EUR'])
+
+    def test_diverging_final_text_replaces_the_stream(self):
+        """A final text that does not continue the stream replaces it."""
+        stream = TextArtifactStream(flush_interval=0)
+        chunks = [stream.append('Let me '), stream.append('check.')]
+        chunks.append(stream.finish('1 USD is 0.9 EUR'))
+
+        self.assertFalse(chunks[-1].append)
+        (artifact,) = self.assemble(chunks)
+        self.assertEqual([p.text for p in artifact.parts], ['1 USD is 0.9 EUR'])
+
+    def test_pieces_are_batched(self):
+        """Appended text is held until flush_size characters are waiting."""
+        stream = TextArtifactStream(flush_interval=60, flush_size=8)
+        self.assertIsNone(stream.append('1 USD '))
+        chunks = [stream.append('is '), stream.finish('1 USD is 0.9 EUR')]
+
+        self.assertEqual(chunks[0].parts[0].text, '1 USD is ')
+        self.assertEqual(chunks[1].parts[0].text, '0.9 EUR')
+        (artifact,) = self.assemble(chunks)
+        self.assertEqual([p.text for p in artifact.parts], ['1 USD is 0.9 EUR'])
+
+    def test_empty_finish_sends_nothing_if_nothing_was_sent(self):
+        """Withdrawing text that never left the buffer sends no chunk."""
+        stream = TextArtifactStream(flush_interval=60)
+        self.assertIsNone(stream.append('Which currency?'))
+
+        self.assertIsNone(stream.finish(''))
+        self.assertFalse(stream.started)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import base64
+import hashlib
+import tempfile
+import unittest
+
+import httpx
+
+from benchmarks.echo_agent import create_echo_server
+from common.server import BlobStore
+from common.types import FileContent, FilePart
+
+
+class BlobStoreTest(unittest.TestCase):
+    """Tests for storing blobs and moving FilePart payloads into the store."""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = BlobStore(
+            self.tmp_dir.name, base_url='http://agent/blobs/'
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_put_deduplicates_by_content(self):
+        digest = self.store.put(b'payload')
+        self.assertEqual(digest, hashlib.sha256(b'payload').hexdigest())
+        self.assertEqual(self.store.put(b'payload'), digest)
+        self.assertEqual(self.store.path(digest).read_bytes(), b'payload')
+        self.assertEqual(
+            len(list(self.store.root.glob('*/*'))),
+            1,
+        )
+
+    def test_rejects_invalid_digest(self):
+        with self.assertRaises(ValueError):
+            self.store.path('../../etc/passwd')
+        self.assertNotIn('../../etc/passwd', self.store)
+
+    def test_to_uri_part_replaces_inline_bytes(self):
+        part = FilePart(
+            file=FileContent(
+                bytes=base64.b64encode(b'image').decode(),
+                mimeType='image/png',
+                name='image.png',
+            )
+        )
+        uri_part = self.store.to_uri_part(part)
+        digest = hashlib.sha256(b'image').hexdigest()
+        self.assertIsNone(uri_part.file.bytes)
+        self.assertEqual(uri_part.file.uri, f'http://agent/blobs/{digest}')
+        self.assertEqual(uri_part.file.mimeType, 'image/png')
+        self.assertIn(digest, self.store)
+
+
+class BlobEndpointTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for downloading blobs from A2AServer."""
+
+    async def asyncSetUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = BlobStore(self.tmp_dir.name)
+        self.digest = self.store.put(bytes(range(256)))
+        server = create_echo_server(port=5000, blob_store=self.store)
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://testserver',
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+        self.tmp_dir.cleanup()
+
+    async def test_download_with_etag(self):
+        response = await self.client.get(f'/blobs/{self.digest}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, bytes(range(256)))
+        self.assertEqual(response.headers['etag'], f'"{self.digest}"')
+
+        response = await self.client.get(
+            f'/blobs/{self.digest}',
+            headers={'If-None-Match': f'"{self.digest}"'},
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    async def test_range_request(self):
+        response = await self.client.get(
+            f'/blobs/{self.digest}', headers={'Range': 'bytes=10-19'}
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, bytes(range(10, 20)))
+        self.assertEqual(response.headers['content-range'], 'bytes 10-19/256')
+
+    async def test_unknown_blob(self):
+        response = await self.client.get(f'/blobs/{"0" * 64}')
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.get('/blobs/not-a-digest')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
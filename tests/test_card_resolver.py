@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from common.client import AsyncA2ACardResolver, resolve_agent_cards
+from common.types import AgentCapabilities, AgentCard
+
+
+def agent_card(name: str) -> dict:
+    return AgentCard(
+        name=name,
+        url=f'http://{name}/',
+        version='1.0.0',
+        capabilities=AgentCapabilities(),
+        skills=[],
+    ).model_dump(mode='json', exclude_none=True)
+
+
+class AsyncA2ACardResolverTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for concurrent, cached agent card resolution."""
+
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+        self.cache_control = 'max-age=300'
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            await asyncio.sleep(0.01)
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(
+                    304, headers={'Cache-Control': self.cache_control}
+                )
+            return httpx.Response(
+                200,
+                json=agent_card(request.url.host),
+                headers={'ETag': '"v1"', 'Cache-Control': self.cache_control},
+            )
+
+        self.httpx_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.httpx_client.aclose()
+
+    async def test_resolves_concurrently_and_caches(self):
+        """Duplicate lookups share a request and fresh cards are cached."""
+        resolver = AsyncA2ACardResolver(httpx_client=self.httpx_client)
+        urls = ['http://a', 'http://b/', 'http://a/']
+        cards = await resolver.get_agent_cards(urls)
+        await resolver.get_agent_card('http://b')
+
+        self.assertEqual([card.name for card in cards], ['a', 'b', 'a'])
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(
+            self.requests[0].url, 'http://a/.well-known/agent.json'
+        )
+
+    async def test_revalidates_with_etag(self):
+        """A stale card is revalidated with If-None-Match."""
+        self.cache_control = 'no-cache'
+        resolver = AsyncA2ACardResolver(httpx_client=self.httpx_client)
+        first = await resolver.get_agent_card('http://a')
+        second = await resolver.get_agent_card('http://a')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1].headers['If-None-Match'], '"v1"')
+
+    async def test_disk_cache(self):
+        """Cards persisted to disk are reused by a new resolver."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, 'cards.json')
+            resolver = AsyncA2ACardResolver(
+                cache_path=cache_path, httpx_client=self.httpx_client
+            )
+            await resolver.get_agent_cards(['http://a'])
+
+            restarted = AsyncA2ACardResolver(
+                cache_path=cache_path, httpx_client=self.httpx_client
+            )
+            card = await restarted.get_agent_card('http://a')
+
+        self.assertEqual(card.name, 'a')
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_sync_resolution_inside_a_running_loop(self):
+        """resolve_agent_cards works from a running loop via a worker thread."""
+        cards = resolve_agent_cards(
+            ['http://a/', 'http://b/'], httpx_client=self.httpx_client
+        )
+
+        self.assertEqual([card.name for card in cards], ['a', 'b'])
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
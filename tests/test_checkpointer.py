@@ -0,0 +1,171 @@
+import os
+import tempfile
+import time
+import unittest
+
+
+try:
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    from agents.langgraph.checkpointer import BoundedCheckpointSaver
+except ImportError:  # the langgraph agent's dependencies are optional
+    BoundedCheckpointSaver = None
+
+
+def config(thread_id: str, checkpoint_id: str | None = None) -> dict:
+    configurable = {'thread_id': thread_id, 'checkpoint_ns': ''}
+    if checkpoint_id is not None:
+        configurable['checkpoint_id'] = checkpoint_id
+    return {'configurable': configurable}
+
+
+def checkpoint(messages: list | None = None) -> dict:
+    result = empty_checkpoint()
+    if messages is not None:
+        result['channel_values'] = {'messages': messages}
+    return result
+
+
+def put(saver, thread_id: str, messages: list | None = None, **metadata):
+    return saver.put(config(thread_id), checkpoint(messages), metadata, {})
+
+
+@unittest.skipUnless(BoundedCheckpointSaver, 'langgraph is not installed')
+class BoundedCheckpointSaverTest(unittest.TestCase):
+    """Tests for the bounded LangGraph checkpointer."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.spill_path = os.path.join(self.tmpdir.name, 'sessions.db')
+
+    def saver(self, **kwargs) -> 'BoundedCheckpointSaver':
+        saver = BoundedCheckpointSaver(**kwargs)
+        self.addCleanup(saver.close)
+        return saver
+
+    def test_least_recently_used_thread_is_evicted(self):
+        saver = self.saver(max_threads=2)
+        put(saver, 'a')
+        put(saver, 'b')
+        saver.get_tuple(config('a'))
+        put(saver, 'c')
+
+        self.assertIsNone(saver.get_tuple(config('b')))
+        self.assertIsNotNone(saver.get_tuple(config('a')))
+        self.assertIsNotNone(saver.get_tuple(config('c')))
+        self.assertEqual(saver.stats()['threads'], 2)
+        self.assertEqual(saver.evicted, 1)
+
+    def test_idle_threads_expire(self):
+        saver = self.saver(ttl=0.05)
+        put(saver, 'a')
+        time.sleep(0.1)
+
+        self.assertIsNone(saver.get_tuple(config('a')))
+        self.assertEqual(saver.expired, 1)
+
+    def test_evicted_threads_are_spilled_and_loaded(self):
+        saver = self.saver(max_threads=1, spill_path=self.spill_path)
+        saved = put(saver, 'a', [HumanMessage('hi')])
+        put(saver, 'b')
+        self.assertEqual(saver.stats()['threads'], 1)
+
+        loaded = saver.get_tuple(config('a'))
+        self.assertEqual(loaded.config, saved)
+        self.assertEqual(
+            loaded.checkpoint['channel_values']['messages'][0].content, 'hi'
+        )
+
+    def test_reads_of_spilled_threads_stay_within_max_threads(self):
+        saver = self.saver(max_threads=2, spill_path=self.spill_path)
+        for thread_id in 'abcde':
+            put(saver, thread_id)
+        for thread_id in 'abcde':
+            self.assertIsNotNone(saver.get_tuple(config(thread_id)))
+            self.assertLessEqual(saver.stats()['threads'], 2)
+
+        self.assertEqual(saver.evicted, 8)
+
+    def test_threads_survive_a_restart(self):
+        saver = BoundedCheckpointSaver(spill_path=self.spill_path)
+        saved = put(saver, 'a')
+        saver.close()
+
+        saver = self.saver(spill_path=self.spill_path)
+        self.assertEqual(saver.get_tuple(config('a')).config, saved)
+
+    def test_messages_are_trimmed_to_a_human_turn(self):
+        saver = self.saver(max_messages=3)
+        messages = [
+            HumanMessage('1'),
+            AIMessage('2'),
+            HumanMessage('3'),
+            AIMessage('4'),
+            HumanMessage('5'),
+            AIMessage('6'),
+        ]
+        put(saver, 'a', messages)
+
+        kept = saver.get_tuple(config('a')).checkpoint['channel_values']
+        self.assertEqual([m.content for m in kept['messages']], ['5', '6'])
+        self.assertEqual(saver.trimmed, 1)
+
+    def test_writes_and_listing(self):
+        saver = self.saver(max_threads=1, spill_path=self.spill_path)
+        saved = put(saver, 'a', source='input')
+        saver.put_writes(saved, [('messages', 'pending')], 'task-1')
+        # Writes to a checkpoint that is no longer the latest are dropped.
+        saver.put_writes(config('a', 'old'), [('messages', 'stale')], 'task')
+        put(saver, 'b', source='loop')
+
+        self.assertEqual(
+            saver.get_tuple(config('a')).pending_writes,
+            [('task-1', 'messages', 'pending')],
+        )
+        listed = {
+            t.config['configurable']['thread_id'] for t in saver.list(None)
+        }
+        self.assertEqual(listed, {'a', 'b'})
+        filtered = list(saver.list(None, filter={'source': 'loop'}))
+        self.assertEqual(len(filtered), 1)
+        self.assertEqual(filtered[0].config['configurable']['thread_id'], 'b')
+
+    def test_delete_thread(self):
+        saver = self.saver(max_threads=1, spill_path=self.spill_path)
+        put(saver, 'a')
+        put(saver, 'b')
+        saver.delete_thread('a')
+        saver.delete_thread('b')
+
+        self.assertIsNone(saver.get_tuple(config('a')))
+        self.assertIsNone(saver.get_tuple(config('b')))
+        self.assertEqual(saver.stats()['spilled'], 0)
+
+
+@unittest.skipUnless(BoundedCheckpointSaver, 'langgraph is not installed')
+class BoundedCheckpointSaverAsyncTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the async methods, which use the spill database off-loop."""
+
+    async def test_async_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            saver = BoundedCheckpointSaver(
+                max_threads=1, spill_path=os.path.join(tmpdir, 'sessions.db')
+            )
+            saved = await saver.aput(config('a'), checkpoint(), {}, {})
+            await saver.aput_writes(saved, [('messages', 'pending')], 'task')
+            await saver.aput(config('b'), checkpoint(), {}, {})
+
+            loaded = await saver.aget_tuple(config('a'))
+            self.assertEqual(loaded.config, saved)
+            self.assertEqual(len(loaded.pending_writes), 1)
+            listed = [t async for t in saver.alist(None)]
+            self.assertEqual(len(listed), 2)
+            await saver.adelete_thread('a')
+            self.assertIsNone(await saver.aget_tuple(config('a')))
+            saver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
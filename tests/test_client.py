@@ -0,0 +1,95 @@
+import unittest
+
+from unittest import mock
+
+import httpx
+
+from benchmarks.echo_agent import EchoTaskManager, create_echo_server
+from common.client import A2AClient
+from common.types import A2AClientHTTPError, TaskState
+
+
+def send_params(task_id: str) -> dict:
+    return {
+        'id': task_id,
+        'message': {'role': 'user', 'parts': [{'type': 'text', 'text': 'hi'}]},
+    }
+
+
+class A2AClientPoolTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the connection pool A2AClient creates and owns."""
+
+    async def asyncSetUp(self) -> None:
+        server = create_echo_server(port=5000, task_manager=EchoTaskManager())
+        # Pools created by A2AClient talk to the echo server in process.
+        self.pools = []
+        real_client = httpx.AsyncClient
+
+        def make_pool(**kwargs):
+            pool = real_client(
+                transport=httpx.ASGITransport(app=server.app), **kwargs
+            )
+            self.pools.append(pool)
+            return pool
+
+        patcher = mock.patch.object(httpx, 'AsyncClient', side_effect=make_pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_calls_share_one_pool(self):
+        async with A2AClient(url='http://testserver/') as client:
+            await client.send_task(send_params('task-1'))
+            response = await client.get_task({'id': 'task-1'})
+
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+        self.assertEqual(len(self.pools), 1)
+
+    async def test_aclose_closes_the_pool(self):
+        client = A2AClient(url='http://testserver/')
+        await client.send_task(send_params('task-1'))
+        await client.aclose()
+        self.assertTrue(self.pools[0].is_closed)
+
+        async with client:
+            await client.send_task(send_params('task-2'))
+        self.assertTrue(self.pools[1].is_closed)
+
+    async def test_use_after_close_opens_a_new_pool(self):
+        client = A2AClient(url='http://testserver/')
+        await client.aclose()  # closing an unused client is a no-op
+        await client.send_task(send_params('task-1'))
+        await client.aclose()
+
+        response = await client.get_task({'id': 'task-1'})
+        self.assertEqual(response.result.id, 'task-1')
+        self.assertEqual(len(self.pools), 2)
+        self.assertFalse(self.pools[1].is_closed)
+        await client.aclose()
+
+    async def test_caller_supplied_client_is_left_open(self):
+        async with httpx.AsyncClient() as pool:
+            async with A2AClient(url='http://testserver/', httpx_client=pool):
+                pass
+            self.assertFalse(pool.is_closed)
+
+
+class A2AClientErrorTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the errors A2AClient raises."""
+
+    async def test_transport_errors_are_wrapped(self):
+        def refuse(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError('connection refused', request=request)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(refuse)
+        ) as pool:
+            client = A2AClient(url='http://testserver/', httpx_client=pool)
+            with self.assertRaises(A2AClientHTTPError) as raised:
+                await client.get_task({'id': 'task-1'})
+
+        self.assertEqual(raised.exception.status_code, 400)
+        self.assertIsInstance(raised.exception.__cause__, httpx.ConnectError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from common.server.coalescer import EventCoalescer
+from common.types import (
+    Artifact,
+    Message,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+def working(text: str, kind: str = 'analysis') -> TaskStatusUpdateEvent:
+    message = Message(
+        role='agent', parts=[TextPart(text=text)], metadata={'subtype': kind}
+    )
+    return TaskStatusUpdateEvent(
+        id='task', status=TaskStatus(state=TaskState.WORKING, message=message)
+    )
+
+
+def completed() -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        id='task', status=TaskStatus(state=TaskState.COMPLETED), final=True
+    )
+
+
+async def source(events: list, delay: float = 0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+def texts(frames: list) -> list[str]:
+    return [
+        frame.status.message.parts[0].text
+        for frame in frames
+        if isinstance(frame, TaskStatusUpdateEvent) and frame.status.message
+    ]
+
+
+class EventCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for batching WORKING status updates."""
+
+    async def collect(self, coalescer: EventCoalescer, events) -> list:
+        return [frame async for frame in coalescer.coalesce(events)]
+
+    async def test_batches_until_a_state_change(self):
+        """Tokens are merged; other events flush the batch, in order."""
+        artifact = TaskArtifactUpdateEvent(
+            id='task', artifact=Artifact(parts=[TextPart(text='done')])
+        )
+        events = [working(t) for t in 'hello'] + [artifact, completed()]
+        coalescer = EventCoalescer(window=10)
+        frames = await self.collect(coalescer, source(events))
+
+        self.assertEqual(texts(frames), ['hello'])
+        self.assertIs(frames[1], artifact)
+        self.assertTrue(frames[2].final)
+        self.assertEqual(coalescer.stats.events, 7)
+        self.assertEqual(coalescer.stats.frames, 3)
+
+    async def test_metadata_change_starts_a_new_batch(self):
+        events = [working('a'), working('b'), working('q', 'execute_query')]
+        frames = await self.collect(
+            EventCoalescer(window=10), source(events + [completed()])
+        )
+        self.assertEqual(texts(frames), ['ab', 'q'])
+
+    async def test_byte_budget(self):
+        events = [working('x' * 10) for _ in range(5)]
+        frames = await self.collect(
+            EventCoalescer(window=10, max_bytes=20), source(events)
+        )
+        self.assertEqual([len(text) for text in texts(frames)], [20, 20, 10])
+
+    async def test_window_flushes_while_source_is_quiet(self):
+        """A due batch goes out without waiting for the next event."""
+
+        async def stalled():
+            yield working('a')
+            yield working('b')
+            await asyncio.sleep(0.2)
+            yield completed()
+
+        received = []
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async for frame in EventCoalescer(window=0.02).coalesce(stalled()):
+            received.append((frame, loop.time() - started))
+
+        self.assertEqual(texts([frame for frame, _ in received]), ['ab'])
+        self.assertLess(received[0][1], 0.15)
+        self.assertTrue(received[1][0].final)
+
+
+if __name__ == '__main__':
+    unittest.main()
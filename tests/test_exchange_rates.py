@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from benchmarks.frankfurter_stub import STUB_DATE, FrankfurterStub
+from common.utils.exchange_rates import (
+    ExchangeRateProvider,
+    UnknownCurrencyError,
+)
+
+
+class ExchangeRateProviderTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for caching and coalescing exchange rate lookups."""
+
+    async def asyncSetUp(self) -> None:
+        self.stub = FrankfurterStub(latency=0.01)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'rates.json')
+
+    async def asyncTearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def provider(self, **kwargs) -> ExchangeRateProvider:
+        return ExchangeRateProvider(
+            base_url='http://frankfurter',
+            httpx_client=httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.stub.app)
+            ),
+            **kwargs,
+        )
+
+    async def test_cached_and_cross_rates(self):
+        provider = self.provider()
+        data = await provider.get_rates('USD', 'EUR')
+        self.assertEqual(data['base'], 'USD')
+        self.assertEqual(data['date'], STUB_DATE)
+        self.assertAlmostEqual(data['rates']['EUR'], 0.90909, places=5)
+
+        await provider.get_rates('usd', 'GBP,JPY')
+        # GBP -> JPY is a cross rate from the cached USD table.
+        data = await provider.get_rates('GBP', 'JPY')
+        self.assertAlmostEqual(data['rates']['JPY'], 160 / 0.85, places=1)
+        self.assertEqual(self.stub.requests, 1)
+        await provider.aclose()
+
+    async def test_coalesces_concurrent_lookups(self):
+        provider = self.provider()
+        results = await asyncio.gather(
+            *(provider.get_rates('USD', 'EUR') for _ in range(10))
+        )
+        self.assertEqual(len({r['rates']['EUR'] for r in results}), 1)
+        self.assertEqual(self.stub.requests, 1)
+        await provider.aclose()
+
+    async def test_ttl_and_disk_cache(self):
+        provider = self.provider(ttl=0)
+        await provider.get_rates('USD', 'EUR')
+        await provider.get_rates('USD', 'EUR')
+        self.assertEqual(self.stub.requests, 2)
+        await provider.aclose()
+
+        provider = self.provider(cache_path=self.cache_path)
+        await provider.get_rates('USD', 'EUR')
+        await provider.aclose()
+        provider = self.provider(cache_path=self.cache_path)
+        await provider.get_rates('EUR', 'INR')
+        self.assertEqual(self.stub.requests, 3)
+        await provider.aclose()
+
+    async def test_concurrent_fetches_are_all_saved(self):
+        provider = self.provider(cache_path=self.cache_path)
+        await asyncio.gather(
+            *(provider.get_rates(base, 'INR') for base in ('USD', 'EUR', 'GBP'))
+        )
+        await provider.aclose()
+
+        provider = self.provider(cache_path=self.cache_path)
+        for base in ('USD', 'EUR', 'GBP'):
+            await provider.get_rates(base, 'INR')
+        self.assertEqual(self.stub.requests, 3)
+        await provider.aclose()
+
+    async def test_unknown_currency(self):
+        provider = self.provider()
+        with self.assertRaises(UnknownCurrencyError):
+            await provider.get_rates('XXX', 'EUR')
+        await provider.get_rates('USD', 'EUR')
+        with self.assertRaises(UnknownCurrencyError):
+            await provider.get_rates('USD', 'XXX')
+        self.assertEqual(self.stub.requests, 2)
+        await provider.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from common.server.locks import StripedLock
+
+
+class StripedLockTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the striped per-key lock pool."""
+
+    async def test_same_key_maps_to_same_lock(self):
+        locks = StripedLock(8)
+        for key in ('a', 'task-1', 'task-2'):
+            self.assertIs(locks.for_key(key), locks.for_key(key))
+
+    async def test_same_key_is_serialised(self):
+        """A second holder of a key waits until the first releases it."""
+        locks = StripedLock(8)
+        order = []
+
+        async def hold(name: str):
+            async with locks.hold('task'):
+                order.append(f'{name} in')
+                await asyncio.sleep(0.01)
+                order.append(f'{name} out')
+
+        await asyncio.gather(hold('first'), hold('second'))
+        self.assertEqual(
+            order, ['first in', 'first out', 'second in', 'second out']
+        )
+
+    async def test_different_stripes_do_not_wait(self):
+        """A key on another stripe is acquired while the first is held."""
+        locks = StripedLock(8)
+        first = 'task-0'
+        other = next(
+            f'task-{i}'
+            for i in range(1, 1000)
+            if locks.for_key(f'task-{i}') is not locks.for_key(first)
+        )
+
+        async with locks.hold(first):
+            async with asyncio.timeout(0.1):
+                async with locks.hold(other):
+                    pass
+
+    def test_needs_a_stripe(self):
+        with self.assertRaises(ValueError):
+            StripedLock(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
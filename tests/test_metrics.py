@@ -0,0 +1,97 @@
+import unittest
+
+import httpx
+
+from benchmarks.echo_agent import create_echo_server
+from common.client import A2AClient
+from common.utils.metrics import MetricsRegistry
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    """Tests for rendering metrics in the Prometheus text format."""
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        requests = registry.counter(
+            'requests_total', 'Requests.', labelnames=('method',)
+        )
+        latency = registry.histogram(
+            'latency_seconds', 'Latency.', buckets=(0.1, 1.0)
+        )
+        registry.gauge('queued', 'Queued.', callback=lambda: 3)
+
+        requests.labels('get').inc()
+        requests.labels('get').inc()
+        latency.observe(0.1)
+        latency.observe(5)
+
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE requests_total counter', lines)
+        self.assertIn('requests_total{method="get"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn('latency_seconds_sum 5.1', lines)
+        self.assertIn('latency_seconds_count 2', lines)
+        self.assertIn('queued 3', lines)
+
+    def test_rejects_wrong_labels_and_duplicates(self):
+        registry = MetricsRegistry()
+        requests = registry.counter(
+            'requests_total', 'Requests.', labelnames=('method',)
+        )
+        with self.assertRaises(ValueError):
+            requests.inc()
+        with self.assertRaises(ValueError):
+            registry.counter('requests_total', 'Requests.')
+
+
+class A2AServerMetricsTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the /metrics route of A2AServer."""
+
+    async def asyncSetUp(self) -> None:
+        self.server = create_echo_server(port=5000)
+        self.httpx_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.server.app),
+            base_url='http://testserver',
+        )
+        self.client = A2AClient(
+            url='http://testserver/', httpx_client=self.httpx_client
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.httpx_client.aclose()
+
+    async def test_metrics(self):
+        await self.client.send_task(
+            {
+                'id': 'task-1',
+                'message': {
+                    'role': 'user',
+                    'parts': [{'type': 'text', 'text': 'hello'}],
+                },
+            }
+        )
+        await self.client.get_task({'id': 'missing'})
+
+        response = await self.httpx_client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith('text/'))
+        lines = response.text.splitlines()
+        self.assertIn(
+            'a2a_server_request_duration_seconds_count{method="tasks/send"} 1',
+            lines,
+        )
+        self.assertIn(
+            'a2a_server_request_errors_total{method="tasks/get"} 1', lines
+        )
+        self.assertIn('a2a_tasks{state="completed"} 1', lines)
+        self.assertIn('a2a_tasks{state="working"} 0', lines)
+        self.assertIn('a2a_sse_subscribers 0', lines)
+        self.assertIn(
+            '# TYPE a2a_client_request_duration_seconds histogram', lines
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
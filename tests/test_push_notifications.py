@@ -0,0 +1,198 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from jwt import PyJWK
+from starlette.requests import Request
+
+from common.server import A2AServer
+from common.utils.push_notification_auth import (
+    SUPPORTED_ALGORITHMS,
+    PushNotificationDispatcher,
+    PushNotificationReceiverAuth,
+    PushNotificationSenderAuth,
+)
+
+
+def make_request(request: httpx.Request) -> Request:
+    """Converts a sent httpx request into the Starlette request received."""
+    body = request.content
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    scope = {
+        'type': 'http',
+        'method': 'POST',
+        'path': '/',
+        'headers': [(k.lower(), v) for k, v in request.headers.raw],
+    }
+    return Request(scope, receive)
+
+
+class PushNotificationDispatcherTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for background push-notification delivery."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.sender_auth = PushNotificationSenderAuth()
+        cls.sender_auth.generate_jwk()
+
+    async def asyncSetUp(self) -> None:
+        self.received = []
+        self.statuses = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await self.release.wait()
+            self.received.append(json.loads(request.content))
+            status_code = self.statuses.pop(0) if self.statuses else 200
+            return httpx.Response(status_code)
+
+        self.httpx_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        self.dispatcher = PushNotificationDispatcher(
+            self.sender_auth,
+            max_pending=2,
+            workers=2,
+            backoff_base=0.001,
+            httpx_client=self.httpx_client,
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.dispatcher.aclose()
+        await self.httpx_client.aclose()
+
+    async def test_coalesces_superseded_updates(self):
+        """Only the latest queued update for a task is delivered."""
+        self.release.clear()
+        self.dispatcher.submit('http://hook/', {'state': 'working'}, 'task')
+        await asyncio.sleep(0.01)  # first update is now in flight
+        self.dispatcher.submit('http://hook/', {'state': 'working-2'}, 'task')
+        self.dispatcher.submit('http://hook/', {'state': 'completed'}, 'task')
+        self.release.set()
+        await self.dispatcher.drain()
+
+        states = [body['state'] for body in self.received]
+        self.assertEqual(states, ['working', 'completed'])
+        self.assertEqual(self.dispatcher.coalesced, 1)
+
+    async def test_retries_server_errors(self):
+        """5xx responses are retried until delivery succeeds."""
+        self.statuses = [503, 500]
+        self.dispatcher.submit('http://hook/', {'state': 'completed'}, 'task')
+        await self.dispatcher.drain()
+
+        self.assertEqual(len(self.received), 3)
+        self.assertEqual(self.dispatcher.delivered, 1)
+        self.assertEqual(self.dispatcher.retried, 2)
+
+    async def test_client_errors_are_not_retried(self):
+        """A 4xx response fails the delivery straight away."""
+        self.statuses = [404]
+        self.dispatcher.submit('http://hook/', {'state': 'completed'}, 'task')
+        await self.dispatcher.drain()
+
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.dispatcher.failed, 1)
+
+    async def test_drops_when_full(self):
+        """New tasks are dropped once max_pending updates are queued."""
+        self.release.clear()
+        self.assertTrue(self.dispatcher.submit('http://hook/', {}, 'a'))
+        self.assertTrue(self.dispatcher.submit('http://hook/', {}, 'b'))
+        self.assertFalse(self.dispatcher.submit('http://hook/', {}, 'c'))
+        self.assertEqual(self.dispatcher.dropped, 1)
+        self.release.set()
+        await self.dispatcher.drain()
+
+    async def test_server_shutdown_drains_and_stops(self):
+        """A sender registered with A2AServer is closed on shutdown."""
+        self.sender_auth.dispatcher = self.dispatcher
+        self.addCleanup(setattr, self.sender_auth, 'dispatcher', None)
+        server = A2AServer()
+        server.add_shutdown_handler(self.sender_auth.aclose)
+
+        async with server.app.router.lifespan_context(server.app):
+            self.sender_auth.enqueue_push_notification(
+                'http://hook/', {'state': 'completed'}, 'task'
+            )
+
+        self.assertEqual(self.received, [{'state': 'completed'}])
+        self.assertEqual(self.dispatcher._worker_tasks, [])
+
+
+class PushNotificationSignatureTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for signing and verifying push-notification bodies."""
+
+    async def asyncSetUp(self) -> None:
+        self.sent = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.sent.append(request)
+            return httpx.Response(200)
+
+        self.httpx_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.httpx_client.aclose()
+
+    async def _send(self, algorithm: str, data: dict):
+        sender_auth = PushNotificationSenderAuth()
+        sender_auth.generate_jwk(algorithm)
+        receiver_auth = PushNotificationReceiverAuth()
+        public_key = sender_auth.public_keys[-1]
+        receiver_auth._signing_keys[public_key['kid']] = PyJWK(public_key)
+        await sender_auth._post_notification(
+            self.httpx_client, 'http://hook/', data
+        )
+        return sender_auth, receiver_auth
+
+    async def test_round_trip_for_each_algorithm(self):
+        """Notifications signed with any supported key are verified."""
+        for algorithm in SUPPORTED_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                _, receiver_auth = await self._send(algorithm, {'id': 'é'})
+                request = make_request(self.sent[-1])
+                self.assertTrue(
+                    await receiver_auth.verify_push_notification(request)
+                )
+
+    async def test_retries_reuse_the_token(self):
+        """Identical bodies reuse one token, verified only once."""
+        data = {'id': 'task', 'state': 'completed'}
+        sender_auth, receiver_auth = await self._send('ES256', data)
+        await sender_auth._post_notification(
+            self.httpx_client, 'http://hook/', data
+        )
+
+        first, second = self.sent
+        self.assertEqual(
+            first.headers['Authorization'], second.headers['Authorization']
+        )
+        for request in (first, second):
+            await receiver_auth.verify_push_notification(make_request(request))
+        self.assertEqual(len(receiver_auth._verified_tokens), 1)
+
+    async def test_tampered_body_is_rejected(self):
+        """A body that does not match the signed digest is rejected."""
+        _, receiver_auth = await self._send('EdDSA', {'state': 'completed'})
+        sent = self.sent[-1]
+        tampered = httpx.Request(
+            'POST',
+            'http://hook/',
+            headers=sent.headers,
+            content=b'{"state":"failed"}',
+        )
+        with self.assertRaises(ValueError):
+            await receiver_auth.verify_push_notification(make_request(tampered))
+
+
+if __name__ == '__main__':
+    unittest.main()
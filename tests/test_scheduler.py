@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+from common.server import FairScheduler
+from common.types import Message, TaskSendParams, TextPart
+
+
+def params(session_id: str, **metadata) -> TaskSendParams:
+    return TaskSendParams(
+        id=f'{session_id}-task',
+        sessionId=session_id,
+        message=Message(role='user', parts=[TextPart(text='hi')]),
+        metadata=metadata or None,
+    )
+
+
+class FairSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for weighted fair queuing of agent executions."""
+
+    async def asyncSetUp(self) -> None:
+        self.scheduler = FairScheduler(max_concurrent=1)
+        self.order = []
+        self.release = asyncio.Event()
+
+    async def job(self, name: str, task_params: TaskSendParams):
+        async with self.scheduler.slot(task_params):
+            self.order.append(name)
+            await self.release.wait()
+
+    async def run_all(self, jobs: list[tuple[str, TaskSendParams]]):
+        """Queues jobs behind a running one, then lets them all run."""
+        blocker = asyncio.create_task(self.job('blocker', params('blocker')))
+        await asyncio.sleep(0)
+        tasks = []
+        for name, task_params in jobs:
+            tasks.append(asyncio.create_task(self.job(name, task_params)))
+            await asyncio.sleep(0)
+        self.assertEqual(self.scheduler.queued, len(jobs))
+        self.release.set()
+        await asyncio.gather(blocker, *tasks)
+        return self.order[1:]
+
+    async def test_light_session_is_not_starved(self):
+        """A light session runs after one heavy job, not after all of them."""
+        jobs = [('heavy', params('heavy'))] * 4 + [('light', params('light'))]
+        order = await self.run_all(jobs)
+        self.assertEqual(order[:2], ['heavy', 'light'])
+
+    async def test_tenants_share_equally(self):
+        """A tenant with many sessions gets the same share as one with one."""
+        jobs = [(f'a{i}', params(f'a{i}', tenant='a')) for i in range(3)]
+        jobs += [('b', params('b', tenant='b'))] * 3
+        order = await self.run_all(jobs)
+        self.assertEqual([name[0] for name in order], ['a', 'b'] * 3)
+
+    async def test_priority_weights(self):
+        """A high priority session gets twice the share of a normal one."""
+        jobs = [('normal', params('normal'))] * 3
+        jobs += [('high', params('high', priority='high'))] * 4
+        order = await self.run_all(jobs)
+        self.assertEqual(order[:3].count('high'), 2)
+
+    async def test_cancelled_waiter_is_removed(self):
+        """A waiter cancelled in the queue does not take a slot."""
+        blocker = asyncio.create_task(self.job('blocker', params('a')))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(self.job('waiter', params('b')))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        self.assertEqual(self.scheduler.queued, 0)
+        self.release.set()
+        await blocker
+        self.assertEqual(self.order, ['blocker'])
+        self.assertEqual(self.scheduler.running, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import json
+import unittest
+
+import httpx
+
+from pydantic import ValidationError
+
+from benchmarks.echo_agent import EchoTaskManager, create_echo_server
+from common.client import A2AClient
+from common.server import A2AServer, RequestProfiler
+from common.types import (
+    GetTaskRequest,
+    GetTaskResponse,
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskNotFoundError,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+)
+
+
+def send_params(task_id: str, text: str = 'hello') -> dict:
+    return {
+        'id': task_id,
+        'message': {'role': 'user', 'parts': [{'type': 'text', 'text': text}]},
+    }
+
+
+class A2AServerBatchTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for JSON-RPC batch requests between A2AClient and A2AServer."""
+
+    async def asyncSetUp(self) -> None:
+        self.server = create_echo_server(
+            port=5000, task_manager=EchoTaskManager()
+        )
+        self.httpx_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.server.app),
+            base_url='http://testserver',
+        )
+        self.client = A2AClient(
+            url='http://testserver/', httpx_client=self.httpx_client
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.httpx_client.aclose()
+
+    async def test_batch_round_trip(self):
+        """Batched calls come back in request order with typed responses."""
+        await self.client.send_task(send_params('task-1'))
+        responses = await self.client.batch(
+            [
+                GetTaskRequest(params=TaskQueryParams(id='task-1')),
+                GetTaskRequest(params=TaskQueryParams(id='missing')),
+                SendTaskRequest(params=TaskSendParams(**send_params('task-2'))),
+            ]
+        )
+
+        self.assertIsInstance(responses[0], GetTaskResponse)
+        self.assertEqual(responses[0].result.status.state, TaskState.COMPLETED)
+        self.assertEqual(responses[1].error.code, TaskNotFoundError().code)
+        self.assertIsInstance(responses[2], SendTaskResponse)
+        self.assertEqual(responses[2].result.id, 'task-2')
+
+    async def test_batch_rejects_streaming_and_invalid_entries(self):
+        """Invalid entries get their own error without failing the batch."""
+        response = await self.httpx_client.post(
+            '/',
+            json=[
+                {
+                    'jsonrpc': '2.0',
+                    'id': 1,
+                    'method': 'tasks/sendSubscribe',
+                    'params': send_params('task-3'),
+                },
+                {'jsonrpc': '2.0', 'id': 2, 'method': 'tasks/unknown'},
+                {
+                    'jsonrpc': '2.0',
+                    'id': 3,
+                    'method': 'tasks/send',
+                    'params': send_params('task-4'),
+                },
+            ],
+        )
+
+        body = response.json()
+        self.assertEqual([item['id'] for item in body], [1, 2, 3])
+        self.assertEqual(body[0]['error']['code'], -32600)
+        self.assertEqual(body[1]['error']['code'], -32600)
+        self.assertEqual(body[2]['result']['status']['state'], 'completed')
+
+    async def test_notifications_get_no_response(self):
+        """Entries without an id are run but left out of the response."""
+        notification = {
+            'jsonrpc': '2.0',
+            'method': 'tasks/send',
+            'params': send_params('task-5'),
+        }
+        response = await self.httpx_client.post(
+            '/',
+            json=[
+                notification,
+                {'jsonrpc': '2.0', 'method': 'tasks/unknown'},
+                {
+                    'jsonrpc': '2.0',
+                    'id': 1,
+                    'method': 'tasks/get',
+                    'params': {'id': 'task-5'},
+                },
+            ],
+        )
+        self.assertEqual([item['id'] for item in response.json()], [1])
+
+        response = await self.httpx_client.post('/', json=[notification])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+
+    async def test_empty_batch(self):
+        """An empty batch is an invalid request."""
+        response = await self.httpx_client.post('/', json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+
+class A2AServerAdminTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the opt-in admin routes."""
+
+    async def test_memory_stats(self):
+        """The memory endpoint reports task manager table sizes."""
+        server = create_echo_server(port=5000, admin_path='/admin')
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://testserver',
+        ) as client:
+            await A2AClient(
+                url='http://testserver/', httpx_client=client
+            ).send_task(send_params('task-1'))
+            response = await client.get('/admin/memory')
+
+        stats = response.json()
+        self.assertEqual(stats['task_manager']['tasks'], 1)
+        self.assertIn('rss_bytes', stats)
+
+    async def test_slow_requests(self):
+        """Slow requests are reported with phase timings and a profile."""
+        server = create_echo_server(
+            port=5000,
+            admin_path='/admin',
+            profiler=RequestProfiler(slow_threshold=0, profile_rate=1),
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://testserver',
+        ) as client:
+            with self.assertLogs('common.server.profiling', 'WARNING'):
+                await A2AClient(
+                    url='http://testserver/', httpx_client=client
+                ).send_task(send_params('task-1'))
+            response = await client.get('/admin/slow-requests')
+
+        report = response.json()
+        self.assertEqual(report['requests'], 1)
+        slow_request = report['slow_requests'][0]
+        self.assertEqual(slow_request['method'], 'tasks/send')
+        self.assertLessEqual(
+            {'read_body', 'parse', 'handler', 'lock_wait', 'serialize'},
+            set(slow_request['phases']),
+        )
+        self.assertIn('function calls', slow_request['profile'])
+
+
+class A2AServerParseRequestTest(unittest.TestCase):
+    """Tests for the method-peeking request decoder."""
+
+    def setUp(self) -> None:
+        self.server = A2AServer()
+
+    def test_fast_path(self):
+        """A well-formed request is decoded into its own request model."""
+        body = GetTaskRequest(params=TaskQueryParams(id='t')).model_dump_json()
+        request = self.server._parse_request(body.encode())
+        self.assertIsInstance(request, GetTaskRequest)
+
+    def test_nested_method_key_falls_back(self):
+        """A 'method' key inside params does not confuse dispatch."""
+        body = json.dumps(
+            {
+                'jsonrpc': '2.0',
+                'id': 1,
+                'params': {'id': 't', 'metadata': {'method': 'tasks/send'}},
+                'method': 'tasks/get',
+            }
+        )
+        request = self.server._parse_request(body.encode())
+        self.assertIsInstance(request, GetTaskRequest)
+
+    def test_invalid_payloads(self):
+        """Malformed JSON and unknown methods raise the usual errors."""
+        with self.assertRaises(json.JSONDecodeError):
+            self.server._parse_request(b'{"method": "tasks/get"')
+        with self.assertRaises(ValidationError):
+            self.server._parse_request(b'{"id": 1, "method": "nope"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,522 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from benchmarks.echo_agent import EchoTaskManager
+from common.client import ArtifactAssembler
+from common.server.event_queue import OverflowPolicy
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import SQLiteTaskStore
+from common.types import (
+    Artifact,
+    CancelTaskRequest,
+    GetTaskRequest,
+    JSONRPCError,
+    Message,
+    SendTaskRequest,
+    SendTaskStreamingRequest,
+    TaskArtifactUpdateEvent,
+    TaskIdParams,
+    TaskNotCancelableError,
+    TaskNotFoundError,
+    TaskQueryParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+class StubTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def status_event(task_id: str, text: str, final: bool = False):
+    state = TaskState.COMPLETED if final else TaskState.WORKING
+    message = Message(role='agent', parts=[TextPart(text=text)])
+    return TaskStatusUpdateEvent(
+        id=task_id, status=TaskStatus(state=state, message=message), final=final
+    )
+
+
+def artifact_event(task_id: str, text: str):
+    return TaskArtifactUpdateEvent(
+        id=task_id, artifact=Artifact(parts=[TextPart(text=text)])
+    )
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+class InMemoryTaskManagerSSETest(unittest.IsolatedAsyncioTestCase):
+    """Tests for SSE fan-out from InMemoryTaskManager."""
+
+    async def asyncSetUp(self) -> None:
+        self.task_id = 'task-1'
+        self.manager = StubTaskManager(sse_queue_size=2)
+        await self.manager.upsert_task(
+            TaskSendParams(
+                id=self.task_id,
+                message=Message(role='user', parts=[TextPart(text='hi')]),
+            )
+        )
+
+    async def test_coalesce_drops_superseded_status_updates(self):
+        """A slow subscriber keeps artifacts and only the latest status."""
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'one')
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, artifact_event(self.task_id, 'result')
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, queue)
+        )
+        self.assertEqual(len(responses), 2)
+        self.assertIsInstance(responses[0].result, TaskArtifactUpdateEvent)
+        self.assertTrue(responses[1].result.final)
+        self.assertEqual(queue.dropped, 1)
+
+    async def test_disconnect_policy_ends_stalled_stream(self):
+        """An overflowing subscriber is dropped without affecting others."""
+        self.manager.sse_overflow_policy = OverflowPolicy.DISCONNECT
+        stalled = await self.manager.setup_sse_consumer(self.task_id)
+        self.manager.sse_queue_size = 10
+        healthy = await self.manager.setup_sse_consumer(self.task_id)
+
+        for i in range(3):
+            await self.manager.enqueue_events_for_sse(
+                self.task_id, status_event(self.task_id, str(i))
+            )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        self.assertEqual(
+            self.manager.task_sse_subscribers[self.task_id], [healthy]
+        )
+        stalled_responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, stalled)
+        )
+        self.assertEqual(len(stalled_responses), 1)
+        self.assertIsInstance(stalled_responses[0].error, JSONRPCError)
+
+        healthy_responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, healthy)
+        )
+        self.assertEqual(len(healthy_responses), 4)
+
+    async def test_drop_oldest(self):
+        """The oldest buffered event makes room for the newest."""
+        self.manager.sse_overflow_policy = OverflowPolicy.DROP_OLDEST
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        for text in ('a', 'b', 'c'):
+            await self.manager.enqueue_events_for_sse(
+                self.task_id, artifact_event(self.task_id, text)
+            )
+
+        self.assertEqual(queue.qsize(), 2)
+        first = await queue.get()
+        self.assertEqual(first.event.artifact.parts[0].text, 'b')
+
+    async def test_large_artifacts_are_chunked(self):
+        """Artifacts over artifact_chunk_size go out as several events."""
+        self.manager.artifact_chunk_size = 4
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, artifact_event(self.task_id, 'abcdefghij')
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, queue)
+        )
+        chunks = [response.result.artifact for response in responses[:-1]]
+        self.assertEqual(
+            [chunk.parts[0].text for chunk in chunks], ['abcd', 'efgh', 'ij']
+        )
+        self.assertTrue(chunks[-1].lastChunk)
+        self.assertEqual(
+            [response._event_id for response in responses], [None, None, 1, 2]
+        )
+
+    async def test_artifact_larger_than_queue(self):
+        """An artifact of more chunks than the queue holds is not dropped."""
+        self.manager.sse_overflow_policy = OverflowPolicy.DISCONNECT
+        self.manager.artifact_chunk_size = 10
+        self.manager.event_log_size = 2
+        text = ''.join(str(i % 10) for i in range(1000))
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, artifact_event(self.task_id, text)
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, queue)
+        )
+        self.assertEqual(len(responses), 101)
+        assembler = ArtifactAssembler()
+        results = [assembler.add(r.result) for r in responses[:-1]]
+        self.assertEqual(results[-1].parts[0].text, text)
+
+        # The event log also holds the artifact as one event.
+        stream = await self.manager.on_resubscribe_to_task(
+            TaskResubscriptionRequest(
+                params=TaskIdParams(
+                    id=self.task_id, metadata={'lastEventId': 0}
+                )
+            )
+        )
+        replayed = await collect(stream)
+        self.assertEqual(len(replayed), 101)
+        self.assertTrue(replayed[-1].result.final)
+
+
+class InMemoryTaskManagerResubscribeTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for tasks/resubscribe replay from the task event log."""
+
+    async def asyncSetUp(self) -> None:
+        self.task_id = 'task-1'
+        self.manager = StubTaskManager()
+        await self.manager.upsert_task(
+            TaskSendParams(
+                id=self.task_id,
+                message=Message(role='user', parts=[TextPart(text='hi')]),
+            )
+        )
+
+    def resubscribe_request(self, last_event_id=None):
+        metadata = None
+        if last_event_id is not None:
+            metadata = {'lastEventId': last_event_id}
+        return TaskResubscriptionRequest(
+            params=TaskIdParams(id=self.task_id, metadata=metadata)
+        )
+
+    async def test_replays_missed_events(self):
+        """Only events after lastEventId are replayed, then live events."""
+        for text in ('a', 'b', 'c'):
+            await self.manager.enqueue_events_for_sse(
+                self.task_id, status_event(self.task_id, text)
+            )
+
+        stream = await self.manager.on_resubscribe_to_task(
+            self.resubscribe_request(last_event_id='1')
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        responses = await collect(stream)
+        texts = [r.result.status.message.parts[0].text for r in responses]
+        self.assertEqual(texts, ['b', 'c', 'done'])
+        self.assertEqual([r._event_id for r in responses], [2, 3, 4])
+
+    async def test_finished_stream_returns_final_status(self):
+        """Resubscribing after the final event does not hang."""
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+
+        stream = await self.manager.on_resubscribe_to_task(
+            self.resubscribe_request(last_event_id=1)
+        )
+        responses = await collect(stream)
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].result.final)
+
+    async def test_ended_logs_are_reclaimed(self):
+        """A log is dropped after its stream ends; ids keep increasing."""
+        self.manager.event_log_retention = 0.01
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'a')
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.manager.memory_stats()['event_logs'], 0)
+
+        # The task streams again, e.g. after input was required.
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'b')
+        )
+        stream = await self.manager.on_resubscribe_to_task(
+            self.resubscribe_request(last_event_id=2)
+        )
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'done', final=True)
+        )
+        responses = await collect(stream)
+        self.assertEqual([r._event_id for r in responses], [3, 4])
+
+    async def test_unknown_task(self):
+        """Resubscribing to an unknown task returns TaskNotFoundError."""
+        response = await self.manager.on_resubscribe_to_task(
+            TaskResubscriptionRequest(params=TaskIdParams(id='missing'))
+        )
+        self.assertEqual(response.error.code, TaskNotFoundError().code)
+
+
+class InMemoryTaskManagerCancelTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for cancelling agent runs owned by the task runner."""
+
+    async def asyncSetUp(self) -> None:
+        self.task_id = 'task-1'
+        self.manager = StubTaskManager(orphaned_run_grace=0.01)
+        await self.manager.upsert_task(
+            TaskSendParams(
+                id=self.task_id,
+                message=Message(role='user', parts=[TextPart(text='hi')]),
+            )
+        )
+
+    async def asyncTearDown(self) -> None:
+        self.manager.close()
+
+    def start_run(self):
+        self.manager.runner.start(self.task_id, asyncio.sleep(60))
+
+    async def cancel(self):
+        return await self.manager.on_cancel_task(
+            CancelTaskRequest(params=TaskIdParams(id=self.task_id))
+        )
+
+    async def test_cancel_live_run(self):
+        """tasks/cancel stops the run and ends the stream as canceled."""
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        self.start_run()
+        response = await self.cancel()
+
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+        self.assertEqual(self.manager.runner.stats()['cancelled'], 1)
+        self.assertEqual(self.manager.runner.live, 0)
+        responses = await collect(
+            self.manager.dequeue_events_for_sse('req', self.task_id, queue)
+        )
+        self.assertTrue(responses[-1].result.final)
+
+    async def test_cancel_without_run(self):
+        """A task with no live run is not cancelable."""
+        response = await self.cancel()
+        self.assertEqual(response.error.code, TaskNotCancelableError().code)
+
+    async def test_cancel_when_last_subscriber_leaves(self):
+        """A run without subscribers is cancelled after the grace period."""
+        queue = await self.manager.setup_sse_consumer(self.task_id)
+        self.start_run()
+        stream = self.manager.dequeue_events_for_sse('req', self.task_id, queue)
+        await self.manager.enqueue_events_for_sse(
+            self.task_id, status_event(self.task_id, 'working')
+        )
+        await anext(stream)
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.manager.runner.live, 0)
+        task = self.manager.tasks[self.task_id]
+        self.assertEqual(task.status.state, TaskState.CANCELED)
+
+
+class InMemoryTaskManagerHistoryTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for bounded task history."""
+
+    async def asyncSetUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = StubTaskManager(
+            task_store=SQLiteTaskStore(
+                os.path.join(self.tmpdir.name, 'tasks.db')
+            ),
+            history_limit=3,
+        )
+        for i in range(5):
+            await self.manager.upsert_task(
+                TaskSendParams(
+                    id='task',
+                    message=Message(role='user', parts=[TextPart(text=str(i))]),
+                )
+            )
+
+    async def asyncTearDown(self) -> None:
+        self.manager.close()
+        self.tmpdir.cleanup()
+
+    async def history(self, history_length):
+        task = self.manager.tasks['task']
+        view = await self.manager.append_task_history(task, history_length)
+        return [message.parts[0].text for message in view.history]
+
+    async def test_history_is_capped(self):
+        """Only the latest history_limit messages stay on the task."""
+        self.assertEqual(len(self.manager.tasks['task'].history), 3)
+        self.assertEqual(await self.history(2), ['3', '4'])
+        self.assertEqual(await self.history(None), [])
+
+    async def test_spilled_messages_are_loaded(self):
+        """A longer historyLength is served from the spilled messages."""
+        self.assertEqual(await self.history(10), ['0', '1', '2', '3', '4'])
+        self.assertEqual(len(self.manager.tasks['task'].history), 3)
+
+    async def test_status_messages_can_skip_history(self):
+        """Only status messages stored with record_history reach history."""
+        for text, record_history in (('fragment', False), ('final', True)):
+            message = Message(role='agent', parts=[TextPart(text=text)])
+            await self.manager.update_store(
+                'task',
+                TaskStatus(state=TaskState.WORKING, message=message),
+                None,
+                record_history=record_history,
+            )
+
+        task = self.manager.tasks['task']
+        self.assertEqual(task.status.message.parts[0].text, 'final')
+        self.assertEqual(await self.history(3), ['3', '4', 'final'])
+
+
+class InMemoryTaskManagerSweepTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for evicting finished tasks and their side tables."""
+
+    async def asyncSetUp(self) -> None:
+        self.manager = StubTaskManager(task_retention=0)
+        for task_id in ('done', 'working'):
+            await self.manager.upsert_task(
+                TaskSendParams(
+                    id=task_id,
+                    message=Message(role='user', parts=[TextPart(text='hi')]),
+                )
+            )
+
+    async def asyncTearDown(self) -> None:
+        self.manager.close()
+
+    async def test_sweep_evicts_finished_tasks(self):
+        """Only terminal tasks past their retention are evicted."""
+        queue = await self.manager.setup_sse_consumer('done')
+        await self.manager.update_store(
+            'done', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        await self.manager.enqueue_events_for_sse(
+            'done', status_event('done', 'bye', final=True)
+        )
+        await collect(self.manager.dequeue_events_for_sse('req', 'done', queue))
+        self.assertNotIn('done', self.manager.task_sse_subscribers)
+
+        self.assertEqual(await self.manager.sweep(), 1)
+        self.assertNotIn('done', self.manager.tasks)
+        self.assertIn('working', self.manager.tasks)
+        stats = self.manager.memory_stats()
+        self.assertEqual(stats['tasks'], 1)
+        self.assertEqual(stats['event_logs'], 0)
+        self.assertEqual(stats['evicted_tasks'], 1)
+
+    async def test_sweep_keeps_subscribed_tasks(self):
+        """A finished task is kept while a client is still subscribed."""
+        await self.manager.setup_sse_consumer('done')
+        await self.manager.update_store(
+            'done', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        self.assertEqual(await self.manager.sweep(), 0)
+        self.assertIn('done', self.manager.tasks)
+
+
+class InMemoryTaskManagerStateCountTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the per-state task counts behind the a2a_tasks gauge."""
+
+    def send_request(self, task_id: str, streaming: bool = False):
+        params = TaskSendParams(
+            id=task_id,
+            message=Message(role='user', parts=[TextPart(text='hi')]),
+        )
+        if streaming:
+            return SendTaskStreamingRequest(params=params)
+        return SendTaskRequest(params=params)
+
+    def nonzero_counts(self, manager):
+        return {
+            state: count
+            for state, count in manager.task_state_counts.items()
+            if count
+        }
+
+    async def test_gauge_returns_to_zero(self):
+        """Counts follow an agent's tasks and drop to zero once swept."""
+        manager = EchoTaskManager(task_retention=0)
+        self.addCleanup(manager.close)
+        await manager.on_send_task(self.send_request('task-1'))
+        stream = await manager.on_send_task_subscribe(
+            self.send_request('task-2', streaming=True)
+        )
+        await collect(stream)
+        while manager.runner.live:
+            await asyncio.sleep(0)
+
+        self.assertEqual(self.nonzero_counts(manager), {TaskState.COMPLETED: 2})
+        self.assertEqual(await manager.sweep(), 2)
+        self.assertEqual(self.nonzero_counts(manager), {})
+
+    async def test_tasks_loaded_after_restart_are_counted(self):
+        """Tasks left in a persistent store are counted when loaded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'tasks.db')
+            manager = EchoTaskManager(task_store=SQLiteTaskStore(path))
+            await manager.upsert_task(self.send_request('task-1').params)
+            manager.close()
+
+            manager = EchoTaskManager(
+                task_store=SQLiteTaskStore(path), task_retention=0
+            )
+            await manager.update_store(
+                'task-1', TaskStatus(state=TaskState.WORKING), None
+            )
+            self.assertEqual(
+                self.nonzero_counts(manager), {TaskState.WORKING: 1}
+            )
+            await manager.update_store(
+                'task-1', TaskStatus(state=TaskState.COMPLETED), None
+            )
+            await manager.sweep()
+            self.assertEqual(self.nonzero_counts(manager), {})
+            manager.close()
+
+    async def test_finished_tasks_loaded_after_restart_are_swept(self):
+        """A task that finished before a restart is evicted once read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'tasks.db')
+            manager = EchoTaskManager(task_store=SQLiteTaskStore(path))
+            await manager.on_send_task(self.send_request('task-1'))
+            while manager.runner.live:
+                await asyncio.sleep(0)
+            manager.close()
+
+            manager = EchoTaskManager(
+                task_store=SQLiteTaskStore(path), task_retention=0
+            )
+            response = await manager.on_get_task(
+                GetTaskRequest(params=TaskQueryParams(id='task-1'))
+            )
+            self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+            self.assertEqual(await manager.sweep(), 1)
+            self.assertNotIn('task-1', manager.tasks)
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
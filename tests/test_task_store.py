@@ -0,0 +1,189 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from common.server.task_store import InMemoryTaskStore, SQLiteTaskStore
+from common.types import Message, Task, TaskState, TaskStatus, TextPart
+
+
+def make_task(task_id: str, state: TaskState = TaskState.SUBMITTED) -> Task:
+    message = Message(role='user', parts=[TextPart(text=f'hello {task_id}')])
+    return Task(
+        id=task_id,
+        sessionId='session',
+        status=TaskStatus(state=state),
+        history=[message],
+    )
+
+
+class InMemoryTaskStoreTest(unittest.TestCase):
+    """Tests for the LRU/TTL in-memory task store."""
+
+    def test_evicts_least_recently_used(self):
+        """The least recently read or written task is evicted first."""
+        store = InMemoryTaskStore(max_tasks=2)
+        store['a'] = make_task('a', TaskState.COMPLETED)
+        store['b'] = make_task('b', TaskState.COMPLETED)
+        store['a']  # touch a so b becomes the eviction candidate
+        store['c'] = make_task('c', TaskState.COMPLETED)
+
+        self.assertIn('a', store)
+        self.assertNotIn('b', store)
+        self.assertIn('c', store)
+        self.assertEqual(len(store), 2)
+
+    def test_expires_idle_tasks(self):
+        """Tasks untouched for longer than the TTL are dropped."""
+        store = InMemoryTaskStore(ttl=0.01)
+        store['a'] = make_task('a')
+        time.sleep(0.02)
+
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(len(store), 0)
+
+    def test_keeps_unfinished_tasks(self):
+        """Capacity eviction skips tasks that are still in flight."""
+        store = InMemoryTaskStore(max_tasks=2)
+        store['working'] = make_task('working', TaskState.WORKING)
+        store['done'] = make_task('done', TaskState.COMPLETED)
+        store['new'] = make_task('new')
+
+        self.assertEqual(list(store), ['working', 'new'])
+        store['newer'] = make_task('newer')
+        self.assertEqual(len(store), 3)
+
+    def test_evicts_finished_task_behind_unfinished_ones(self):
+        """A finished task is evicted however many tasks are in flight."""
+        store = InMemoryTaskStore(max_tasks=2)
+        for i in range(100):
+            store[f'working-{i}'] = make_task(f'working-{i}', TaskState.WORKING)
+        store['done'] = make_task('done', TaskState.COMPLETED)
+        store['new'] = make_task('new')
+
+        self.assertNotIn('done', store)
+        self.assertEqual(len(store), 101)
+
+    def test_iteration_skips_expired_tasks(self):
+        store = InMemoryTaskStore(ttl=0.05)
+        store['a'] = make_task('a')
+        time.sleep(0.06)
+        store['b'] = make_task('b')
+
+        self.assertEqual(list(store), ['b'])
+
+
+class SQLiteTaskStoreTest(unittest.TestCase):
+    """Tests for the write-batching SQLite task store."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.db')
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_tasks_survive_reopen(self):
+        """Tasks written before close are readable from a new store."""
+        store = SQLiteTaskStore(self.path)
+        task = make_task('a')
+        store['a'] = task
+        task.status = TaskStatus(state=TaskState.COMPLETED)
+        store['a'] = task
+        store.close()
+
+        reopened = SQLiteTaskStore(self.path)
+        self.assertEqual(reopened['a'].status.state, TaskState.COMPLETED)
+        self.assertEqual(reopened['a'].history[0].parts[0].text, 'hello a')
+        reopened.close()
+
+    def test_writes_are_batched(self):
+        """Nothing reaches disk until the batch size is reached."""
+        store = SQLiteTaskStore(self.path, batch_size=3, flush_interval=60)
+        store['a'] = make_task('a')
+        store['b'] = make_task('b')
+
+        peek = SQLiteTaskStore(self.path)
+        self.assertNotIn('a', peek)
+
+        store['c'] = make_task('c')
+        self.assertIn('a', peek)
+        self.assertEqual(len(peek), 3)
+        peek.close()
+        store.close()
+
+    def test_delete(self):
+        """Deleted tasks are removed from disk on flush."""
+        store = SQLiteTaskStore(self.path)
+        store['a'] = make_task('a')
+        store.flush()
+        del store['a']
+        self.assertNotIn('a', store)
+        store.close()
+
+        reopened = SQLiteTaskStore(self.path)
+        self.assertEqual(len(reopened), 0)
+        reopened.close()
+
+    def test_spilled_history(self):
+        """Spilled messages load oldest first and go away with the task."""
+        store = SQLiteTaskStore(self.path)
+        store['a'] = make_task('a')
+        messages = [
+            Message(role='user', parts=[TextPart(text=str(i))])
+            for i in range(5)
+        ]
+        store.spill_history('a', messages)
+
+        loaded = store.load_history('a', 2)
+        self.assertEqual([m.parts[0].text for m in loaded], ['3', '4'])
+        del store['a']
+        self.assertEqual(store.load_history('a', 5), [])
+        store.close()
+
+    def test_pending_writes_are_flushed_on_a_timer(self):
+        """A write below the batch size still reaches disk."""
+        store = SQLiteTaskStore(self.path, batch_size=100, flush_interval=0.05)
+        store['a'] = make_task('a')
+
+        peek = SQLiteTaskStore(self.path)
+        self.assertNotIn('a', peek)
+        time.sleep(0.2)
+        self.assertIn('a', peek)
+        peek.close()
+        store.close()
+
+    def test_cache_is_bounded(self):
+        """The cache holds at most cache_size tasks, whatever their state."""
+        store = SQLiteTaskStore(self.path, cache_size=10)
+        for i in range(50):
+            store[str(i)] = make_task(str(i), TaskState.INPUT_REQUIRED)
+        for i in range(50):
+            self.assertEqual(store[str(i)].id, str(i))
+
+        self.assertEqual(len(store._cache), 10)
+        self.assertEqual(list(store._cache), [str(i) for i in range(40, 50)])
+        store.close()
+
+    def test_async_methods(self):
+        """The async methods read through to disk and flush in batches."""
+
+        async def run():
+            store = SQLiteTaskStore(self.path, batch_size=2, flush_interval=60)
+            await store.aset('a', make_task('a'))
+            await store.aset('b', make_task('b'))
+            store.close()
+
+            reopened = SQLiteTaskStore(self.path)
+            self.assertEqual((await reopened.aget('a')).id, 'a')
+            self.assertIsNone(await reopened.aget('missing'))
+            self.assertEqual((await reopened.apop('b')).id, 'b')
+            self.assertIsNone(await reopened.aget('b'))
+            reopened.close()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()